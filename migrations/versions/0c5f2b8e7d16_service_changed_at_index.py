@@ -0,0 +1,70 @@
+"""service changed at index
+
+Index the last change of a service row, the in-memory autocomplete reads
+the rows changed since its last refresh.
+
+Revision ID: 0c5f2b8e7d16
+Revises: e3a7c9d51f08
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.app.entity.mixin import CHANGED_AT
+
+
+# revision identifiers, used by Alembic.
+revision = "0c5f2b8e7d16"
+down_revision = "e3a7c9d51f08"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Preprocess
+    pre_upgrade()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_service_changed_at",
+            "service",
+            [sa.text(CHANGED_AT)],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+    # Postprocess
+    post_upgrade()
+
+
+def downgrade():
+    # Preprocess
+    pre_downgrade()
+
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_service_changed_at", table_name="service", postgresql_concurrently=True)
+
+    # Postprocess
+    post_downgrade()
+
+
+def pre_upgrade():
+    # Processing before upgrading the schema
+    pass
+
+
+def post_upgrade():
+    # Processing after upgrading the schema
+    pass
+
+
+def pre_downgrade():
+    # Processing before downgrading the schema
+    pass
+
+
+def post_downgrade():
+    # Processing after downgrading the schema
+    pass
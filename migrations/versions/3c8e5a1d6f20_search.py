@@ -0,0 +1,115 @@
+"""search
+
+Generated tsvector columns on service and category, GIN indexes for full
+text and trigram search.
+
+Revision ID: 3c8e5a1d6f20
+Revises: 7b1f0c2e9a4d
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = "3c8e5a1d6f20"
+down_revision = "7b1f0c2e9a4d"
+branch_labels = None
+depends_on = None
+
+SEARCH_VECTORS = (
+    ("service", "setweight(to_tsvector('simple', coalesce(name, '')), 'A')"),
+    (
+        "category",
+        "setweight(to_tsvector('simple', coalesce(category_title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(category_description, '')), 'B')",
+    ),
+)
+
+TRIGRAM_INDEXES = (
+    ("ix_service_name_trgm_live", "service", "name"),
+    ("ix_category_category_title_trgm_live", "category", "category_title"),
+)
+
+
+def upgrade():
+    # Preprocess
+    pre_upgrade()
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # Adding a stored generated column rewrites the table.
+    for table, expression in SEARCH_VECTORS:
+        op.add_column(
+            table,
+            sa.Column(
+                "search_vector",
+                postgresql.TSVECTOR(),
+                sa.Computed(expression, persisted=True),
+                nullable=False,
+            ),
+        )
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for table, _ in SEARCH_VECTORS:
+            op.create_index(
+                f"ix_{table}_search_vector_live",
+                table,
+                ["search_vector"],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True,
+            )
+        for name, table, column in TRIGRAM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True,
+            )
+
+    # Postprocess
+    post_upgrade()
+
+
+def downgrade():
+    # Preprocess
+    pre_downgrade()
+
+    with op.get_context().autocommit_block():
+        for name, table, _ in TRIGRAM_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+        for table, _ in SEARCH_VECTORS:
+            op.drop_index(f"ix_{table}_search_vector_live", table_name=table, postgresql_concurrently=True)
+
+    for table, _ in SEARCH_VECTORS:
+        op.drop_column(table, "search_vector")
+
+    # Postprocess
+    post_downgrade()
+
+
+def pre_upgrade():
+    # Processing before upgrading the schema
+    pass
+
+
+def post_upgrade():
+    # Processing after upgrading the schema
+    pass
+
+
+def pre_downgrade():
+    # Processing before downgrading the schema
+    pass
+
+
+def post_downgrade():
+    # Processing after downgrading the schema
+    pass
@@ -0,0 +1,133 @@
+"""search candidates
+
+Index live rows of the searched tables by title length covering the rank
+inputs, the order search takes its candidates in. Replace the trigram
+indexes on titles by a trigger maintained table of title words with a
+trigram index, for suggestions on misspelled queries.
+
+Revision ID: 4a9d2c6e1b35
+Revises: 0c5f2b8e7d16
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "4a9d2c6e1b35"
+down_revision = "0c5f2b8e7d16"
+branch_labels = None
+depends_on = None
+
+SEARCHED_TABLES = (("service", "name"), ("category", "category_title"))
+
+# Words are inserted in order, so concurrent statements wait for each other instead of deadlocking.
+INSERT_WORDS_FUNCTION = """
+CREATE FUNCTION search_word_insert() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    INSERT INTO search_word (table_name, word)
+    SELECT DISTINCT TG_TABLE_NAME, word FROM new_rows, unnest(tsvector_to_array(new_rows.search_vector)) AS word
+    ORDER BY word
+    ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END
+$$
+"""
+
+
+def upgrade():
+    # Preprocess
+    pre_upgrade()
+
+    op.create_table(
+        "search_word",
+        sa.Column("table_name", sa.String(length=63), nullable=False),
+        sa.Column("word", sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint("table_name", "word", name=op.f("pk_search_word")),
+    )
+    op.execute(INSERT_WORDS_FUNCTION)
+    for table, _ in SEARCHED_TABLES:
+        for event in ("INSERT", "UPDATE"):
+            op.execute(
+                f"CREATE TRIGGER {table}_search_word_{event.lower()} AFTER {event} ON {table} "
+                "REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION search_word_insert()",
+            )
+        op.execute(
+            f"INSERT INTO search_word (table_name, word) "
+            f"SELECT DISTINCT '{table}', unnest(tsvector_to_array(search_vector)) FROM {table}",
+        )
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_search_word_word_trgm",
+            "search_word",
+            ["word"],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_ops={"word": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+        )
+        for table, title in SEARCHED_TABLES:
+            op.create_index(
+                f"ix_{table}_{title}_length_live",
+                table,
+                [sa.text(f"length({title})"), "id"],
+                unique=False,
+                postgresql_include=[title, "search_vector"],
+                postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True,
+            )
+            op.drop_index(f"ix_{table}_{title}_trgm_live", table_name=table, postgresql_concurrently=True)
+
+    # Postprocess
+    post_upgrade()
+
+
+def downgrade():
+    # Preprocess
+    pre_downgrade()
+
+    with op.get_context().autocommit_block():
+        for table, title in SEARCHED_TABLES:
+            op.create_index(
+                f"ix_{table}_{title}_trgm_live",
+                table,
+                [title],
+                unique=False,
+                postgresql_using="gin",
+                postgresql_ops={title: "gin_trgm_ops"},
+                postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True,
+            )
+            op.drop_index(f"ix_{table}_{title}_length_live", table_name=table, postgresql_concurrently=True)
+
+    for table, _ in SEARCHED_TABLES:
+        for event in ("insert", "update"):
+            op.execute(f"DROP TRIGGER {table}_search_word_{event} ON {table}")
+    op.execute("DROP FUNCTION search_word_insert()")
+    op.drop_table("search_word")
+
+    # Postprocess
+    post_downgrade()
+
+
+def pre_upgrade():
+    # Processing before upgrading the schema
+    pass
+
+
+def post_upgrade():
+    # Processing after upgrading the schema
+    pass
+
+
+def pre_downgrade():
+    # Processing before downgrading the schema
+    pass
+
+
+def post_downgrade():
+    # Processing after downgrading the schema
+    pass
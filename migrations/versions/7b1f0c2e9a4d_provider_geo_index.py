@@ -0,0 +1,75 @@
+"""provider geo index
+
+Enable cube/earthdistance, index provider positions for radius and nearest
+queries.
+
+Revision ID: 7b1f0c2e9a4d
+Revises: d405877346a1
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "7b1f0c2e9a4d"
+down_revision = "d405877346a1"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Preprocess
+    pre_upgrade()
+
+    op.execute("CREATE EXTENSION IF NOT EXISTS cube")
+    op.execute("CREATE EXTENSION IF NOT EXISTS earthdistance")
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_providerenity_earth_live",
+            "providerenity",
+            [sa.text("ll_to_earth(lat::float8, lon::float8)")],
+            unique=False,
+            postgresql_using="gist",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+            postgresql_concurrently=True,
+        )
+
+    # Postprocess
+    post_upgrade()
+
+
+def downgrade():
+    # Preprocess
+    pre_downgrade()
+
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_providerenity_earth_live", table_name="providerenity", postgresql_concurrently=True)
+
+    # Extensions are left installed, other schemas may use them.
+
+    # Postprocess
+    post_downgrade()
+
+
+def pre_upgrade():
+    # Processing before upgrading the schema
+    pass
+
+
+def post_upgrade():
+    # Processing after upgrading the schema
+    pass
+
+
+def pre_downgrade():
+    # Processing before downgrading the schema
+    pass
+
+
+def post_downgrade():
+    # Processing after downgrading the schema
+    pass
@@ -0,0 +1,73 @@
+"""keyset indexes
+
+Index live rows by (created_at, id) for keyset pagination.
+
+Revision ID: 9f4b2d7c1e83
+Revises: 3c8e5a1d6f20
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "9f4b2d7c1e83"
+down_revision = "3c8e5a1d6f20"
+branch_labels = None
+depends_on = None
+
+# Tables with TimestampMixin.
+LIVE_ROW_TABLES = ("category", "providercontact", "user", "providerenity", "service")
+
+
+def upgrade():
+    # Preprocess
+    pre_upgrade()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for table in LIVE_ROW_TABLES:
+            op.create_index(
+                f"ix_{table}_created_at_id_live",
+                table,
+                ["created_at", "id"],
+                unique=False,
+                postgresql_where=sa.text("deleted_at IS NULL"),
+                postgresql_concurrently=True,
+            )
+
+    # Postprocess
+    post_upgrade()
+
+
+def downgrade():
+    # Preprocess
+    pre_downgrade()
+
+    with op.get_context().autocommit_block():
+        for table in LIVE_ROW_TABLES:
+            op.drop_index(f"ix_{table}_created_at_id_live", table_name=table, postgresql_concurrently=True)
+
+    # Postprocess
+    post_downgrade()
+
+
+def pre_upgrade():
+    # Processing before upgrading the schema
+    pass
+
+
+def post_upgrade():
+    # Processing after upgrading the schema
+    pass
+
+
+def pre_downgrade():
+    # Processing before downgrading the schema
+    pass
+
+
+def post_downgrade():
+    # Processing after downgrading the schema
+    pass
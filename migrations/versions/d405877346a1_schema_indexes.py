@@ -0,0 +1,87 @@
+"""schema indexes
+
+Drop indexes duplicating primary keys and unique constraints, index foreign
+keys.
+
+Revision ID: d405877346a1
+Revises: 5e235bbba1fc
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d405877346a1"
+down_revision = "5e235bbba1fc"
+branch_labels = None
+depends_on = None
+
+# Non-unique indexes next to the primary key / unique constraint.
+REDUNDANT_INDEXES = (
+    ("ix_category_id", "category", ["id"]),
+    ("ix_providercontact_id", "providercontact", ["id"]),
+    ("ix_user_id", "user", ["id"]),
+    ("ix_user_email", "user", ["email"]),
+    ("ix_providerenity_id", "providerenity", ["id"]),
+    ("ix_providerphoto_id", "providerphoto", ["id"]),
+    ("ix_service_id", "service", ["id"]),
+)
+
+FOREIGN_KEY_INDEXES = (
+    ("ix_providerenity_provider_contact_id", "providerenity", ["provider_contact_id"]),
+    ("ix_service_provider_entity_id", "service", ["provider_entity_id"]),
+    ("ix_providerphoto_provider_contact_id", "providerphoto", ["provider_contact_id"]),
+    ("ix_category_parent_category_id", "category", ["parent_category_id"]),
+    ("ix_category_x_service_service_id", "category_x_service", ["service_id"]),
+)
+
+
+def upgrade():
+    # Preprocess
+    pre_upgrade()
+
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        for name, table, columns in FOREIGN_KEY_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in REDUNDANT_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    # Postprocess
+    post_upgrade()
+
+
+def downgrade():
+    # Preprocess
+    pre_downgrade()
+
+    with op.get_context().autocommit_block():
+        for name, table, columns in REDUNDANT_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=True)
+        for name, table, _ in FOREIGN_KEY_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+
+    # Postprocess
+    post_downgrade()
+
+
+def pre_upgrade():
+    # Processing before upgrading the schema
+    pass
+
+
+def post_upgrade():
+    # Processing after upgrading the schema
+    pass
+
+
+def pre_downgrade():
+    # Processing before downgrading the schema
+    pass
+
+
+def post_downgrade():
+    # Processing after downgrading the schema
+    pass
@@ -0,0 +1,70 @@
+"""provider changed at index
+
+Index the last change of a provider row, the in-memory geo index reads the
+rows changed since its last refresh.
+
+Revision ID: e3a7c9d51f08
+Revises: b6d1e4f8a2c7
+Create Date: 2026-10-18 23:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.app.entity.mixin import CHANGED_AT
+
+
+# revision identifiers, used by Alembic.
+revision = "e3a7c9d51f08"
+down_revision = "b6d1e4f8a2c7"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Preprocess
+    pre_upgrade()
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_providerenity_changed_at",
+            "providerenity",
+            [sa.text(CHANGED_AT)],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+    # Postprocess
+    post_upgrade()
+
+
+def downgrade():
+    # Preprocess
+    pre_downgrade()
+
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_providerenity_changed_at", table_name="providerenity", postgresql_concurrently=True)
+
+    # Postprocess
+    post_downgrade()
+
+
+def pre_upgrade():
+    # Processing before upgrading the schema
+    pass
+
+
+def post_upgrade():
+    # Processing after upgrading the schema
+    pass
+
+
+def pre_downgrade():
+    # Processing before downgrading the schema
+    pass
+
+
+def post_downgrade():
+    # Processing after downgrading the schema
+    pass
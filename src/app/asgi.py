@@ -2,16 +2,26 @@
 import typing as t
 
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, nullcontext
 
 from fastapi import FastAPI
 from sqladmin import Admin
 
 from src.app.admin import UserAdmin
 from src.app.controller.http import api_router
+from src.app.entity.profile import raise_on_lazy_load
 from src.app.exceptions import HTTPException, http_exception_handler
+from src.app.metrics import exposition
 from src.app.middleware import MetricsMiddleware
-from src.app.modules import AiohttpClient, AsyncDBClient, ThreadClient, init_sentry
+from src.app.modules import (
+    AiohttpClient,
+    AsyncDBClient,
+    Autocomplete,
+    CategoryTree,
+    ProviderGeoIndex,
+    ThreadClient,
+    init_sentry,
+)
 from src.config import settings
 
 log = logging.getLogger(__name__)
@@ -29,9 +39,18 @@ async def lifespan(app: FastAPI) -> t.AsyncGenerator[None, t.Any]:
     AiohttpClient.get_aiohttp_client()
     ThreadClient.get_thread_pool_client()
     AsyncDBClient.get_async_db_engine()
-    yield
+    AsyncDBClient.start_replica_monitor()
+    await CategoryTree.start()
+    await ProviderGeoIndex.start()
+    await Autocomplete.start()
+    with raise_on_lazy_load() if settings.RAISE_ON_LAZY_LOAD else nullcontext():
+        yield
+    await Autocomplete.stop()
+    await ProviderGeoIndex.stop()
+    await CategoryTree.stop()
     await AiohttpClient.close_aiohttp_client()
     await ThreadClient.close_thread_pool_executor()
+    exposition.close_executor()
     await AsyncDBClient.close_db_engine()
 
 
@@ -0,0 +1,112 @@
+import typing as t
+
+from fastapi import Depends, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.dto import ErrorResponse
+from src.app.entity.fieldset import (
+    FieldSet,
+    FieldSetError,
+    compile_fieldset,
+    parse_fields,
+    public_columns,
+)
+from src.app.entity.loader import EntityLoader
+from src.app.exceptions import HTTPException
+from src.app.modules import AsyncDBClient
+from src.app.modules.cursor import PAGE_CURSOR_SALT, CursorError, decode_cursor
+
+
+class PageParams(t.NamedTuple):
+    """Keyset pagination query parameters, cursors decoded to keys."""
+
+    limit: int
+    after: t.Optional[list[t.Any]]
+    before: t.Optional[list[t.Any]]
+
+
+async def get_db_session() -> t.AsyncIterator[AsyncSession]:
+    """Request scoped db session."""
+    async with AsyncDBClient.AsyncSessionLocal() as session:
+        yield session
+
+
+async def get_read_db_session() -> t.AsyncIterator[AsyncSession]:
+    """Request scoped db session for read only queries, on a replica when one is healthy."""
+    async with AsyncDBClient.read_session() as session:
+        yield session
+
+
+async def get_entity_loader(session: AsyncSession = Depends(get_db_session)) -> EntityLoader:
+    """Request scoped batching entity loader."""
+    return EntityLoader(session)
+
+
+def invalid_cursor(name: str, exc: Exception) -> HTTPException:
+    """Get 400 response for a cursor that could not be decoded or does not fit the listing."""
+    return HTTPException(
+        status.HTTP_400_BAD_REQUEST,
+        content=ErrorResponse(
+            code=status.HTTP_400_BAD_REQUEST,
+            message="Invalid cursor",
+            details=[{"loc": ["query", name], "msg": str(exc)}],
+        ).model_dump(exclude_none=True),
+    )
+
+
+def parse_cursor(name: str, cursor: t.Optional[str], salt: str = PAGE_CURSOR_SALT) -> t.Optional[list[t.Any]]:
+    """Decode cursor query parameter ``name``."""
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor, salt)
+    except CursorError as exc:
+        raise invalid_cursor(name, exc) from exc
+
+
+async def get_page_params(
+    limit: int = Query(20, ge=1, le=100),
+    after: t.Optional[str] = Query(None, description="Cursor of the next page."),
+    before: t.Optional[str] = Query(None, description="Cursor of the previous page."),
+) -> PageParams:
+    """Keyset pagination parameters for ``IDMixin.paginate``.
+
+    ``paginate`` raises ``ValueError`` for a cursor of another listing, map
+    it with ``invalid_cursor``.
+
+    Example:
+        page = await Service.paginate(session, limit=params.limit, after=params.after, before=params.before)
+        next_cursor, prev_cursor = encode_page_cursors(page)
+    """
+    if after is not None and before is not None:
+        raise invalid_cursor("before", ValueError("Only one of after or before can be given"))
+    return PageParams(limit=limit, after=parse_cursor("after", after), before=parse_cursor("before", before))
+
+
+def get_fieldset(entity: type[t.Any]) -> t.Callable[..., t.Awaitable[FieldSet]]:
+    """Get dependency parsing the ``fields`` sparse fieldset of ``entity``.
+
+    Without ``fields`` every column is returned and no relationship. Pass the
+    fieldset as ``profile`` to the finders and respond with its ``model``.
+    """
+    all_columns = tuple(public_columns(entity))
+
+    async def dependency(
+        fields: t.Optional[str] = Query(
+            None,
+            description="Comma separated fields to return, dotted for related ones, e.g. name,category.category_title.",
+        ),
+    ) -> FieldSet:
+        try:
+            return compile_fieldset(entity, all_columns if fields is None else parse_fields(fields))
+        except FieldSetError as exc:
+            raise HTTPException(
+                status.HTTP_400_BAD_REQUEST,
+                content=ErrorResponse(
+                    code=status.HTTP_400_BAD_REQUEST,
+                    message=str(exc),
+                    details=[{"loc": ["query", "fields"], "msg": f"Unknown field {field}"} for field in exc.fields],
+                ).model_dump(exclude_none=True),
+            ) from exc
+
+    return dependency
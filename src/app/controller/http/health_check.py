@@ -1,12 +1,12 @@
 import logging
 
-import prometheus_client as pc
 from fastapi import APIRouter, Request, status
-from fastapi.responses import PlainTextResponse
+from fastapi.responses import Response
 from sqlalchemy import text
 
 from src.app.dto import ErrorResponse, ReadyResponse
 from src.app.exceptions import HTTPException
+from src.app.metrics import exposition
 from src.app.modules import AsyncDBClient
 
 log = logging.getLogger(__name__)
@@ -42,6 +42,10 @@ async def ping(request: Request) -> ReadyResponse:
 
 
 @srv_router.get("/metrics")
-async def metrics() -> PlainTextResponse:
+async def metrics(request: Request) -> Response:
     """Prometheus metrics."""
-    return PlainTextResponse(pc.generate_latest())
+    content, headers = await exposition.render(
+        accept=request.headers.get("accept"),
+        accept_encoding=request.headers.get("accept-encoding"),
+    )
+    return Response(content, headers=headers)
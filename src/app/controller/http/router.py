@@ -1,6 +1,18 @@
 from fastapi import APIRouter
 
 from src.app.controller.http.health_check import srv_router
+from src.app.controller.http.v1.autocomplete import autocomplete_router
+from src.app.controller.http.v1.entity import (
+    provider_contact_router,
+    provider_router,
+    service_router,
+)
+from src.app.controller.http.v1.search import search_router
 
 api_router = APIRouter()
 api_router.include_router(srv_router)
+api_router.include_router(search_router)
+api_router.include_router(autocomplete_router)
+api_router.include_router(service_router)
+api_router.include_router(provider_router)
+api_router.include_router(provider_contact_router)
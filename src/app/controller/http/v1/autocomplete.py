@@ -0,0 +1,31 @@
+import typing as t
+
+from fastapi import APIRouter, Query
+
+from src.app.dto import Completion, CompletionResponse
+from src.app.modules import Autocomplete
+
+autocomplete_router = APIRouter(
+    prefix="/v1/autocomplete",
+    tags=["autocomplete"],
+)
+
+
+@autocomplete_router.get(
+    "/{source}",
+    response_model=CompletionResponse,
+    summary="Complete service names or category titles by prefix.",
+    status_code=200,
+)
+async def autocomplete(
+    source: t.Literal["service", "category"],
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(10, ge=1, le=50),
+) -> CompletionResponse:
+    """Top completions by popularity, served from memory."""
+    return CompletionResponse(
+        items=[
+            Completion(id=object_id, title=title, popularity=popularity)
+            for object_id, title, popularity in Autocomplete.complete(source, q, limit)
+        ],
+    )
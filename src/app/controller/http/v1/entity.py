@@ -0,0 +1,96 @@
+import typing as t
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.controller.http.dependencies import (
+    PageParams,
+    get_fieldset,
+    get_page_params,
+    get_read_db_session,
+    invalid_cursor,
+)
+from src.app.dto import ErrorResponse, PageResponse
+from src.app.entity import ProviderContact, ProviderEnity, Service
+from src.app.entity.fieldset import FieldSet, compile_fieldset, public_columns
+from src.app.exceptions import HTTPException
+from src.app.modules.cursor import encode_page_cursors
+
+
+def read_router(entity: type[t.Any], prefix: str, tag: str) -> APIRouter:
+    """Get router listing and reading live models of ``entity`` with sparse fieldsets.
+
+    Responses are serialized by the fieldset model, only the requested
+    columns are selected and only they are returned.
+    """
+    router = APIRouter(prefix=prefix, tags=[tag])
+    model = compile_fieldset(entity, public_columns(entity)).model
+
+    @router.get(
+        "",
+        response_model=None,
+        summary=f"List {tag}.",
+        status_code=200,
+        responses={200: {"model": PageResponse[model]}, 400: {"model": ErrorResponse}},  # type: ignore[valid-type]
+    )
+    async def list_models(
+        params: PageParams = Depends(get_page_params),
+        fieldset: FieldSet = Depends(get_fieldset(entity)),
+        session: AsyncSession = Depends(get_read_db_session),
+    ) -> Response:
+        """Page of models, oldest first."""
+        try:
+            page = await entity.paginate(
+                session,
+                limit=params.limit,
+                after=params.after,
+                before=params.before,
+                profile=fieldset,
+            )
+        except ValueError as exc:
+            raise invalid_cursor("before" if params.before is not None else "after", exc) from exc
+
+        next_cursor, prev_cursor = encode_page_cursors(page)
+        response = PageResponse[fieldset.model](  # type: ignore[name-defined]
+            items=page.items,
+            next_cursor=next_cursor,
+            prev_cursor=prev_cursor,
+        )
+        return Response(response.model_dump_json(exclude_none=True), media_type="application/json")
+
+    @router.get(
+        "/{object_id}",
+        response_model=None,
+        summary=f"Get one of {tag}.",
+        status_code=200,
+        responses={200: {"model": model}, 400: {"model": ErrorResponse}, 404: {"model": ErrorResponse}},
+    )
+    async def get_model(
+        object_id: UUID,
+        fieldset: FieldSet = Depends(get_fieldset(entity)),
+        session: AsyncSession = Depends(get_read_db_session),
+    ) -> Response:
+        """Model by id."""
+        object_instance = await entity.find_one(session, object_id, profile=fieldset)
+        if object_instance is None:
+            raise HTTPException(
+                status.HTTP_404_NOT_FOUND,
+                content=ErrorResponse(
+                    code=status.HTTP_404_NOT_FOUND,
+                    message=f"{entity.__name__} not found",
+                    details=[{"loc": ["path", "object_id"], "msg": str(object_id)}],
+                ).model_dump(exclude_none=True),
+            )
+        return Response(
+            fieldset.model.model_validate(object_instance).model_dump_json(),
+            media_type="application/json",
+        )
+
+    return router
+
+
+service_router = read_router(Service, "/v1/services", "services")
+provider_router = read_router(ProviderEnity, "/v1/providers", "providers")
+provider_contact_router = read_router(ProviderContact, "/v1/provider-contacts", "provider contacts")
@@ -0,0 +1,77 @@
+import typing as t
+
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.controller.http.dependencies import (
+    get_read_db_session,
+    invalid_cursor,
+    parse_cursor,
+)
+from src.app.dto import ErrorResponse, SearchHit, SearchResponse
+from src.app.entity import Category, Service
+from src.app.entity.mixin import SearchMixin
+from src.app.modules.cursor import SEARCH_CURSOR_SALT, encode_cursor
+
+search_router = APIRouter(
+    prefix="/v1/search",
+    tags=["search"],
+)
+
+
+async def _search(
+    entity: type[SearchMixin],
+    session: AsyncSession,
+    query: str,
+    limit: int,
+    cursor: t.Optional[str],
+) -> SearchResponse:
+    after = None
+    key = parse_cursor("cursor", cursor, SEARCH_CURSOR_SALT)
+    if key is not None:
+        try:
+            rank, last_id = key
+            after = (float(rank), UUID(last_id))
+        except (TypeError, ValueError, AttributeError) as exc:
+            raise invalid_cursor("cursor", exc) from exc
+
+    rows = await entity.search(session, query, limit=limit + 1, after=after)
+    items = [SearchHit(id=row[0], title=row[1], rank=row[2]) for row in rows[:limit]]
+    next_cursor = encode_cursor((items[-1].rank, items[-1].id), SEARCH_CURSOR_SALT) if len(rows) > limit else None
+    return SearchResponse(items=items, next_cursor=next_cursor)
+
+
+@search_router.get(
+    "/services",
+    response_model=SearchResponse,
+    summary="Search services by name.",
+    status_code=200,
+    responses={400: {"model": ErrorResponse}},
+)
+async def search_services(
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: t.Optional[str] = None,
+    session: AsyncSession = Depends(get_read_db_session),
+) -> SearchResponse:
+    """Search services."""
+    return await _search(Service, session, q, limit, cursor)
+
+
+@search_router.get(
+    "/categories",
+    response_model=SearchResponse,
+    summary="Search categories by title and description.",
+    status_code=200,
+    responses={400: {"model": ErrorResponse}},
+)
+async def search_categories(
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: t.Optional[str] = None,
+    session: AsyncSession = Depends(get_read_db_session),
+) -> SearchResponse:
+    """Search categories."""
+    return await _search(Category, session, q, limit, cursor)
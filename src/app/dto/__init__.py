@@ -1,5 +1,16 @@
+from src.app.dto.autocomplete import Completion, CompletionResponse
 from src.app.dto.error import ErrorResponse
+from src.app.dto.page import PageResponse
 from src.app.dto.ready import ReadyResponse
+from src.app.dto.search import SearchHit, SearchResponse
 
 
-__all__ = ("ErrorResponse", "ReadyResponse")
+__all__ = (
+    "Completion",
+    "CompletionResponse",
+    "ErrorResponse",
+    "PageResponse",
+    "ReadyResponse",
+    "SearchHit",
+    "SearchResponse",
+)
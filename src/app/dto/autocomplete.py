@@ -0,0 +1,32 @@
+"""Application implementation - autocomplete response."""
+from typing import List
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class Completion(BaseModel):
+    """Define completion model.
+
+    Attributes:
+        id (UUID): Id of the service or category.
+        title (str): Service name or category title.
+        popularity (float): Ranking score, higher is better.
+
+    """
+
+    id: UUID  # noqa: A003
+    title: str
+    popularity: float
+
+
+class CompletionResponse(BaseModel):
+    """Define autocomplete response model.
+
+    Attributes:
+        items (List[Completion]): Completions, most popular first.
+
+    """
+
+    items: List[Completion]
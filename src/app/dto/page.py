@@ -0,0 +1,25 @@
+"""Application implementation - page response."""
+from typing import Generic, List, Optional, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+ItemT = TypeVar("ItemT")
+
+
+class PageResponse(BaseModel, Generic[ItemT]):
+    """Define keyset page response model.
+
+    Attributes:
+        items (List[ItemT]): Items of the page, in listing order.
+        next_cursor (Optional[str]): Cursor of the next page, absent on the
+            last page.
+        prev_cursor (Optional[str]): Cursor of the previous page, absent on
+            the first page.
+
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    items: List[ItemT]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
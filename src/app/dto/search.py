@@ -0,0 +1,35 @@
+"""Application implementation - search response."""
+from typing import List, Optional
+
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class SearchHit(BaseModel):
+    """Define search hit model.
+
+    Attributes:
+        id (UUID): Id of the found model.
+        title (str): Service name or category title.
+        rank (float): Relevance, higher is better.
+
+    """
+
+    id: UUID  # noqa: A003
+    title: Optional[str]
+    rank: float
+
+
+class SearchResponse(BaseModel):
+    """Define search response model.
+
+    Attributes:
+        items (List[SearchHit]): Page of hits, best first.
+        next_cursor (Optional[str]): Cursor of the next page, absent on the
+            last page.
+
+    """
+
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
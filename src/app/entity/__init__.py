@@ -4,6 +4,7 @@ from src.app.entity.mtm_relation import CategoryXService
 from src.app.entity.provider_contact import ProviderContact
 from src.app.entity.provider_entity import ProviderEnity
 from src.app.entity.provider_photo import ProviderPhoto
+from src.app.entity.search_word import SearchWord
 from src.app.entity.service import Service
 
 __all__ = (
@@ -13,5 +14,6 @@ __all__ = (
     "ProviderContact",
     "ProviderEnity",
     "ProviderPhoto",
+    "SearchWord",
     "Service",
 )
@@ -5,27 +5,95 @@ import typing as t
 from uuid import UUID
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.entity.base import Base
-from src.app.entity.mixin import TimestampMixin
+from src.app.entity.mixin import (
+    SearchMixin,
+    TimestampMixin,
+    changed_at_index,
+    live_index,
+    search_title_index,
+    search_vector,
+)
+from src.app.entity.profile import LoadProfile
 
 if t.TYPE_CHECKING:
     from src.app.entity.service import Service
 
 
-class Category(TimestampMixin, Base):
+class Category(SearchMixin, TimestampMixin, Base):
+
+    __load_profiles__ = {
+        "card": LoadProfile(columns=("category_title", "parent_category_id")),
+        "detail": LoadProfile(joined={"parent_category": "card"}, selectin={"service": "card"}),
+    }
+    __search_title__ = "category_title"
+    __table_args__ = (
+        live_index("category", "created_at", "id"),
+        live_index("category", "search_vector", postgresql_using="gin"),
+        search_title_index("category", "category_title"),
+        changed_at_index("category"),
+    )
 
     category_title: Mapped[str] = mapped_column(sa.String(255), nullable=True)
     category_description: Mapped[str] = mapped_column(sa.String(255), nullable=True)
+    search_vector: Mapped[t.Any] = mapped_column(
+        psql.TSVECTOR,
+        search_vector(("category_title", "A"), ("category_description", "B")),
+        deferred=True,
+    )
 
-    parent_category_id: Mapped[list[UUID]] = mapped_column(sa.ForeignKey("category.id"), nullable=True)
+    parent_category_id: Mapped[list[UUID]] = mapped_column(
+        sa.ForeignKey("category.id"),
+        nullable=True,
+        index=True,
+    )
     parent_category: Mapped["t.Self"] = relationship(
         "Category",
-        remote_side="category.id",
+        remote_side="Category.id",
     )
     service: Mapped["Service"] = relationship(
         "Service",
         secondary="category_x_service",
         back_populates="category",
     )
+
+    # Guard against cycles in the adjacency list.
+    MAX_DEPTH: t.ClassVar[int] = 64
+
+    @classmethod
+    async def find_descendant_ids(cls, async_session: AsyncSession, category_id: UUID) -> t.Sequence[UUID]:
+        """Select ids of the category and all its live descendants with a recursive CTE."""
+        tree = (
+            sa.select(cls.id, sa.literal_column("0", sa.Integer).label("depth"))
+            .where(cls.id == category_id, cls.deleted_at.is_(None))
+            .cte("tree", recursive=True)
+        )
+        tree = tree.union_all(
+            sa.select(cls.id, tree.c.depth + 1).where(
+                cls.parent_category_id == tree.c.id,
+                cls.deleted_at.is_(None),
+                tree.c.depth < cls.MAX_DEPTH,
+            ),
+        )
+        return (await async_session.scalars(sa.select(tree.c.id))).all()
+
+    @classmethod
+    async def find_ancestors(cls, async_session: AsyncSession, category_id: UUID) -> t.Sequence[Category]:
+        """Select the category and its ancestors up to the root with a recursive CTE, root last."""
+        path = (
+            sa.select(cls.id, cls.parent_category_id, sa.literal_column("0", sa.Integer).label("depth"))
+            .where(cls.id == category_id)
+            .cte("path", recursive=True)
+        )
+        path = path.union_all(
+            sa.select(cls.id, cls.parent_category_id, path.c.depth + 1).where(
+                cls.id == path.c.parent_category_id,
+                path.c.depth < cls.MAX_DEPTH,
+            ),
+        )
+        stmt = sa.select(cls).join(path, cls.id == path.c.id).where(cls.deleted_at.is_(None)).order_by(path.c.depth)
+        return (await async_session.scalars(stmt)).all()
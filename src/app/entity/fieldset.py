@@ -0,0 +1,158 @@
+import typing as t
+
+import functools
+
+import sqlalchemy as sa
+from pydantic import BaseModel, ConfigDict, create_model
+from sqlalchemy.orm import (
+    MANYTOONE,
+    ColumnProperty,
+    Mapper,
+    RelationshipProperty,
+    joinedload,
+    load_only,
+    selectinload,
+)
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+# Distinct field combinations compiled and kept, they come from clients.
+CACHE_SIZE = 1_024
+# Relationships nested deeper than this are rejected, every level is a query.
+MAX_DEPTH = 3
+
+
+class FieldSetError(ValueError):
+    """Requested fields are not columns or relationships of the entity."""
+
+    def __init__(self, fields: t.Sequence[str]) -> None:
+        """Initialize FieldSetError class object instance."""
+        super().__init__(f"Unknown fields: {', '.join(fields)}")
+        self.fields = tuple(fields)
+
+
+class FieldSet(t.NamedTuple):
+    """Loader options and response model of a sparse fieldset.
+
+    Attributes:
+        fields (tuple[str, ...]): Requested fields, sorted.
+        options (tuple[_AbstractLoad, ...]): ``load_only`` of the requested
+            columns, ``joinedload`` or ``selectinload`` of the requested
+            relationships with their own columns.
+        model (type[BaseModel]): Response model with ``id`` and the requested
+            fields only, validated from the loaded instances.
+
+    """
+
+    fields: tuple[str, ...]
+    options: tuple[_AbstractLoad, ...]
+    model: type[BaseModel]
+
+
+def public_columns(entity: type[t.Any]) -> dict[str, ColumnProperty[t.Any]]:
+    """Get columns a fieldset can select, deferred columns are internal."""
+    return {column.key: column for column in sa.inspect(entity).column_attrs if not column.deferred}
+
+
+def parse_fields(fields: str) -> tuple[str, ...]:
+    """Split ``fields`` query parameter, e.g. ``name,url,category.category_title``."""
+    return tuple(sorted({field.strip() for field in fields.split(",") if field.strip()}))
+
+
+def compile_fieldset(entity: type[t.Any], fields: t.Iterable[str]) -> FieldSet:
+    """Get fieldset of ``entity``, compiled once per distinct combination.
+
+    Fields are column names, relationship names for all their columns, or
+    dotted paths into relationships.
+
+    :raises FieldSetError: on fields ``entity`` does not have
+    """
+    return _compile(sa.inspect(entity), tuple(sorted(set(fields))))
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def _compile(mapper: Mapper[t.Any], fields: tuple[str, ...]) -> FieldSet:
+    unknown: list[str] = []
+    options, model = _compile_level(mapper, fields, "", 0, unknown)
+    if unknown:
+        raise FieldSetError(unknown)
+    return FieldSet(fields, options, model)
+
+
+def _compile_level(
+    mapper: Mapper[t.Any],
+    fields: t.Iterable[str],
+    prefix: str,
+    depth: int,
+    unknown: list[str],
+) -> tuple[tuple[_AbstractLoad, ...], type[BaseModel]]:
+    columns = public_columns(mapper.class_)
+    selected, nested = _partition(mapper, columns, fields, prefix, depth, unknown)
+
+    definitions: dict[str, t.Any] = {"id": (mapper.columns["id"].type.python_type, ...)}
+    for name in selected:
+        # Mapped annotations do not always match the nullability of the table.
+        definitions[name] = (t.Optional[columns[name].columns[0].type.python_type], None)
+
+    options = [load_only(mapper.class_.id, *(getattr(mapper.class_, name) for name in selected))]
+    for name, related_fields in nested.items():
+        option, definitions[name] = _compile_relationship(
+            mapper.relationships[name],
+            related_fields,
+            f"{prefix}{name}.",
+            depth + 1,
+            unknown,
+        )
+        options.append(option)
+
+    model = create_model(  # type: ignore[call-overload]
+        f"{mapper.class_.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **definitions,
+    )
+    return tuple(options), model
+
+
+def _partition(
+    mapper: Mapper[t.Any],
+    columns: dict[str, ColumnProperty[t.Any]],
+    fields: t.Iterable[str],
+    prefix: str,
+    depth: int,
+    unknown: list[str],
+) -> tuple[dict[str, None], dict[str, list[str]]]:
+    selected: dict[str, None] = {}
+    nested: dict[str, list[str]] = {}
+    for field in fields:
+        name, _, rest = field.partition(".")
+        if name in mapper.relationships and depth < MAX_DEPTH:
+            nested.setdefault(name, [])
+            if rest:
+                nested[name].append(rest)
+        elif name in columns and not rest:
+            selected[name] = None
+        else:
+            unknown.append(prefix + field)
+    return selected, nested
+
+
+def _compile_relationship(
+    relationship: RelationshipProperty[t.Any],
+    fields: list[str],
+    prefix: str,
+    depth: int,
+    unknown: list[str],
+) -> tuple[_AbstractLoad, tuple[t.Any, t.Any]]:
+    # A bare relationship brings all its columns.
+    related_options, related_model = _compile_level(
+        relationship.mapper,
+        fields or public_columns(relationship.mapper.class_),
+        prefix,
+        depth,
+        unknown,
+    )
+    # Many-to-one joins on the foreign key, which may not be loaded itself.
+    loader = joinedload if relationship.direction is MANYTOONE else selectinload
+    option = loader(relationship.class_attribute).options(*related_options)
+    if relationship.uselist:
+        return option, (list[related_model], [])  # type: ignore[valid-type]
+    return option, (t.Optional[related_model], None)
@@ -0,0 +1,107 @@
+import typing as t
+
+import asyncio
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.entity.base import Base
+from src.app.entity.mixin import IDMixin
+
+
+class EntityLoader:
+    """Request scoped batching loader for ``IDMixin`` entities.
+
+    ``load`` calls issued in the same event loop tick are deduplicated and
+    resolved with a single ``find_many`` query per entity. Results, including
+    misses, stay in an identity cache for the lifetime of the loader, so
+    repeated lookups of the same id do not hit the db.
+
+    Example:
+        services = await asyncio.gather(*(loader.load(Service, id_) for id_ in ids))
+    """
+
+    def __init__(self, async_session: AsyncSession) -> None:
+        """Initialize EntityLoader class object instance."""
+        self.async_session = async_session
+        self._cache: dict[tuple[type[IDMixin], UUID], t.Optional[Base]] = {}
+        self._pending: dict[type[IDMixin], dict[UUID, asyncio.Future[t.Optional[Base]]]] = {}
+        # Dispatched, waiting for their query.
+        self._inflight: dict[type[IDMixin], dict[UUID, asyncio.Future[t.Optional[Base]]]] = {}
+        self._dispatch_scheduled = False
+        self._tasks: set[asyncio.Task[None]] = set()
+        # AsyncSession does not allow concurrent queries.
+        self._lock = asyncio.Lock()
+
+    async def load(self, entity: type[IDMixin], object_id: UUID) -> t.Optional[Base]:
+        """Find single model by pk - id, batched with concurrent loads."""
+        key = (entity, object_id)
+        if key in self._cache:
+            return self._cache[key]
+
+        future = self._inflight.get(entity, {}).get(object_id)
+        if future is None:
+            future = self._pending.setdefault(entity, {}).get(object_id)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = self._pending[entity][object_id] = loop.create_future()
+            if not self._dispatch_scheduled:
+                self._dispatch_scheduled = True
+                loop.call_soon(self._schedule_dispatch)
+
+        # A cancelled caller must not cancel the load for other callers.
+        return await asyncio.shield(future)
+
+    async def load_many(self, entity: type[IDMixin], object_ids: t.Iterable[UUID]) -> list[t.Optional[Base]]:
+        """Find models by pks, in the order of ``object_ids``."""
+        return list(await asyncio.gather(*(self.load(entity, object_id) for object_id in object_ids)))
+
+    def prime(self, instance: Base) -> None:
+        """Put already loaded model into the identity cache."""
+        entity = t.cast(type[IDMixin], type(instance))
+        self._cache[(entity, instance.id)] = instance  # type: ignore[attr-defined]
+
+    def clear(self) -> None:
+        """Forget cached models, e.g. after they were changed."""
+        self._cache.clear()
+
+    def _schedule_dispatch(self) -> None:
+        self._dispatch_scheduled = False
+        pending, self._pending = self._pending, {}
+        for entity, futures in pending.items():
+            self._inflight.setdefault(entity, {}).update(futures)
+            task = asyncio.create_task(self._dispatch(entity, futures))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, entity: type[IDMixin], futures: dict[UUID, asyncio.Future[t.Optional[Base]]]) -> None:
+        try:
+            async with self._lock:
+                instances = await entity.find_many(self.async_session, futures.keys())
+        except Exception as exc:
+            for _, future in self._waiting(futures):
+                future.set_exception(exc)
+        else:
+            found = {instance.id: instance for instance in instances}  # type: ignore[attr-defined]
+            for object_id in futures:
+                self._cache[(entity, object_id)] = found.get(object_id)
+            for object_id, future in self._waiting(futures):
+                future.set_result(found.get(object_id))
+        finally:
+            self._forget(entity, futures)
+
+    def _forget(self, entity: type[IDMixin], futures: dict[UUID, asyncio.Future[t.Optional[Base]]]) -> None:
+        inflight = self._inflight[entity]
+        for object_id, future in futures.items():
+            if inflight.get(object_id) is future:
+                del inflight[object_id]
+        # Left unresolved only when the dispatch itself was cancelled.
+        for _, future in self._waiting(futures):
+            future.cancel()
+
+    @staticmethod
+    def _waiting(
+        futures: dict[UUID, asyncio.Future[t.Optional[Base]]],
+    ) -> list[tuple[UUID, asyncio.Future[t.Optional[Base]]]]:
+        # Done ones were resolved or cancelled meanwhile.
+        return [(object_id, future) for object_id, future in futures.items() if not future.done()]
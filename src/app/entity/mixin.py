@@ -1,16 +1,122 @@
 import typing as t
 
+import functools
+import re
 from datetime import datetime
-from uuid import UUID
+from uuid import UUID, uuid4
 
 import sqlalchemy as sa
 from multimethod import multimethod as overload
 from sqlalchemy.dialects import postgresql as psql
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import Mapped, declarative_mixin, mapped_column
+from sqlalchemy.orm import (
+    Mapped,
+    Mapper,
+    declarative_mixin,
+    declared_attr,
+    mapped_column,
+)
+from sqlalchemy.orm.attributes import instance_dict
+from sqlalchemy.orm.interfaces import ORMOption
 
 from src.app.entity.base import Base
+from src.app.entity.fieldset import FieldSet, compile_fieldset
+from src.app.entity.profile import LoadProfile, compile_profile
+from src.app.entity.projection import Projection
+from src.app.entity.search_word import SearchWord
+
+T = t.TypeVar("T")
+
+BULK_BATCH_SIZE = 1_000
+# Statements of the finders kept per entity and profile, sparse fieldsets
+# make the number of profiles unbounded.
+STATEMENT_CACHE_SIZE = 1_024
+# Text search configuration of the generated ``search_vector`` columns, no
+# stemming since titles are short and multilingual.
+SEARCH_CONFIG = "simple"
+# Matches ranked per search, the shortest titles; deeper pages end there.
+SEARCH_CANDIDATES = 100
+# Last change of a row, soft deletes included.
+CHANGED_AT = "greatest(created_at, updated_at, deleted_at)"
+
+
+def live_index(table_name: str, *columns: str, **kwargs: t.Any) -> sa.Index:
+    """Partial index over rows not soft deleted, matching TimestampMixin filter."""
+    return sa.Index(
+        f"ix_{table_name}_{'_'.join(columns)}_live",
+        *columns,
+        postgresql_where=sa.text("deleted_at IS NULL"),
+        **kwargs,
+    )
+
+
+def changed_at_index(table_name: str) -> sa.Index:
+    """Index on the last change of a row, polled by the in-memory copies of the table."""
+    return sa.Index(f"ix_{table_name}_changed_at", sa.text(CHANGED_AT))
+
+
+def _min_title_length(query: str) -> int:
+    """Get the length of the shortest title holding every word of a search query.
+
+    Words are taken apart like the text search parser does or finer, so the
+    bound never excludes a match; queries with ``or`` or ``-word`` need none.
+    """
+    words = set(re.findall(r"\w+", query.lower()))
+    if not words or "or" in words or re.search(r"(^|\s)-\w", query):
+        return 0
+    return sum(map(len, words)) + len(words) - 1
+
+
+def search_title_index(table_name: str, title: str) -> sa.Index:
+    """Covering index of live rows by title length, the order search takes its candidates in."""
+    return sa.Index(
+        f"ix_{table_name}_{title}_length_live",
+        sa.func.length(sa.column(title)),
+        "id",
+        postgresql_include=[title, "search_vector"],
+        postgresql_where=sa.text("deleted_at IS NULL"),
+    )
+
+
+def search_vector(*weighted_columns: tuple[str, str]) -> sa.Computed:
+    """Stored generated ``tsvector`` of columns with their ``A``-``D`` weights."""
+    return sa.Computed(
+        " || ".join(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+            for column, weight in weighted_columns
+        ),
+        persisted=True,
+    )
+
+
+class Page(t.NamedTuple):
+    """Page of a keyset pagination.
+
+    Attributes:
+        items (t.Sequence[Base]): Models of the page, in listing order.
+        next_key (t.Optional[tuple[t.Any, ...]]): Key of the last item when
+            there is a next page, pass it as ``after``.
+        prev_key (t.Optional[tuple[t.Any, ...]]): Key of the first item when
+            there is a previous page, pass it as ``before``.
+
+    """
+
+    items: t.Sequence["Base"]
+    next_key: t.Optional[tuple[t.Any, ...]]
+    prev_key: t.Optional[tuple[t.Any, ...]]
+
+
+@functools.lru_cache(maxsize=STATEMENT_CACHE_SIZE)
+def _cached_statement(
+    mapper: Mapper[t.Any],
+    name: str,
+    profile: t.Optional[str | tuple[str, ...]],
+) -> sa.Executable:
+    entity = mapper.class_
+    if isinstance(profile, tuple):
+        return getattr(entity, f"_{name}_statement")(compile_fieldset(entity, profile))
+    return getattr(entity, f"_{name}_statement")(profile)
 
 
 @declarative_mixin
@@ -20,9 +126,11 @@ class IDMixin:
         psql.UUID(as_uuid=True),
         server_default=sa.text("gen_random_uuid()"),
         primary_key=True,
-        index=True,
     )
 
+    # Named loader option sets applied by the finders, see LoadProfile.
+    __load_profiles__: t.ClassVar[dict[str, LoadProfile]] = {}
+
     @classmethod
     def get_pk(cls, object_instance: "Base") -> t.Dict[str, t.Any] | t.Any:
         """Get pk."""
@@ -53,15 +161,156 @@ class IDMixin:
         return object_instance
 
     @classmethod
-    async def find_one(cls, async_session: AsyncSession, object_id: UUID) -> t.Optional["Base"]:
+    def statement(cls, name: str, profile: t.Optional[str | FieldSet] = None) -> sa.Executable:
+        """Get statement built by ``_<name>_statement`` for a profile, built once.
+
+        Hot path statements take their values as bound parameters, so the
+        same object is executed every time and SQLAlchemy does not rebuild
+        it nor generate its cache key again.
+        """
+        return _cached_statement(sa.inspect(cls), name, profile.fields if isinstance(profile, FieldSet) else profile)
+
+    @classmethod
+    def _find_one_statement(cls, profile: t.Optional[str | FieldSet]) -> sa.Select[t.Any]:
+        return sa.select(cls).where(cls.id == sa.bindparam("object_id")).options(*cls.load_options(profile))
+
+    @classmethod
+    async def find_one(
+        cls,
+        async_session: AsyncSession,
+        object_id: UUID,
+        profile: t.Optional[str | FieldSet] = None,
+    ) -> t.Optional["Base"]:
         """Select from db single model by pk - id."""
-        stmt = sa.select(cls).where(cls.id == object_id)
-        return await async_session.scalar(stmt)
+        return await async_session.scalar(cls.statement("find_one", profile), {"object_id": object_id})
+
+    @classmethod
+    async def find_many(
+        cls,
+        async_session: AsyncSession,
+        object_ids: t.Iterable[UUID],
+        profile: t.Optional[str | FieldSet] = None,
+    ) -> t.Sequence["Base"]:
+        """Select from db models by pks in a single query, in no particular order."""
+        stmt: sa.Select[t.Any] = sa.select(cls).where(cls.id == sa.any_(cls._ids_param(object_ids)))
+        stmt = stmt.options(*cls.load_options(profile))
+        return (await async_session.scalars(stmt)).unique().all()
 
     @classmethod
-    async def find_one_or_fail(cls, async_session: AsyncSession, object_id: UUID) -> "Base":
+    def projection(cls, model: type[T], /, **expressions: sa.ColumnElement[t.Any]) -> Projection[T]:
+        """Get read only projection of columns into ``model``, see ``Projection``.
+
+        Building it creates a ``TypeAdapter``, keep it at module level.
+        """
+        return Projection(cls, model, expressions)
+
+    @classmethod
+    def load_options(cls, profile: t.Optional[str | FieldSet]) -> tuple[ORMOption, ...]:
+        """Get loader options of a ``__load_profiles__`` profile or a sparse fieldset, none for None."""
+        if profile is None:
+            return ()
+        if isinstance(profile, FieldSet):
+            return profile.options
+        return compile_profile(cls, profile)
+
+    @staticmethod
+    def _ids_param(object_ids: t.Iterable[UUID]) -> sa.BindParameter[t.Any]:
+        return sa.bindparam("object_ids", list(object_ids), type_=psql.ARRAY(psql.UUID(as_uuid=True)))
+
+    @classmethod
+    def _coerce_key(cls, columns: t.Sequence[sa.ColumnElement[t.Any]], key: t.Sequence[t.Any]) -> tuple[t.Any, ...]:
+        """Convert key values decoded from a cursor back to column python types.
+
+        :raises ValueError: on keys not matching the columns, e.g. a number for an ``UUID`` column
+        """
+        if len(key) != len(columns):
+            raise ValueError(f"Key of {len(columns)} values expected, got {len(key)}")
+
+        values = []
+        for column, value in zip(columns, key):
+            python_type = column.type.python_type
+            if value is not None and not isinstance(value, python_type):
+                try:
+                    value = datetime.fromisoformat(value) if python_type is datetime else python_type(value)
+                except (TypeError, AttributeError) as exc:
+                    raise ValueError(f"Invalid {column.key} value {value!r}") from exc
+            values.append(value)
+        return tuple(values)
+
+    @classmethod
+    async def paginate(
+        cls,
+        async_session: AsyncSession,
+        *criteria: sa.ColumnElement[bool],
+        order_by: t.Sequence[str] = ("id",),
+        limit: int = 20,
+        after: t.Optional[t.Sequence[t.Any]] = None,
+        before: t.Optional[t.Sequence[t.Any]] = None,
+        descending: bool = False,
+        profile: t.Optional[str | FieldSet] = None,
+    ) -> Page:
+        """Select a page of models with keyset pagination.
+
+        Rows are ordered by the ``order_by`` columns, which must end with a
+        unique one and should be covered by an index. Pages start right after
+        the ``after`` key, or end right before the ``before`` key when paging
+        backward, so the cost does not grow with the page depth.
+
+        :param order_by: names of the key columns
+        :type order_by: t.Sequence[str]
+        :param after: key of the last item of the previous page
+        :type after: t.Optional[t.Sequence[t.Any]]
+        :param before: key of the first item of the next page
+        :type before: t.Optional[t.Sequence[t.Any]]
+        :param descending: order by the key columns descending
+        :type descending: bool
+        :param profile: name of the load profile or a sparse fieldset
+        :type profile: t.Optional[str | FieldSet]
+        :return: page of at most ``limit`` models
+        :rtype: Page
+        """
+        if after is not None and before is not None:
+            raise ValueError("Only one of after or before can be given")
+
+        columns = [getattr(cls, name) for name in order_by]
+        key_columns = sa.tuple_(*columns)
+        # Paging backward reads the rows in reverse and flips them afterwards.
+        backward = before is not None
+        reverse = descending != backward
+        # Keys are selected next to the models, a profile may not load their columns.
+        stmt = (
+            sa.select(cls, *columns)
+            .where(*criteria)
+            .options(*cls.load_options(profile))
+            .order_by(*(column.desc() if reverse else column.asc() for column in columns))
+            .limit(limit + 1)
+        )
+        if after is not None or before is not None:
+            key = sa.tuple_(*cls._coerce_key(columns, after if after is not None else before))  # type: ignore
+            stmt = stmt.where(key_columns < key if reverse else key_columns > key)
+
+        rows = list((await async_session.execute(stmt)).unique().all())
+        has_more = len(rows) > limit
+        del rows[limit:]
+        if backward:
+            rows.reverse()
+
+        has_next, has_prev = (True, has_more) if backward else (has_more, after is not None)
+        return Page(
+            items=[row[0] for row in rows],
+            next_key=tuple(rows[-1][1:]) if rows and has_next else None,
+            prev_key=tuple(rows[0][1:]) if rows and has_prev else None,
+        )
+
+    @classmethod
+    async def find_one_or_fail(
+        cls,
+        async_session: AsyncSession,
+        object_id: UUID,
+        profile: t.Optional[str | FieldSet] = None,
+    ) -> "Base":
         """Find single model by pk - id."""
-        object_instance = await cls.find_one(async_session, object_id)
+        object_instance = await cls.find_one(async_session, object_id, profile=profile)
         if object_instance is None:
             raise NoResultFound(f"{cls.__name__} not found")
         return object_instance
@@ -69,7 +318,9 @@ class IDMixin:
     @classmethod
     async def delete(cls, async_session: AsyncSession, object_id: UUID) -> None:
         """Hard delete model instance."""
-        stmt = sa.delete(cls).where(cls.id == object_id)
+        # A lambda statement rather than a bound parameter, the session
+        # synchronizes deleted instances by evaluating the criteria values.
+        stmt = sa.lambda_stmt(lambda: sa.delete(cls).where(cls.id == object_id))
         await async_session.execute(stmt)
         await async_session.commit()
 
@@ -104,6 +355,138 @@ class IDMixin:
         await async_session.commit()
         return instances
 
+    @classmethod
+    def _bulk_rows(cls, rows: t.Sequence["Base | t.Mapping[str, t.Any]"]) -> list[dict[str, t.Any]]:
+        """Get column values of model instances or mappings."""
+        # Generated columns are maintained by the db on every write.
+        column_keys = {
+            attr.key for attr in cls.__mapper__.column_attrs if attr.columns[0].computed is None  # type: ignore
+        }
+        return [
+            {
+                key: value
+                for key, value in (row if isinstance(row, t.Mapping) else instance_dict(row)).items()
+                if key in column_keys
+            }
+            for row in rows
+        ]
+
+    @classmethod
+    async def _bulk_upsert(cls, async_session: AsyncSession, rows: list[dict[str, t.Any]]) -> list[sa.Row[t.Any]]:
+        """Multi-row INSERT ... ON CONFLICT (id) DO UPDATE ... RETURNING."""
+        # ON CONFLICT cannot update a row twice in one statement, the last
+        # row of an id is written and returned for all of them.
+        last = {row["id"]: index for index, row in enumerate(rows) if row.get("id") is not None}
+        written = [last[row["id"]] if row.get("id") is not None else index for index, row in enumerate(rows)]
+
+        # Update only the columns rows carry, grouped so that a row never
+        # resets a column it did not set.
+        groups: dict[frozenset[str], list[int]] = {}
+        for index in sorted(set(written)):
+            groups.setdefault(frozenset(rows[index]), []).append(index)
+
+        returned: dict[int, sa.Row[t.Any]] = {}
+        for keys, indexes in groups.items():
+            insert = psql.insert(cls)
+            set_: dict[str, t.Any] = {key: insert.excluded[key] for key in keys - {"id", "created_at"}}
+            if "updated_at" in cls.__table__.c:  # type: ignore
+                set_["updated_at"] = sa.func.now()
+            # A no-op update still returns the conflicting row, DO NOTHING would not.
+            stmt = insert.on_conflict_do_update(
+                index_elements=[cls.id],
+                set_=set_ or {"id": insert.excluded.id},
+            ).returning(*cls._bulk_returning(), sort_by_parameter_order=True)
+
+            res = await async_session.execute(stmt, [rows[index] for index in indexes])
+            returned.update(zip(indexes, res.all()))
+
+        return [returned[index] for index in written]
+
+    @classmethod
+    async def _bulk_copy(cls, async_session: AsyncSession, rows: list[dict[str, t.Any]]) -> list[sa.Row[t.Any]]:
+        """COPY rows into a temporary table, then INSERT ... SELECT ... RETURNING."""
+        columns = list(rows[0])
+        if any(row.keys() != rows[0].keys() for row in rows):
+            raise ValueError("COPY bulk save requires every row to have the same columns")
+
+        conn = await async_session.connection()
+        preparer = conn.dialect.identifier_preparer
+        table_name = preparer.format_table(cls.__table__)  # type: ignore
+        tmp_table = f"bulk_{uuid4().hex}"
+        column_list = ", ".join(preparer.quote(column) for column in columns)
+        insert_columns, select_columns = column_list, column_list
+        if "created_at" not in columns and "created_at" in cls.__table__.c:  # type: ignore
+            insert_columns, select_columns = f"{column_list}, created_at", f"{column_list}, now()"
+        returning = ", ".join(preparer.quote(column.name) for column in cls._bulk_returning())
+
+        await conn.execute(
+            sa.text(
+                f"CREATE TEMP TABLE {tmp_table} ON COMMIT DROP AS SELECT {column_list} FROM {table_name} WITH NO DATA"
+            ),
+        )
+        raw_connection = await conn.get_raw_connection()
+        driver_connection: t.Any = raw_connection.driver_connection
+        await driver_connection.copy_records_to_table(
+            tmp_table,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+        res = await conn.execute(
+            sa.text(
+                f"INSERT INTO {table_name} ({insert_columns}) SELECT {select_columns} FROM {tmp_table} "
+                f"RETURNING {returning}",
+            ),
+        )
+        await conn.execute(sa.text(f"DROP TABLE {tmp_table}"))
+        return list(res.all())
+
+    @classmethod
+    def _bulk_returning(cls) -> list[sa.Column[t.Any]]:
+        """Server generated columns returned by bulk save."""
+        table = cls.__table__  # type: ignore
+        return [table.c[name] for name in ("id", "created_at") if name in table.c]
+
+    @classmethod
+    async def pre_bulk_save(
+        cls,
+        async_session: AsyncSession,
+        rows: t.Sequence["Base | t.Mapping[str, t.Any]"],
+        mode: t.Literal["upsert", "copy"] = "upsert",
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> list[sa.Row[t.Any]]:
+        """Bulk write rows bypassing the unit of work, without commit.
+
+        ``upsert`` issues multi-row ``INSERT ... ON CONFLICT (id) DO UPDATE``,
+        ``copy`` is a faster path for pure inserts through ``COPY``. Rows are
+        written in chunks of ``batch_size``.
+
+        :return: server generated ``id`` and ``created_at`` of every row, in
+            the order of the upsert rows; COPY returns them in insert order
+        :rtype: list[sa.Row[t.Any]]
+        """
+        values = cls._bulk_rows(rows)
+        returned = []
+        for offset in range(0, len(values), batch_size):
+            chunk = values[offset : offset + batch_size]  # noqa: E203
+            if mode == "copy":
+                returned.extend(await cls._bulk_copy(async_session, chunk))
+            else:
+                returned.extend(await cls._bulk_upsert(async_session, chunk))
+        return returned
+
+    @classmethod
+    async def bulk_save(
+        cls,
+        async_session: AsyncSession,
+        rows: t.Sequence["Base | t.Mapping[str, t.Any]"],
+        mode: t.Literal["upsert", "copy"] = "upsert",
+        batch_size: int = BULK_BATCH_SIZE,
+    ) -> list[sa.Row[t.Any]]:
+        """Bulk write rows and commit, see ``pre_bulk_save``."""
+        returned = await cls.pre_bulk_save(async_session, rows, mode=mode, batch_size=batch_size)
+        await async_session.commit()
+        return returned
+
 
 @declarative_mixin
 class TimestampMixin(IDMixin):
@@ -122,18 +505,228 @@ class TimestampMixin(IDMixin):
     )
     deleted_at: Mapped[datetime] = mapped_column(sa.DateTime, server_default=sa.FetchedValue())
 
+    # Relationships soft deleted together with the model on cascade delete.
+    __soft_delete_cascade__: t.ClassVar[tuple[str, ...]] = ()
+
+    if t.TYPE_CHECKING:
+        # Models replace the directive with a plain tuple.
+        __table_args__: t.Any
+    else:
+
+        @declared_attr.directive
+        def __table_args__(cls) -> tuple[t.Any, ...]:  # noqa: N805 D105
+            return (live_index(cls.__tablename__, "created_at", "id"),)
+
     @classmethod
-    async def find_one(cls, async_session: AsyncSession, object_id: UUID) -> t.Optional["Base"]:
-        """Select from db single model by pk - id."""
-        stmt = sa.select(cls).where(
-            cls.id == object_id,
+    def changed_at(cls) -> sa.ColumnElement[t.Any]:
+        """Last change of a row, soft deletes included, served by ``changed_at_index``."""
+        return sa.func.greatest(cls.created_at, cls.updated_at, cls.deleted_at)
+
+    @classmethod
+    def _find_one_statement(cls, profile: t.Optional[str | FieldSet]) -> sa.Select[t.Any]:
+        return (
+            sa.select(cls)
+            .where(
+                cls.id == sa.bindparam("object_id"),
+                cls.deleted_at.is_(None),
+            )
+            .options(*cls.load_options(profile))
+        )
+
+    @classmethod
+    async def find_many(
+        cls,
+        async_session: AsyncSession,
+        object_ids: t.Iterable[UUID],
+        profile: t.Optional[str | FieldSet] = None,
+    ) -> t.Sequence["Base"]:
+        """Select from db models by pks in a single query, in no particular order."""
+        stmt: sa.Select[t.Any] = (
+            sa.select(cls)
+            .where(
+                cls.id == sa.any_(cls._ids_param(object_ids)),
+                cls.deleted_at.is_(None),
+            )
+            .options(*cls.load_options(profile))
+        )
+        return (await async_session.scalars(stmt)).unique().all()
+
+    @classmethod
+    async def paginate(
+        cls,
+        async_session: AsyncSession,
+        *criteria: sa.ColumnElement[bool],
+        order_by: t.Sequence[str] = ("created_at", "id"),
+        limit: int = 20,
+        after: t.Optional[t.Sequence[t.Any]] = None,
+        before: t.Optional[t.Sequence[t.Any]] = None,
+        descending: bool = False,
+        profile: t.Optional[str | FieldSet] = None,
+    ) -> Page:
+        """Select a page of models not soft deleted, see ``IDMixin.paginate``."""
+        return await super().paginate(
+            async_session,
+            *criteria,
             cls.deleted_at.is_(None),
+            order_by=order_by,
+            limit=limit,
+            after=after,
+            before=before,
+            descending=descending,
+            profile=profile,
         )
-        return await async_session.scalar(stmt)
 
     @classmethod
-    async def delete(cls, async_session: AsyncSession, object_id: UUID) -> None:
-        """Soft delete model from db."""
-        object_instance = await cls.find_one_or_fail(async_session, object_id)
-        cls.merge(object_instance, deleted_at=sa.func.now())
-        await cls.save(async_session, object_instance)
+    def projection(cls, model: type[T], /, **expressions: sa.ColumnElement[t.Any]) -> Projection[T]:
+        """Get read only projection of columns of rows not soft deleted, see ``Projection``."""
+        return Projection(cls, model, expressions, criteria=(cls.deleted_at.is_(None),))
+
+    @classmethod
+    def _soft_delete_stmt(cls, *criteria: sa.ColumnElement[bool], cascade: bool = False) -> sa.Executable:
+        """Build single statement soft delete returning ids of deleted rows.
+
+        With ``cascade`` rows of the ``__soft_delete_cascade__`` relationships
+        are soft deleted in the same statement through data-modifying CTEs.
+        """
+        stmt = sa.update(cls).where(*criteria, cls.deleted_at.is_(None)).values(deleted_at=sa.func.now())
+        if not cascade or not cls.__soft_delete_cascade__:
+            return stmt.returning(cls.id)
+
+        relationships = [cls.__mapper__.relationships[name] for name in cls.__soft_delete_cascade__]  # type: ignore
+        parent_columns = {parent.key: parent for rel in relationships for parent, _ in rel.local_remote_pairs}
+        deleted = stmt.returning(cls.id, *(c for k, c in parent_columns.items() if k != "id")).cte("deleted")
+
+        final_stmt = sa.select(deleted.c.id)
+        for rel in relationships:
+            child = rel.mapper.class_
+            child_stmt = sa.update(child).where(child.deleted_at.is_(None)).values(deleted_at=sa.func.now())
+            for parent, remote in rel.local_remote_pairs:
+                child_stmt = child_stmt.where(remote.in_(sa.select(deleted.c[parent.key])))
+            final_stmt = final_stmt.add_cte(child_stmt.cte(f"deleted_{rel.key}"))
+        return final_stmt
+
+    @classmethod
+    async def delete(cls, async_session: AsyncSession, object_id: UUID, cascade: bool = False) -> None:
+        """Soft delete model from db with a single UPDATE."""
+        res = await async_session.execute(cls._soft_delete_stmt(cls.id == object_id, cascade=cascade))
+        if res.scalar_one_or_none() is None:
+            raise NoResultFound(f"{cls.__name__} not found")
+        await async_session.commit()
+
+    @classmethod
+    async def delete_many(
+        cls,
+        async_session: AsyncSession,
+        *criteria: sa.ColumnElement[bool],
+        object_ids: t.Optional[t.Iterable[UUID]] = None,
+        cascade: bool = False,
+    ) -> t.Sequence[UUID]:
+        """Soft delete models by pks and/or filter expressions.
+
+        Example:
+            await Service.delete_many(session, Service.provider_entity_id == provider_id)
+            await Service.delete_many(session, object_ids=ids)
+
+        :return: ids of rows that were deleted by this call
+        :rtype: t.Sequence[UUID]
+        """
+        if object_ids is not None:
+            criteria = (cls.id == sa.any_(cls._ids_param(object_ids)), *criteria)
+        if not criteria:
+            raise ValueError("delete_many requires object ids or a filter expression")
+
+        res = await async_session.execute(cls._soft_delete_stmt(*criteria, cascade=cascade))
+        deleted_ids = res.scalars().all()
+        await async_session.commit()
+        return deleted_ids
+
+
+@declarative_mixin
+class SearchMixin:
+    """Ranked full text search over a ``search_vector`` column.
+
+    Matches the tsvector against ``websearch_to_tsquery`` of the query and
+    ranks the ``SEARCH_CANDIDATES`` shortest matching ``__search_title__``
+    by ``ts_rank_cd`` plus trigram similarity of the title to the query. A
+    title covering index serves them in that order without ranking every
+    match, ``ts_rank_cd`` barely differs between the matches of short titles
+    while the similarity falls as they grow longer. The scan starts at the
+    length of the query words, no shorter title can hold them all.
+
+    A query matching nothing has its words replaced by the most similar
+    words of the titles, from ``SearchWord``, so typos still find titles.
+    """
+
+    __search_title__: t.ClassVar[str]
+    __tablename__: t.ClassVar[str]
+    search_vector: Mapped[t.Any]
+
+    @classmethod
+    async def search(
+        cls,
+        async_session: AsyncSession,
+        query: str,
+        limit: int = 20,
+        after: t.Optional[tuple[float, UUID]] = None,
+    ) -> t.Sequence[sa.Row[t.Any]]:
+        """Select ``id``, title and ``rank`` of live matches, best first.
+
+        :param after: ``(rank, id)`` of the last row of the previous page
+        :type after: t.Optional[tuple[float, UUID]]
+        """
+        config: sa.ColumnElement[str] = sa.literal_column(f"'{SEARCH_CONFIG}'")
+        tsquery = sa.func.websearch_to_tsquery(config, query)
+        rows = (await async_session.execute(cls._search_statement(tsquery, query, limit, after))).all()
+        # Past the last page of a query that matches, not a misspelled one.
+        if rows or after is not None and await cls._matches(async_session, tsquery):
+            return rows
+        words = await cls._suggest(async_session, query)
+        if not words:
+            return rows
+        query = " ".join(words)
+        tsquery = sa.func.plainto_tsquery(config, query)
+        return (await async_session.execute(cls._search_statement(tsquery, query, limit, after))).all()
+
+    @classmethod
+    async def _matches(cls, async_session: AsyncSession, tsquery: sa.ColumnElement[t.Any]) -> bool:
+        return bool(await async_session.scalar(sa.select(sa.exists().where(*cls._search_criteria(tsquery)))))
+
+    @classmethod
+    def _search_criteria(cls, tsquery: sa.ColumnElement[t.Any]) -> tuple[sa.ColumnElement[bool], ...]:
+        return cls.search_vector.op("@@")(tsquery), cls.deleted_at.is_(None)  # type: ignore[attr-defined]
+
+    @classmethod
+    def _search_statement(
+        cls,
+        tsquery: sa.ColumnElement[t.Any],
+        query: str,
+        limit: int,
+        after: t.Optional[tuple[float, UUID]],
+    ) -> sa.Select[t.Any]:
+        title = getattr(cls, cls.__search_title__)
+        rank = sa.cast(sa.func.ts_rank_cd(cls.search_vector, tsquery) + sa.func.similarity(title, query), sa.Double)
+        candidates = (
+            sa.select(cls.id, title, rank.label("rank"))  # type: ignore[attr-defined]
+            .where(*cls._search_criteria(tsquery), sa.func.length(title) >= _min_title_length(query))
+            .order_by(sa.func.length(title), cls.id)  # type: ignore[attr-defined]
+            .limit(SEARCH_CANDIDATES)
+            .subquery()
+        )
+        stmt = sa.select(candidates).order_by(candidates.c.rank.desc(), candidates.c.id.desc()).limit(limit)
+        if after is not None:
+            stmt = stmt.where(sa.tuple_(candidates.c.rank, candidates.c.id) < sa.tuple_(*map(sa.literal, after)))
+        return stmt
+
+    @classmethod
+    async def _suggest(cls, async_session: AsyncSession, query: str) -> list[str]:
+        """Get the title word most similar to each word of ``query``, none for words without a similar one."""
+        words = sa.func.tsvector_to_array(sa.func.to_tsvector(sa.literal_column(f"'{SEARCH_CONFIG}'"), query))
+        lexemes = sa.func.unnest(words).table_valued("lexeme").render_derived()  # type: ignore[no-untyped-call]
+        closest = (
+            sa.select(SearchWord.word)
+            .where(SearchWord.table_name == cls.__tablename__, SearchWord.word.op("%")(lexemes.c.lexeme))
+            .order_by(SearchWord.word.op("<->")(lexemes.c.lexeme))
+            .limit(1)
+            .scalar_subquery()
+        )
+        return [word for word in await async_session.scalars(sa.select(closest).select_from(lexemes)) if word]
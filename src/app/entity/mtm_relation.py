@@ -17,4 +17,5 @@ class CategoryXService(Base):
     service_id: Mapped[UUID] = mapped_column(
         sa.ForeignKey("service.id"),
         primary_key=True,
+        index=True,
     )
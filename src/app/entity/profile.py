@@ -0,0 +1,104 @@
+import typing as t
+
+import contextlib
+
+from sqlalchemy.orm import joinedload, load_only, selectinload
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+from src.config import settings
+
+if settings.RAISE_ON_LAZY_LOAD:
+    # Patch SQLAlchemy to send nplusone signals, must happen before mappers
+    # are configured since they bind the lazy loader.
+    import nplusone.ext.sqlalchemy  # noqa: F401
+
+_compiled: dict[tuple[type[t.Any], str], tuple[_AbstractLoad, ...]] = {}
+
+
+class LoadProfile(t.NamedTuple):
+    """Named set of loader options of an entity.
+
+    Relationships map to the name of a profile of the related entity, applied
+    to the related rows, or to None for their default loading. Use ``joined``
+    for many-to-one relationships and ``selectin`` for collections.
+
+    Attributes:
+        columns (tuple[str, ...]): Column attributes loaded with ``load_only``,
+            all columns when empty.
+        selectin (t.Mapping[str, t.Optional[str]]): Relationships loaded with
+            ``selectinload``.
+        joined (t.Mapping[str, t.Optional[str]]): Relationships loaded with
+            ``joinedload``.
+
+    Example:
+        __load_profiles__ = {
+            "card": LoadProfile(columns=("name",), selectin={"category": "card"}),
+        }
+    """
+
+    columns: tuple[str, ...] = ()
+    selectin: t.Mapping[str, t.Optional[str]] = {}
+    joined: t.Mapping[str, t.Optional[str]] = {}
+
+
+def compile_profile(entity: type[t.Any], name: str) -> tuple[_AbstractLoad, ...]:
+    """Get loader options of ``entity`` profile ``name``, compiled once."""
+    key = (entity, name)
+    if key not in _compiled:
+        _compiled[key] = tuple(_profile_options(entity, name))
+    return _compiled[key]
+
+
+def _profile_options(entity: type[t.Any], name: str) -> t.Iterator[_AbstractLoad]:
+    try:
+        profile: LoadProfile = entity.__load_profiles__[name]
+    except KeyError:
+        raise ValueError(f"{entity.__name__} has no load profile {name!r}") from None
+
+    if profile.columns:
+        yield load_only(*(getattr(entity, column) for column in profile.columns))
+    for loader, relationships in ((selectinload, profile.selectin), (joinedload, profile.joined)):
+        for relationship, related_profile in relationships.items():
+            yield _relationship_option(loader, getattr(entity, relationship), related_profile)
+
+
+def _relationship_option(
+    loader: t.Callable[[t.Any], _AbstractLoad],
+    attr: t.Any,
+    related_profile: t.Optional[str],
+) -> _AbstractLoad:
+    option = loader(attr)
+    if related_profile is not None:
+        option = option.options(*compile_profile(attr.property.mapper.class_, related_profile))
+    return option
+
+
+@contextlib.contextmanager
+def raise_on_lazy_load() -> t.Iterator[None]:
+    """Raise ``NPlusOneError`` on every relationship lazy load inside the block.
+
+    Development and test mode built on ``nplusone`` from the dev
+    dependencies: lazy loads are the relationships a loading profile missed.
+    Requires ``RAISE_ON_LAZY_LOAD`` (``FASTAPI_RAISE_ON_LAZY_LOAD=1`` in the
+    test environment), which also applies it to the whole app.
+
+    Example:
+        with raise_on_lazy_load():
+            service = await Service.find_one(session, service_id, profile="card")
+    """
+    if not settings.RAISE_ON_LAZY_LOAD:
+        raise RuntimeError("Lazy load checks require RAISE_ON_LAZY_LOAD to be set")
+
+    from nplusone.core import exceptions, signals
+
+    def on_lazy_load(sender: t.Any, args: tuple[t.Any, ...], **kwargs: t.Any) -> None:
+        loader, state = args[:2]
+        raise exceptions.NPlusOneError(
+            f"Lazy load of {state.class_.__name__}.{loader.parent_property.key}, add it to the load profile",
+        )
+
+    signals.lazy_load.connect(on_lazy_load, sender=signals.get_worker(), weak=False)
+    try:
+        yield
+    finally:
+        signals.lazy_load.disconnect(on_lazy_load, sender=signals.get_worker())
@@ -0,0 +1,103 @@
+import typing as t
+
+import dataclasses
+
+import sqlalchemy as sa
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = t.TypeVar("T")
+
+
+class Projection(t.Generic[T]):
+    """Read only projection of entity columns into plain objects.
+
+    Selects only the columns named by the fields of ``model`` and maps the
+    rows without the ORM: no identity map, no instrumented instances. Fields
+    come from entity attributes of the same name or from ``expressions``,
+    e.g. an aggregate of related rows.
+
+    ``model`` is a pydantic model or a dataclass (``slots=True`` keeps it
+    small), validated in bulk with one ``TypeAdapter`` call per result, or
+    any class with ``__slots__``, built positionally from the row without
+    validation.
+
+    Example:
+        @dataclasses.dataclass(slots=True)
+        class ServiceRow:
+            id: UUID
+            name: str
+
+        rows = await Service.projection(ServiceRow).fetch(session, limit=100)
+    """
+
+    def __init__(
+        self,
+        entity: type[t.Any],
+        model: type[T],
+        expressions: t.Optional[t.Mapping[str, sa.ColumnElement[t.Any]]] = None,
+        criteria: t.Sequence[sa.ColumnElement[bool]] = (),
+    ) -> None:
+        """Initialize Projection class object instance.
+
+        ``expressions`` are by field name, a mapping rather than keywords so
+        any field name, ``criteria`` included, can be given one.
+        """
+        expressions = expressions or {}
+        self.entity = entity
+        self.model = model
+        self.criteria = tuple(criteria)
+        if issubclass(model, BaseModel):
+            self.fields = tuple(model.model_fields)
+        elif dataclasses.is_dataclass(model):
+            self.fields = tuple(field.name for field in dataclasses.fields(model))
+        else:
+            self.fields = tuple(model.__slots__)  # type: ignore[attr-defined]
+        self.columns = tuple(
+            (expressions[name] if name in expressions else getattr(entity, name)).label(name) for name in self.fields
+        )
+        self.adapter: t.Optional[TypeAdapter[list[T]]] = None
+        if issubclass(model, BaseModel) or dataclasses.is_dataclass(model):
+            self.adapter = TypeAdapter(list[model])  # type: ignore[valid-type]
+
+    def select(self, *criteria: sa.ColumnElement[bool]) -> sa.Select[t.Any]:
+        """Get SELECT of the projected columns, add ordering and limits to it."""
+        return sa.select(*self.columns).where(*self.criteria, *criteria)
+
+    def from_rows(self, rows: t.Sequence[t.Sequence[t.Any]]) -> list[T]:
+        """Map result rows, in the order of the projected columns."""
+        if self.adapter is None:
+            return [self.model(*row) for row in rows]
+        fields = self.fields
+        return self.adapter.validate_python([dict(zip(fields, row)) for row in rows])
+
+    async def fetch(
+        self,
+        async_session: AsyncSession,
+        *criteria: sa.ColumnElement[bool],
+        order_by: t.Sequence[sa.ColumnElement[t.Any]] = (),
+        limit: t.Optional[int] = None,
+        offset: t.Optional[int] = None,
+    ) -> list[T]:
+        """Select and map rows."""
+        stmt = self.select(*criteria).order_by(*order_by).limit(limit).offset(offset)
+        return self.from_rows((await async_session.execute(stmt)).all())
+
+    def dump_json(self, items: t.Sequence[T]) -> bytes:
+        """Serialize mapped rows to a JSON array."""
+        if self.adapter is not None:
+            return self.adapter.dump_json(list(items))
+        return to_json([{name: getattr(item, name) for name in self.fields} for item in items])
+
+    async def fetch_json(
+        self,
+        async_session: AsyncSession,
+        *criteria: sa.ColumnElement[bool],
+        order_by: t.Sequence[sa.ColumnElement[t.Any]] = (),
+        limit: t.Optional[int] = None,
+        offset: t.Optional[int] = None,
+    ) -> bytes:
+        """Select rows and serialize them to a JSON array, for ``Response(content=...)``."""
+        items = await self.fetch(async_session, *criteria, order_by=order_by, limit=limit, offset=offset)
+        return self.dump_json(items)
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.entity.base import Base
 from src.app.entity.mixin import TimestampMixin
+from src.app.entity.profile import LoadProfile
 
 if t.TYPE_CHECKING:
     from src.app.entity.provider_entity import ProviderEnity
@@ -15,6 +16,10 @@ if t.TYPE_CHECKING:
 
 class ProviderContact(TimestampMixin, Base):
 
+    __load_profiles__ = {
+        "card": LoadProfile(columns=("name", "phone", "email")),
+        "detail": LoadProfile(selectin={"provider_entity": "card", "provider_photo": None}),
+    }
     name: Mapped[str] = mapped_column(sa.String(255), nullable=False)
     phone: Mapped[str] = mapped_column(sa.String(255), nullable=True)
     email: Mapped[str] = mapped_column(sa.String(255), nullable=True)
@@ -5,10 +5,12 @@ import typing as t
 from uuid import UUID
 
 import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.entity.base import Base
-from src.app.entity.mixin import TimestampMixin
+from src.app.entity.mixin import TimestampMixin, changed_at_index, live_index
+from src.app.entity.profile import LoadProfile
 
 if t.TYPE_CHECKING:
     from src.app.entity.provider_contact import ProviderContact
@@ -17,6 +19,23 @@ if t.TYPE_CHECKING:
 
 class ProviderEnity(TimestampMixin, Base):
 
+    __load_profiles__ = {
+        "card": LoadProfile(columns=("address", "primary_phone", "lat", "lon")),
+        "detail": LoadProfile(joined={"provider_contact": "card"}, selectin={"service": "card"}),
+    }
+    __soft_delete_cascade__ = ("service",)
+    __table_args__ = (
+        live_index("providerenity", "created_at", "id"),
+        # earthdistance position, serves both earth_box radius and <-> nearest queries.
+        sa.Index(
+            "ix_providerenity_earth_live",
+            sa.text("ll_to_earth(lat::float8, lon::float8)"),
+            postgresql_using="gist",
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        ),
+        changed_at_index("providerenity"),
+    )
+
     address: Mapped[str] = mapped_column(sa.String(255), nullable=True)
     primary_phone: Mapped[str] = mapped_column(sa.String(255), nullable=True)
     secondary_phone: Mapped[str] = mapped_column(sa.String(255), nullable=True)
@@ -26,6 +45,7 @@ class ProviderEnity(TimestampMixin, Base):
     provider_contact_id: Mapped[list[UUID]] = mapped_column(
         sa.ForeignKey("providercontact.id"),
         nullable=True,
+        index=True,
     )
 
     provider_contact: Mapped[list["ProviderContact"]] = relationship(
@@ -40,3 +60,52 @@ class ProviderEnity(TimestampMixin, Base):
         order_by="Service.id",
         # cascade="save-update, merge, refresh-expire, expunge, delete, delete-orphan",
     )
+
+    @classmethod
+    def _earth_position(cls) -> sa.ColumnElement[t.Any]:
+        # Must match the ix_providerenity_earth_live expression to use the index.
+        return sa.func.ll_to_earth(sa.cast(cls.lat, sa.Double), sa.cast(cls.lon, sa.Double))
+
+    @classmethod
+    async def find_within(
+        cls,
+        async_session: AsyncSession,
+        lat: float,
+        lon: float,
+        radius: float,
+        limit: t.Optional[int] = None,
+    ) -> t.Sequence[tuple[ProviderEnity, float]]:
+        """Select providers within ``radius`` meters, nearest first, with their distance."""
+        point = sa.func.ll_to_earth(float(lat), float(lon))
+        position = cls._earth_position()
+        distance = sa.func.earth_distance(position, point)
+        stmt = (
+            sa.select(cls, distance.label("distance"))
+            .where(
+                sa.func.earth_box(point, float(radius)).op("@>")(position),
+                distance <= float(radius),
+                cls.deleted_at.is_(None),
+            )
+            .order_by(distance)
+            .limit(limit)
+        )
+        return [(provider, distance) for provider, distance in await async_session.execute(stmt)]
+
+    @classmethod
+    async def find_nearest(
+        cls,
+        async_session: AsyncSession,
+        lat: float,
+        lon: float,
+        k: int,
+    ) -> t.Sequence[tuple[ProviderEnity, float]]:
+        """Select ``k`` nearest providers with their distance in meters, GiST KNN ordered."""
+        point = sa.func.ll_to_earth(float(lat), float(lon))
+        position = cls._earth_position()
+        stmt = (
+            sa.select(cls, sa.func.earth_distance(position, point).label("distance"))
+            .where(cls.deleted_at.is_(None))
+            .order_by(position.op("<->")(point))
+            .limit(k)
+        )
+        return [(provider, distance) for provider, distance in await async_session.execute(stmt)]
@@ -18,7 +18,11 @@ class ProviderPhoto(IDMixin, Base):
 
     picture_path: Mapped[str] = mapped_column(sa.String(255), nullable=True)
 
-    provider_contact_id: Mapped[list[UUID]] = mapped_column(sa.ForeignKey("providercontact.id"), nullable=True)
+    provider_contact_id: Mapped[list[UUID]] = mapped_column(
+        sa.ForeignKey("providercontact.id"),
+        nullable=True,
+        index=True,
+    )
 
     provider_contact: Mapped[list["ProviderContact"]] = relationship(
         "ProviderContact",
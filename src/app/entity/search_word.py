@@ -0,0 +1,20 @@
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.app.entity.base import Base
+
+
+class SearchWord(Base):
+    """Distinct words of the ``search_vector`` of a table, suggested for misspelled search queries.
+
+    Filled by triggers on insert and update of the searched tables, words of
+    changed or deleted rows are kept.
+    """
+
+    __tablename__ = "search_word"  # type: ignore
+    __table_args__ = (
+        sa.Index("ix_search_word_word_trgm", "word", postgresql_using="gin", postgresql_ops={"word": "gin_trgm_ops"}),
+    )
+
+    table_name: Mapped[str] = mapped_column(sa.String(63), primary_key=True)
+    word: Mapped[str] = mapped_column(sa.Text, primary_key=True)
@@ -5,23 +5,49 @@ import typing as t
 from uuid import UUID
 
 import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql as psql
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.app.entity.base import Base
-from src.app.entity.mixin import TimestampMixin
+from src.app.entity.mixin import (
+    SearchMixin,
+    TimestampMixin,
+    changed_at_index,
+    live_index,
+    search_title_index,
+    search_vector,
+)
+from src.app.entity.profile import LoadProfile
 
 if t.TYPE_CHECKING:
     from src.app.entity.category import Category
     from src.app.entity.provider_entity import ProviderEnity
 
 
-class Service(TimestampMixin, Base):
+class Service(SearchMixin, TimestampMixin, Base):
+
+    __load_profiles__ = {
+        "card": LoadProfile(columns=("name", "url"), selectin={"category": "card"}),
+        "detail": LoadProfile(selectin={"category": "card"}, joined={"provider_entity": "card"}),
+    }
+    __search_title__ = "name"
+    __table_args__ = (
+        live_index("service", "created_at", "id"),
+        live_index("service", "search_vector", postgresql_using="gin"),
+        search_title_index("service", "name"),
+        changed_at_index("service"),
+    )
 
     name: Mapped[str] = mapped_column(sa.String(255), nullable=False)
     url: Mapped[str] = mapped_column(sa.String(255), nullable=True)
     operating_hours: Mapped[str] = mapped_column(sa.String(255), nullable=True)
+    search_vector: Mapped[t.Any] = mapped_column(psql.TSVECTOR, search_vector(("name", "A")), deferred=True)
 
-    provider_entity_id: Mapped[list[UUID]] = mapped_column(sa.ForeignKey("providerenity.id"), nullable=True)
+    provider_entity_id: Mapped[list[UUID]] = mapped_column(
+        sa.ForeignKey("providerenity.id"),
+        nullable=True,
+        index=True,
+    )
 
     provider_entity: Mapped[list["ProviderEnity"]] = relationship(
         "ProviderEnity",
@@ -34,3 +60,23 @@ class Service(TimestampMixin, Base):
         secondary="category_x_service",
         back_populates="service",
     )
+
+    @classmethod
+    def category_summaries(cls) -> sa.ScalarSelect[t.Any]:
+        """JSON array of ``id`` and ``category_title`` of the live categories, for projections.
+
+        Example:
+            Service.projection(ServiceCard, category=Service.category_summaries())
+        """
+        from src.app.entity.category import Category
+        from src.app.entity.mtm_relation import CategoryXService
+
+        summary = sa.func.jsonb_build_object("id", Category.id, "category_title", Category.category_title)
+        return (
+            sa.select(sa.func.coalesce(sa.func.jsonb_agg(summary), sa.text("'[]'::jsonb"), type_=psql.JSONB))
+            .select_from(CategoryXService)
+            .join(Category, Category.id == CategoryXService.category_id)
+            .where(CategoryXService.service_id == cls.id, Category.deleted_at.is_(None))
+            .correlate(cls)
+            .scalar_subquery()
+        )
@@ -2,7 +2,7 @@ import sqlalchemy as sa
 from sqlalchemy.orm import Mapped, mapped_column
 
 from src.app.entity.base import Base
-from src.app.entity.mixin import TimestampMixin
+from src.app.entity.mixin import TimestampMixin, live_index
 
 
 class User(TimestampMixin, Base):
@@ -10,8 +10,9 @@ class User(TimestampMixin, Base):
     __table_args__ = (
         sa.UniqueConstraint("username"),
         sa.UniqueConstraint("email"),
+        live_index("user", "created_at", "id"),
     )
 
     username: Mapped[str] = mapped_column(sa.String(255), nullable=False)
     phone: Mapped[str] = mapped_column(sa.String(255), nullable=True)
-    email: Mapped[str] = mapped_column(sa.String(255), index=True, nullable=False)
+    email: Mapped[str] = mapped_column(sa.String(255), nullable=False)
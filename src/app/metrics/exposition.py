@@ -0,0 +1,125 @@
+"""Prometheus exposition.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set every gunicorn worker writes its
+samples to mmap'd files in that directory and the exposition aggregates all
+of them, so a scrape hitting any worker sees the whole pod.
+
+Rendering runs in a thread of its own, never on the event loop nor queued
+behind the index rebuilds of ``ThreadClient``, and its output is reused for
+``METRICS_CACHE_TTL`` seconds per format and encoding.
+"""
+import typing as t
+
+import asyncio
+import concurrent.futures
+import gzip
+import os
+import time
+
+import prometheus_client as pc
+from prometheus_client import multiprocess
+from prometheus_client.exposition import choose_encoder
+from prometheus_client.openmetrics import exposition as openmetrics
+
+from src.app.metrics import metrics
+from src.config import settings
+
+MULTIPROC_DIR_ENV = "PROMETHEUS_MULTIPROC_DIR"
+
+_registry: t.Optional[pc.CollectorRegistry] = None
+_cache: dict[tuple[bool, bool], tuple[float, bytes]] = {}
+_lock: t.Optional[asyncio.Lock] = None
+# Renders are serialized by the lock, one thread is enough.
+_executor: t.Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+
+def is_multiprocess() -> bool:
+    """Multiprocess mode is enabled."""
+    return bool(os.getenv(MULTIPROC_DIR_ENV))
+
+
+def get_registry() -> pc.CollectorRegistry:
+    """Get registry to expose metrics from.
+
+    In multiprocess mode it is a dedicated registry with a collector reading
+    the per-worker files, the default one otherwise.
+    """
+    global _registry
+    if _registry is None:
+        if is_multiprocess():
+            _registry = pc.CollectorRegistry()
+            multiprocess.MultiProcessCollector(_registry)  # type: ignore[no-untyped-call]
+        else:
+            _registry = pc.REGISTRY
+    return _registry
+
+
+def close_executor() -> None:
+    """Shut the render thread down, a later scrape starts a new one."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True)
+        _executor = None
+
+
+def _get_executor() -> concurrent.futures.ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = concurrent.futures.ThreadPoolExecutor(1, thread_name_prefix="metrics")
+    return _executor
+
+
+def _render(use_openmetrics: bool, use_gzip: bool) -> bytes:
+    """Render metrics, blocking."""
+    ts_start = time.monotonic()
+    if use_openmetrics:
+        output = openmetrics.generate_latest(get_registry())  # type: ignore[no-untyped-call]
+    else:
+        output = pc.generate_latest(get_registry())
+    if use_gzip:
+        output = gzip.compress(output, compresslevel=settings.METRICS_GZIP_LEVEL)
+
+    elapsed = time.monotonic() - ts_start
+    metrics.exposition_timings.labels(
+        "openmetrics" if use_openmetrics else "text",
+        "gzip" if use_gzip else "identity",
+    ).observe(elapsed)
+    return output
+
+
+async def render(
+    accept: t.Optional[str] = None,
+    accept_encoding: t.Optional[str] = None,
+) -> tuple[bytes, dict[str, str]]:
+    """Render metrics for a scrape.
+
+    :param accept: Accept header of the scrape request
+    :type accept: t.Optional[str]
+    :param accept_encoding: Accept-Encoding header of the scrape request
+    :type accept_encoding: t.Optional[str]
+    :return: response body and headers
+    :rtype: tuple[bytes, dict[str, str]]
+    """
+    global _lock
+    _, content_type = choose_encoder(accept or "")
+    use_openmetrics = content_type == openmetrics.CONTENT_TYPE_LATEST
+    use_gzip = "gzip" in (accept_encoding or "")
+
+    headers = {"Content-Type": content_type, "Vary": "Accept, Accept-Encoding"}
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+
+    key = (use_openmetrics, use_gzip)
+    if _lock is None:
+        _lock = asyncio.Lock()
+
+    # Concurrent scrapes wait for a single render instead of running their own.
+    async with _lock:
+        cached = _cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < settings.METRICS_CACHE_TTL:
+            return cached[1], headers
+
+        output = await asyncio.get_running_loop().run_in_executor(_get_executor(), _render, use_openmetrics, use_gzip)
+        _cache[key] = (time.monotonic(), output)
+
+    return output, headers
@@ -48,6 +48,185 @@ request_timings = pc.Histogram(
     labelnames=["entity"],
 )
 
+exposition_timings = pc.Histogram(
+    documentation="metrics exposition render time",
+    name="metrics_exposition_duration",
+    unit="seconds",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["format", "encoding"],
+)
+
+db_pool_checked_out = pc.Gauge(
+    documentation="db connections checked out from the pool",
+    name="db_pool_checked_out",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["pool"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_overflow = pc.Gauge(
+    documentation="db connections opened over the pool size",
+    name="db_pool_overflow",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["pool"],
+    multiprocess_mode="livesum",
+)
+
+db_pool_checkout_timings = pc.Histogram(
+    documentation="db connection checkout wait time",
+    name="db_pool_checkout_duration",
+    unit="seconds",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["pool"],
+)
+
+db_pool_connection_age = pc.Histogram(
+    documentation="age of db connections at checkout",
+    name="db_pool_connection_age",
+    unit="seconds",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["pool"],
+    buckets=(1.0, 10.0, 60.0, 300.0, 600.0, 1800.0, 3600.0, pc.utils.INF),
+)
+
+db_pool_timeouts = pc.Counter(
+    documentation="db connection checkouts timed out",
+    name="db_pool_timeouts_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["pool"],
+)
+
+db_compiled_cache = pc.Counter(
+    documentation="sqlalchemy compiled statement cache lookups",
+    name="db_compiled_cache_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["pool", "result"],
+)
+
+db_prepared_statement_cache = pc.Counter(
+    documentation="asyncpg prepared statement cache lookups",
+    name="db_prepared_statement_cache_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["pool", "result"],
+)
+
+db_replica_lag = pc.Gauge(
+    documentation="db replica replication lag",
+    name="db_replica_lag",
+    unit="seconds",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["replica"],
+    multiprocess_mode="livemax",
+)
+
+db_replica_healthy = pc.Gauge(
+    documentation="db replica is in read rotation",
+    name="db_replica_healthy",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["replica"],
+    multiprocess_mode="livemin",
+)
+
+http_limit = pc.Gauge(
+    documentation="concurrency limit of outbound http calls per host",
+    name="http_limit",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host"],
+    multiprocess_mode="livesum",
+)
+
+http_limit_in_flight = pc.Gauge(
+    documentation="outbound http calls in flight per host",
+    name="http_limit_in_flight",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host"],
+    multiprocess_mode="livesum",
+)
+
+http_limit_queue_wait = pc.Histogram(
+    documentation="outbound http call wait for a concurrency slot",
+    name="http_limit_queue_wait",
+    unit="seconds",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, pc.utils.INF),
+)
+
+http_breaker_state = pc.Gauge(
+    documentation="circuit breaker state per host, 0 closed, 1 half-open, 2 open",
+    name="http_breaker_state",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host"],
+    multiprocess_mode="livemax",
+)
+
+http_breaker_transitions = pc.Counter(
+    documentation="circuit breaker state changes per host",
+    name="http_breaker_transitions_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host", "state"],
+)
+
+http_breaker_rejected = pc.Counter(
+    documentation="outbound http calls failed fast by an open circuit breaker",
+    name="http_breaker_rejected_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host"],
+)
+
+
+http_retries = pc.Counter(
+    documentation="outbound http call retries per host, reason is error or the response status",
+    name="http_retries_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host", "reason"],
+)
+
+http_retries_skipped = pc.Counter(
+    documentation="failed outbound http calls not retried per host, reason is method, tries, deadline or budget",
+    name="http_retries_skipped_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host", "reason"],
+)
+
+
+http_coalesced = pc.Counter(
+    documentation="single-flight outbound http gets per host, result is leader or shared",
+    name="http_coalesced_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host", "result"],
+)
+
+
+http_cache = pc.Counter(
+    documentation="outbound http response cache lookups per host, result is hit, stale or miss",
+    name="http_cache_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host", "result"],
+)
+
+http_cache_revalidations = pc.Counter(
+    documentation="conditional outbound http gets per host, result is modified or not_modified",
+    name="http_cache_revalidations_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host", "result"],
+)
+
+http_cache_evictions = pc.Counter(
+    documentation="outbound http responses evicted from the cache per host",
+    name="http_cache_evictions_total",
+    namespace=settings.PROJECT_NAME,
+    labelnames=["host"],
+)
+
+http_cache_bytes = pc.Gauge(
+    documentation="approximate size of the outbound http response cache",
+    name="http_cache",
+    unit="bytes",
+    namespace=settings.PROJECT_NAME,
+    multiprocess_mode="livesum",
+)
+
 
 def observe_request(
     func: t.Callable[P, t.Awaitable[ClientResponse]],
@@ -1,44 +1,113 @@
+import typing as t
+
 import logging
 import time
 
-from fastapi import Request
+import prometheus_client as pc
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from src.app.metrics import metrics
 
 log = logging.getLogger(__name__)
 
+# Label for requests that did not match any route (404, mounted sub-apps).
+UNMATCHED_PATH = "<unmatched>"
+KNOWN_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS", "TRACE", "CONNECT"))
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware counting prometheus metrics.
+
+    Unlike ``BaseHTTPMiddleware`` it does not spawn an extra task and memory
+    streams per request: the response status is taken from the
+    ``http.response.start`` message and body chunks are passed through as is,
+    so streaming responses are not buffered.
+
+    Series are labelled with the matched route template (``/api/service/{id}``)
+    instead of the raw path, which keeps label cardinality bounded. Labelled
+    children are resolved once per label set and cached.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize MetricsMiddleware class object instance."""
+        self.app = app
+        self._children: dict[tuple[str, str], tuple[pc.Counter, pc.Histogram]] = {}
+        self._responses: dict[tuple[str, str, int], pc.Counter] = {}
+
+    @staticmethod
+    def get_path_label(scope: Scope) -> str:
+        """Get route template the request was routed to."""
+        route = scope.get("route")
+        return getattr(route, "path", None) or UNMATCHED_PATH
 
-class MetricsMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    def _get_children(self, path: str, method: str) -> tuple[pc.Counter, pc.Histogram]:
+        key = (path, method)
+        children = self._children.get(key)
+        if children is None:
+            children = (metrics.requests.labels(path, method), metrics.timings.labels(path, method))
+            self._children[key] = children
+        return children
+
+    def _get_responses(self, path: str, method: str, status_code: int) -> pc.Counter:
+        key = (path, method, status_code)
+        child = self._responses.get(key)
+        if child is None:
+            child = self._responses[key] = metrics.responses.labels(path, method, status_code)
+        return child
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Handle unexpected error and count prometheus metrics.
 
-        :param request: _description_
-        :type request: Request
-        :param call_next: _description_
-        :type call_next: RequestResponseEndpoint
-        :return: _description_
-        :rtype: Response
+        :param scope: ASGI connection scope
+        :type scope: Scope
+        :param receive: ASGI receive channel
+        :type receive: Receive
+        :param send: ASGI send channel
+        :type send: Send
         """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        await self._handle(scope, receive, send)
+
+    async def _handle(self, scope: Scope, receive: Receive, send: Send) -> None:
         ts_start = time.monotonic()
-        method = request.scope["method"]
-        path = request.url.path
-        metrics.requests.labels(path, method).inc()
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else "OTHER"
+        status_code = 500
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, response_started
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                response_started = True
+            await send(message)
 
         try:
-            response = await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
-            log.exception("%(method)s, %(path)s, status - 500", {"method": method, "path": path})
-            data = {
-                "success": False,
-                "errors": [{"message": str(exc)}],
-            }
-            response = JSONResponse(data, status_code=500)
-
-        elapsed = time.monotonic() - ts_start
-        metrics.timings.labels(path, method).observe(elapsed)
-
-        metrics.responses.labels(path, method, response.status_code).inc()
-        return response
+            log.exception("%(method)s, %(path)s, status - 500", {"method": method, "path": scope["path"]})
+            if response_started:
+                # Headers are already on the wire, nothing to replace them with.
+                raise
+            status_code = 500
+            await self._error_response(exc)(scope, receive, send)
+        finally:
+            self._observe(scope, method, status_code, time.monotonic() - ts_start)
+
+    @staticmethod
+    def _error_response(exc: Exception) -> JSONResponse:
+        data: dict[str, t.Any] = {
+            "success": False,
+            "errors": [{"message": str(exc)}],
+        }
+        return JSONResponse(data, status_code=500)
+
+    def _observe(self, scope: Scope, method: str, status_code: int, elapsed: float) -> None:
+        # The route is only known once the router has matched the request.
+        path = self.get_path_label(scope)
+        requests, timings = self._get_children(path, method)
+        requests.inc()
+        timings.observe(elapsed)
+        self._get_responses(path, method, status_code).inc()
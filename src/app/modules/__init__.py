@@ -1,13 +1,23 @@
 """Application implementation - modules."""
 from src.app.modules.http_client import AiohttpClient
+from src.app.modules.http_breaker import CircuitOpenError
+from src.app.modules.http_coalesce import SharedResponse
 from src.app.modules.thread_client import ThreadClient
 from src.app.modules.db_client import AsyncDBClient
 from src.app.modules.sentry import init_sentry
+from src.app.modules.category_tree import CategoryTree
+from src.app.modules.geo_index import ProviderGeoIndex
+from src.app.modules.autocomplete import Autocomplete
 
 
 __all__ = (
     "AiohttpClient",
+    "CircuitOpenError",
+    "SharedResponse",
     "ThreadClient",
     "AsyncDBClient",
     "init_sentry",
+    "CategoryTree",
+    "ProviderGeoIndex",
+    "Autocomplete",
 )
@@ -0,0 +1,305 @@
+import typing as t
+
+import asyncio
+import bisect
+import collections
+import heapq
+import logging
+import time
+from array import array
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import sqlalchemy as sa
+
+from src.app.entity import Category, CategoryXService, Service
+from src.app.modules.db_client import AsyncDBClient
+from src.app.modules.thread_client import ThreadClient
+from src.config import settings
+
+# Prefixes this short match large ranges, their completions are memoized,
+# the ``MEMO_MAX_K`` best of the ``MEMO_SIZE`` most recently used ones.
+MEMO_PREFIX_LENGTH = 2
+MEMO_MAX_K = 20
+MEMO_SIZE = 1_024
+
+Entry = tuple[UUID, str, float]
+
+
+def _key(title: str) -> str:
+    return title.casefold()
+
+
+class PrefixIndex:
+    """Immutable prefix index, titles sorted case-insensitively.
+
+    Stores only the original titles, ids packed into one 16 bytes per entry
+    blob and ``float32`` popularity, the entries starting with a prefix are a
+    contiguous range found by bisection. Updates are given the titles of the
+    entries they remove and search only the entries of that title. Updates
+    return a new index and leave the old one intact for the requests still
+    reading it.
+    """
+
+    __slots__ = ("titles", "ids", "popularity", "_memo")
+
+    def __init__(self, titles: list[str], ids: bytearray, popularity: array) -> None:  # type: ignore[type-arg]
+        """Initialize PrefixIndex class object instance from sorted entries."""
+        self.titles = titles
+        self.ids = ids
+        self.popularity = popularity
+        self._memo: collections.OrderedDict[str, list[Entry]] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Get number of entries."""
+        return len(self.titles)
+
+    @classmethod
+    def build(cls, entries: t.Iterable[Entry]) -> "PrefixIndex":
+        """Build index from unsorted entries."""
+        ordered = sorted(entries, key=lambda entry: _key(entry[1]))
+        return cls(
+            [title for _, title, _ in ordered],
+            bytearray(b"".join(object_id.bytes for object_id, _, _ in ordered)),
+            array("f", (popularity for _, _, popularity in ordered)),
+        )
+
+    def _position(self, object_id: UUID, title: str, anywhere: bool = False) -> t.Optional[int]:
+        # Searched among the entries of the same title, all of them when ``anywhere`` and not there.
+        key = _key(title)
+        lo = bisect.bisect_left(self.titles, key, key=_key)
+        hi = bisect.bisect_right(self.titles, key, lo, key=_key)
+        pos = self._find(object_id.bytes, lo, hi)
+        if pos is None and anywhere:
+            pos = self._find(object_id.bytes, 0, len(self))
+        return pos
+
+    def _find(self, needle: bytes, lo: int, hi: int) -> t.Optional[int]:
+        end = hi * 16
+        pos = self.ids.find(needle, lo * 16, end)
+        while pos != -1 and pos % 16:
+            pos = self.ids.find(needle, pos + 1, end)
+        return None if pos == -1 else pos // 16
+
+    def update(
+        self,
+        removed: t.Iterable[tuple[UUID, str]],
+        added: t.Iterable[Entry],
+        retitled: t.AbstractSet[UUID] = frozenset(),
+    ) -> "PrefixIndex":
+        """Get new index without ``removed`` ids and with ``added`` entries, ``self`` when nothing changes.
+
+        Removed ids come with the title they are filed under, ``retitled``
+        ones may still be filed under an earlier title and are searched among
+        all entries when not found under it. An added id already in the index
+        is replaced, so updates can be applied again.
+        """
+        changes: dict[UUID, t.Optional[tuple[str, float]]] = {}
+        filed_under: dict[UUID, str] = {}
+        for object_id, title in removed:
+            changes[object_id], filed_under[object_id] = None, title
+        for object_id, title, popularity in added:
+            # Rounded as stored, an unchanged entry compares equal.
+            changes[object_id] = (title, array("f", (popularity,))[0])
+            filed_under.setdefault(object_id, title)
+        drops, inserts = self._edits(changes, filed_under, retitled)
+        if not drops and not inserts:
+            return self
+        return self._edited(drops, inserts)
+
+    def _edits(
+        self,
+        changes: dict[UUID, t.Optional[tuple[str, float]]],
+        filed_under: dict[UUID, str],
+        retitled: t.AbstractSet[UUID],
+    ) -> tuple[list[int], list[Entry]]:
+        """Get positions of the entries to drop and the entries to insert."""
+        drops, inserts = [], []
+        for object_id, entry in changes.items():
+            pos = self._position(object_id, filed_under[object_id], object_id in retitled)
+            if pos is not None and entry == (self.titles[pos], self.popularity[pos]):
+                continue
+            if pos is not None:
+                drops.append(pos)
+            if entry is not None:
+                inserts.append((object_id, *entry))
+        return drops, inserts
+
+    def _edited(self, drops: list[int], inserts: list[Entry]) -> "PrefixIndex":
+        index = PrefixIndex(list(self.titles), bytearray(self.ids), array("f", self.popularity))
+        for pos in sorted(drops, reverse=True):
+            del index.titles[pos], index.ids[pos * 16 : pos * 16 + 16], index.popularity[pos]
+        for object_id, title, popularity in inserts:
+            pos = bisect.bisect_right(index.titles, _key(title), key=_key)
+            index.titles.insert(pos, title)
+            index.ids[pos * 16 : pos * 16] = object_id.bytes
+            index.popularity.insert(pos, popularity)
+        return index
+
+    def complete(self, prefix: str, k: int) -> list[Entry]:
+        """Get ``k`` most popular entries starting with ``prefix``, case-insensitive."""
+        key = _key(prefix)
+        if len(key) > MEMO_PREFIX_LENGTH or k > MEMO_MAX_K:
+            return self._complete(key, k)
+
+        completions = self._memo.get(key)
+        if completions is None:
+            completions = self._memo[key] = self._complete(key, MEMO_MAX_K)
+            if len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        else:
+            self._memo.move_to_end(key)
+        return completions[:k]
+
+    def _complete(self, key: str, k: int) -> list[Entry]:
+        lo = bisect.bisect_left(self.titles, key, key=_key)
+        # Every title starting with the prefix sorts before prefix + U+10FFFF.
+        hi = bisect.bisect_left(self.titles, key + "\U0010ffff", lo, key=_key)
+        best = heapq.nlargest(k, range(lo, hi), key=self.popularity.__getitem__)
+        return [
+            (UUID(bytes=bytes(self.ids[pos * 16 : pos * 16 + 16])), self.titles[pos], self.popularity[pos])
+            for pos in best
+        ]
+
+
+class AutocompleteSource(t.NamedTuple):
+    """Titles of an entity, with popularity as the number of category links."""
+
+    entity: type[t.Any]
+    title: sa.ColumnElement[t.Any]
+    popularity: sa.ScalarSelect[t.Any]
+
+
+SOURCES = {
+    "service": AutocompleteSource(
+        Service,
+        Service.name.expression,
+        sa.select(sa.func.count())
+        .where(CategoryXService.service_id == Service.id)
+        .correlate(Service)
+        .scalar_subquery(),
+    ),
+    "category": AutocompleteSource(
+        Category,
+        Category.category_title.expression,
+        sa.select(sa.func.count())
+        .where(CategoryXService.category_id == Category.id)
+        .correlate(Category)
+        .scalar_subquery(),
+    ),
+}
+
+
+class Autocomplete:
+    """In-memory type-ahead over service names and category titles.
+
+    Every worker loads the titles at startup. Afterwards only rows changed
+    since the last refresh are read and applied to a copy of the index,
+    popularity is recomputed by a periodic full reload. Indexes are built in
+    the thread pool and swapped in whole, requests keep reading the previous
+    one meanwhile.
+
+    Example:
+        completions = Autocomplete.complete("service", "yog", k=10)
+    """
+
+    indexes: dict[str, PrefixIndex] = {name: PrefixIndex.build(()) for name in SOURCES}
+    _last_changes: dict[str, t.Optional[datetime]] = {name: None for name in SOURCES}
+    _full_refresh_at: float = 0.0
+    _refresh_task: t.Optional[asyncio.Task[None]] = None
+    log: logging.Logger = logging.getLogger(__name__)
+
+    @classmethod
+    def complete(cls, name: str, prefix: str, k: int = 10) -> list[Entry]:
+        """Get ``k`` most popular ``(id, title, popularity)`` starting with ``prefix``."""
+        return cls.indexes[name].complete(prefix, k)
+
+    @classmethod
+    async def refresh(cls, name: str, full: bool = False) -> PrefixIndex:
+        """Apply rows changed since the last refresh, or reload everything with ``full``.
+
+        Rows changed up to ``AUTOCOMPLETE_REFRESH_LAG`` seconds before the
+        last change seen are read again, see ``CategoryTree.refresh``. Rows
+        updated in that window may have been renamed, their entries are
+        searched for among all titles when not under the current one.
+        """
+        source = SOURCES[name]
+        entity = source.entity
+        last_change = None if full else cls._last_changes[name]
+        changed_at = entity.changed_at()
+        stmt = sa.select(
+            entity.id,
+            source.title,
+            source.popularity,
+            entity.deleted_at,
+            changed_at,
+            entity.created_at,
+            entity.updated_at,
+        )
+        since = datetime.min
+        if last_change is None:
+            stmt = stmt.where(entity.deleted_at.is_(None))
+        else:
+            since = last_change - timedelta(seconds=settings.AUTOCOMPLETE_REFRESH_LAG)
+            stmt = stmt.where(changed_at >= since)
+
+        async with AsyncDBClient.read_session() as session:
+            rows = (await session.execute(stmt)).all()
+        if not rows and last_change is not None:
+            return cls.indexes[name]
+
+        if last_change is None or len(rows) > settings.AUTOCOMPLETE_MAX_INCREMENTAL_ROWS:
+            if last_change is not None:
+                return await cls.refresh(name, full=True)
+            entries = [(row[0], row[1], float(row[2])) for row in rows if row[1]]
+            index = await ThreadClient.execute(PrefixIndex.build, entries)
+        else:
+            removed = [(row[0], row[1] or "") for row in rows]
+            added = [(row[0], row[1], float(row[2])) for row in rows if row[3] is None and row[1]]
+            retitled = {row[0] for row in rows if row[6] > max(row[5], since)}
+            index = await ThreadClient.execute(cls.indexes[name].update, removed, added, retitled)
+
+        cls._last_changes[name] = max((row[4] for row in rows), default=last_change)
+        if index is not cls.indexes[name]:
+            cls.indexes[name] = index
+            cls.log.debug("Autocomplete %s refreshed, %d rows read, %d entries.", name, len(rows), len(index))
+        return index
+
+    @classmethod
+    async def refresh_all(cls) -> None:
+        """Refresh every source, fully once per ``AUTOCOMPLETE_FULL_REFRESH_INTERVAL``."""
+        full = time.monotonic() >= cls._full_refresh_at
+        for name in SOURCES:
+            await cls.refresh(name, full=full)
+        if full:
+            cls._full_refresh_at = time.monotonic() + settings.AUTOCOMPLETE_FULL_REFRESH_INTERVAL
+
+    @classmethod
+    async def _refresh_periodically(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.AUTOCOMPLETE_REFRESH_INTERVAL)
+            try:
+                await cls.refresh_all()
+            except Exception:
+                cls.log.warning("Autocomplete refresh failed.", exc_info=True)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Load the indexes and keep them refreshed in the running loop."""
+        if cls._refresh_task is None:
+            try:
+                await cls.refresh_all()
+            except Exception:
+                cls.log.warning("Autocomplete initial load failed.", exc_info=True)
+            cls._refresh_task = asyncio.create_task(cls._refresh_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop refreshing the indexes."""
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
@@ -0,0 +1,193 @@
+import typing as t
+
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.entity import Category, CategoryXService
+from src.app.modules.db_client import AsyncDBClient
+from src.app.modules.thread_client import ThreadClient
+from src.config import settings
+
+_changed_at = Category.changed_at()
+
+
+class CategoryTreeSnapshot:
+    """Immutable materialized category hierarchy.
+
+    Attributes:
+        parents (dict[UUID, t.Optional[UUID]]): Parent of every live category.
+        children (dict[UUID, tuple[UUID, ...]]): Live children of every category.
+        descendants (dict[UUID, frozenset[UUID]]): Category and all its live
+            descendants.
+        paths (dict[UUID, tuple[UUID, ...]]): Category and its ancestors, root last.
+
+    """
+
+    __slots__ = ("parents", "children", "descendants", "paths")
+
+    def __init__(self, parents: dict[UUID, t.Optional[UUID]]) -> None:
+        """Initialize CategoryTreeSnapshot class object instance, build derived indices."""
+        self.parents = parents
+        children: dict[UUID, list[UUID]] = {}
+        roots = []
+        for category_id, parent_id in parents.items():
+            # Children of a deleted parent are detached, same as the CTE loader sees them.
+            if parent_id is None or parent_id not in parents:
+                roots.append(category_id)
+            else:
+                children.setdefault(parent_id, []).append(category_id)
+        self.children = {category_id: tuple(ids) for category_id, ids in children.items()}
+
+        # Paths top-down from the roots, categories in a cycle are unreachable and skipped.
+        paths: dict[UUID, tuple[UUID, ...]] = {}
+        order = []
+        queue: deque[tuple[UUID, tuple[UUID, ...]]] = deque((root, (root,)) for root in roots)
+        while queue:
+            category_id, path = queue.popleft()
+            paths[category_id] = path
+            order.append(category_id)
+            queue.extend((child_id, (child_id, *path)) for child_id in self.children.get(category_id, ()))
+        self.paths = paths
+
+        # Descendants bottom-up, every child is complete before its parent.
+        descendants: dict[UUID, frozenset[UUID]] = {}
+        for category_id in reversed(order):
+            ids = {category_id}
+            for child_id in self.children.get(category_id, ()):
+                ids |= descendants[child_id]
+            descendants[category_id] = frozenset(ids)
+        self.descendants = descendants
+
+
+class CategoryTree:
+    """In-memory category hierarchy shared by the requests of a worker.
+
+    Every gunicorn worker keeps its own snapshot and polls the ``category``
+    table every ``CATEGORY_TREE_REFRESH_INTERVAL`` seconds. Only the rows
+    changed since the last refresh are read, the snapshot is rebuilt when
+    they change the hierarchy. Hard deletes are caught by the full reload
+    every ``CATEGORY_TREE_FULL_REFRESH_INTERVAL`` seconds. Readers always see
+    a complete snapshot, it is swapped atomically.
+
+    Example:
+        ids = CategoryTree.descendant_ids(category_id)
+    """
+
+    snapshot: CategoryTreeSnapshot = CategoryTreeSnapshot({})
+    _last_change: t.Optional[datetime] = None
+    _full_refresh_at: float = 0.0
+    _refresh_task: t.Optional[asyncio.Task[None]] = None
+    _lock: t.Optional[asyncio.Lock] = None
+    log: logging.Logger = logging.getLogger(__name__)
+
+    @classmethod
+    async def refresh(cls, full: bool = False) -> CategoryTreeSnapshot:
+        """Bring the snapshot up to date with the db.
+
+        Rows changed up to ``CATEGORY_TREE_REFRESH_LAG`` seconds before the
+        last change seen are read again: ``now()`` is the start of the
+        writing transaction, one committing later may carry an earlier time.
+        Changes committed later than that are left to the full reload.
+        """
+        if cls._lock is None:
+            cls._lock = asyncio.Lock()
+
+        async with cls._lock:
+            since = None if full or time.monotonic() >= cls._full_refresh_at else cls._last_change
+            stmt = sa.select(Category.id, Category.parent_category_id, Category.deleted_at, _changed_at)
+            if since is not None:
+                stmt = stmt.where(_changed_at >= since - timedelta(seconds=settings.CATEGORY_TREE_REFRESH_LAG))
+            async with AsyncDBClient.read_session() as session:
+                rows = (await session.execute(stmt)).all()
+
+            snapshot = cls.snapshot
+            parents = cls._apply({} if since is None else dict(snapshot.parents), rows)
+            cls._last_change = max((row[3] for row in rows), default=cls._last_change)
+            if since is None:
+                cls._full_refresh_at = time.monotonic() + settings.CATEGORY_TREE_FULL_REFRESH_INTERVAL
+            elif parents == snapshot.parents:
+                # Nothing but titles changed, or rows already applied were read again.
+                return snapshot
+
+            cls.snapshot = await ThreadClient.execute(CategoryTreeSnapshot, parents)
+            cls.log.debug("Category tree refreshed, %d rows read, %d categories.", len(rows), len(parents))
+            return cls.snapshot
+
+    @staticmethod
+    def _apply(
+        parents: dict[UUID, t.Optional[UUID]],
+        rows: t.Sequence[sa.Row[t.Any]],
+    ) -> dict[UUID, t.Optional[UUID]]:
+        for category_id, parent_id, deleted_at, _ in rows:
+            if deleted_at is None:
+                parents[category_id] = parent_id
+            else:
+                parents.pop(category_id, None)
+        return parents
+
+    @classmethod
+    async def _refresh_periodically(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.CATEGORY_TREE_REFRESH_INTERVAL)
+            try:
+                await cls.refresh()
+            except Exception:
+                cls.log.warning("Category tree refresh failed.", exc_info=True)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Load the tree and keep it refreshed in the running loop."""
+        if cls._refresh_task is None:
+            try:
+                await cls.refresh(full=True)
+            except Exception:
+                cls.log.warning("Category tree initial load failed.", exc_info=True)
+            cls._refresh_task = asyncio.create_task(cls._refresh_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop refreshing the tree."""
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
+        cls._lock = None
+        cls._full_refresh_at = 0.0
+
+    @classmethod
+    def descendant_ids(cls, category_id: UUID) -> frozenset[UUID]:
+        """Get ids of the category and all its descendants, empty if unknown."""
+        return cls.snapshot.descendants.get(category_id, frozenset())
+
+    @classmethod
+    def path_to_root(cls, category_id: UUID) -> tuple[UUID, ...]:
+        """Get ids of the category and its ancestors, root last, empty if unknown."""
+        return cls.snapshot.paths.get(category_id, ())
+
+    @classmethod
+    def children_ids(cls, category_id: UUID) -> tuple[UUID, ...]:
+        """Get ids of the direct children of the category."""
+        return cls.snapshot.children.get(category_id, ())
+
+    @classmethod
+    async def find_service_ids(cls, async_session: AsyncSession, category_id: UUID) -> t.Sequence[UUID]:
+        """Select ids of services in the category subtree, one indexed query."""
+        category_ids = cls.descendant_ids(category_id)
+        if not category_ids:
+            return []
+        stmt = (
+            sa.select(CategoryXService.service_id)
+            .where(CategoryXService.category_id == sa.any_(Category._ids_param(category_ids)))
+            .distinct()
+        )
+        return (await async_session.scalars(stmt)).all()
@@ -0,0 +1,58 @@
+import typing as t
+
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from itsdangerous import BadSignature, URLSafeSerializer
+
+from src.app.entity.mixin import Page
+from src.config import settings
+
+# Cursors of one kind of listing are rejected by another.
+PAGE_CURSOR_SALT = "cursor"
+SEARCH_CURSOR_SALT = "search-cursor"
+
+
+class CursorError(ValueError):
+    """Pagination cursor is malformed or was not issued by us."""
+
+
+def _get_serializer(salt: str) -> URLSafeSerializer:
+    return URLSafeSerializer(settings.CURSOR_SECRET_KEY, salt=salt)
+
+
+def _dump_value(value: t.Any) -> t.Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (UUID, Decimal)):
+        return str(value)
+    return value
+
+
+def encode_cursor(values: t.Sequence[t.Any], salt: str = PAGE_CURSOR_SALT) -> str:
+    """Encode keyset position into an opaque signed cursor."""
+    return _get_serializer(salt).dumps([_dump_value(value) for value in values])
+
+
+def decode_cursor(cursor: str, salt: str = PAGE_CURSOR_SALT) -> list[t.Any]:
+    """Decode keyset position of a cursor.
+
+    ``UUID``, ``datetime`` and ``Decimal`` values come back as strings,
+    ``IDMixin.paginate`` converts them to the column types.
+    """
+    try:
+        values = _get_serializer(salt).loads(cursor)
+    except BadSignature as exc:
+        raise CursorError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise CursorError("Invalid cursor")
+    return values
+
+
+def encode_page_cursors(page: Page) -> tuple[t.Optional[str], t.Optional[str]]:
+    """Get next and previous page cursors of a page."""
+    return (
+        encode_cursor(page.next_key) if page.next_key is not None else None,
+        encode_cursor(page.prev_key) if page.prev_key is not None else None,
+    )
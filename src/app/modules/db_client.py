@@ -1,10 +1,15 @@
 import typing as t
 
+import asyncio
+import itertools
 import logging
 import time
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
 from uuid import uuid4
 
-from sqlalchemy import text
+from sqlalchemy import event, make_url, text
+from sqlalchemy.engine import Dialect
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
@@ -13,15 +18,60 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session, SessionTransaction
+from sqlalchemy.sql.expression import Executable
 
+from src.app.metrics import metrics
+from src.app.modules.db_pool import get_pool_options
 from src.config import settings
 
+# Monotonic time until which reads of the current request stay on the primary.
+_read_primary_until: ContextVar[float] = ContextVar("read_primary_until", default=0.0)
+
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+class PrimarySession(Session):
+    """Session bound to the primary, tracks whether it has written anything."""
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _after_flush(session: Session, flush_context: t.Any) -> None:
+    session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "do_orm_execute")
+def _do_orm_execute(orm_execute_state: t.Any) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _after_commit(session: Session) -> None:
+    if session.info.pop("has_writes", False):
+        AsyncDBClient.read_from_primary()
+
+
+@event.listens_for(PrimarySession, "after_soft_rollback")
+def _after_soft_rollback(session: Session, previous_transaction: SessionTransaction) -> None:
+    session.info.pop("has_writes", None)
+
 
 class AsyncDBClient:
 
     _connection_flg: bool = False
     async_engine: AsyncEngine
     AsyncSessionLocal: async_sessionmaker[AsyncSession]
+    replica_engines: dict[str, AsyncEngine] = {}
+    ReplicaSessionLocal: dict[str, async_sessionmaker[AsyncSession]] = {}
+    healthy_replicas: list[str] = []
+    _replica_counter: t.Iterator[int] = itertools.count()
+    _replica_monitor: t.Optional[asyncio.Task[None]] = None
     log: logging.Logger = logging.getLogger(__name__)
 
     @classmethod
@@ -35,22 +85,47 @@ class AsyncDBClient:
             cls.log.debug("Initialize AsyncEngine.")
             cls.async_engine = create_async_engine(
                 settings.DB_URI,
-                pool_pre_ping=True,
                 echo=settings.ECHO_SQL,
+                **get_pool_options(),
             )
             cls.AsyncSessionLocal = async_sessionmaker(
                 bind=cls.async_engine,
                 expire_on_commit=False,
                 autoflush=False,
                 future=True,
+                sync_session_class=PrimarySession,
             )
+            cls._init_replicas()
             cls._connection_flg = True
         return cls.async_engine
 
+    @classmethod
+    def _init_replicas(cls) -> None:
+        cls.replica_engines = {}
+        cls.ReplicaSessionLocal = {}
+        for replica_uri in settings.DB_REPLICA_URIS:
+            url = make_url(replica_uri)
+            name = f"{url.host}:{url.port or 5432}"
+            cls.log.debug("Initialize replica AsyncEngine %s.", name)
+            engine = create_async_engine(url, echo=settings.ECHO_SQL, **get_pool_options())
+            engine.sync_engine.pool.label = name  # type: ignore[attr-defined]
+            cls.replica_engines[name] = engine
+            cls.ReplicaSessionLocal[name] = async_sessionmaker(
+                bind=engine,
+                expire_on_commit=False,
+                autoflush=False,
+                future=True,
+            )
+        # Replicas are trusted until the first health check says otherwise.
+        cls.healthy_replicas = list(cls.replica_engines)
+
     @classmethod
     async def close_db_engine(cls) -> None:
         """Dispose of the connection pool used by this _asyncio.AsyncEngine."""
         if cls._connection_flg:
+            await cls.stop_replica_monitor()
+            for engine in cls.replica_engines.values():
+                await engine.dispose()
             await cls.async_engine.dispose()
             cls._connection_flg = False
 
@@ -71,6 +146,107 @@ class AsyncDBClient:
         """
         return await anext(cls._get_session())
 
+    @classmethod
+    def read_from_primary(cls, window: t.Optional[float] = None) -> None:
+        """Route reads of the current request to the primary for a while.
+
+        Called automatically after a session bound to the primary commits
+        writes, so the request reads its own writes despite replica lag.
+        """
+        if window is None:
+            window = settings.DB_READ_AFTER_WRITE_WINDOW
+        _read_primary_until.set(time.monotonic() + window)
+
+    @classmethod
+    def _choose_replica(cls) -> t.Optional[str]:
+        healthy_replicas = cls.healthy_replicas
+        if not healthy_replicas or time.monotonic() < _read_primary_until.get():
+            return None
+        return healthy_replicas[next(cls._replica_counter) % len(healthy_replicas)]
+
+    @classmethod
+    def get_read_engine(cls) -> AsyncEngine:
+        """Get engine for read only queries.
+
+        Healthy replicas are used round-robin, the primary is used when there
+        are none or the current request has just written.
+        """
+        replica = cls._choose_replica()
+        return cls.async_engine if replica is None else cls.replica_engines[replica]
+
+    @classmethod
+    async def get_read_session(cls) -> async_sessionmaker[AsyncSession]:
+        """Get async db session factory for read only queries.
+
+        :return: _description_
+        :rtype: async_sessionmaker
+        """
+        replica = cls._choose_replica()
+        return cls.AsyncSessionLocal if replica is None else cls.ReplicaSessionLocal[replica]
+
+    @classmethod
+    @asynccontextmanager
+    async def read_session(cls) -> t.AsyncIterator[AsyncSession]:
+        """Open session for read only queries.
+
+        Example:
+            async with AsyncDBClient.read_session() as session:
+                service = await Service.find_one(session, service_id)
+        """
+        session_local = await cls.get_read_session()
+        async with session_local() as session:
+            yield session
+
+    @classmethod
+    async def check_replicas(cls) -> None:
+        """Measure replication lag, take lagging or broken replicas out of rotation."""
+        healthy_replicas = []
+        for name, engine in cls.replica_engines.items():
+            try:
+                async with engine.connect() as conn:
+                    lag = float(await conn.scalar(text(REPLICA_LAG_QUERY)) or 0)
+            except Exception:
+                cls.log.warning("Replica %s health check failed.", name, exc_info=True)
+                metrics.db_replica_healthy.labels(name).set(0)
+                continue
+
+            metrics.db_replica_lag.labels(name).set(lag)
+            if lag > settings.DB_REPLICA_MAX_LAG:
+                cls.log.warning("Replica %s lags %.2fs behind, out of rotation.", name, lag)
+                metrics.db_replica_healthy.labels(name).set(0)
+                continue
+
+            metrics.db_replica_healthy.labels(name).set(1)
+            healthy_replicas.append(name)
+
+        cls.healthy_replicas = healthy_replicas
+
+    @classmethod
+    async def _monitor_replicas(cls) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(cls.check_replicas(), timeout=settings.DB_REPLICA_CHECK_INTERVAL)
+            except asyncio.TimeoutError:
+                cls.log.warning("Replica health check timed out.")
+            await asyncio.sleep(settings.DB_REPLICA_CHECK_INTERVAL)
+
+    @classmethod
+    def start_replica_monitor(cls) -> None:
+        """Start periodic replica health checks in the running loop."""
+        if cls.replica_engines and cls._replica_monitor is None:
+            cls._replica_monitor = asyncio.create_task(cls._monitor_replicas())
+
+    @classmethod
+    async def stop_replica_monitor(cls) -> None:
+        """Stop replica health checks."""
+        if cls._replica_monitor is not None:
+            cls._replica_monitor.cancel()
+            try:
+                await cls._replica_monitor
+            except asyncio.CancelledError:
+                pass
+            cls._replica_monitor = None
+
     @classmethod
     async def iter_cursor(
         cls,
@@ -78,14 +254,19 @@ class AsyncDBClient:
         params: t.Mapping[str, t.Any],
         batch_size: int = 1_000,
         cur_name_: str | None = None,
+        read_only: bool = False,
     ) -> t.AsyncIterator[t.Sequence[Row[t.Any]]]:
-        """Server side db cursor."""
+        """Server side db cursor.
+
+        With ``read_only`` the cursor is opened on a replica when one is healthy.
+        """
         cur_name = f"cur_{cur_name_ or uuid4().hex}_{time.time_ns()}"
         query_cursor = f"DECLARE {cur_name} CURSOR FOR {query}"
         query_next_page = f"FETCH %(batch_size)s FROM {cur_name}"
         params_next_page = {"batch_size": batch_size}
+        engine = cls.get_read_engine() if read_only else cls.async_engine
 
-        async with cls.async_engine.begin() as conn:
+        async with engine.begin() as conn:
             await conn.execute(text(query_cursor), params)
 
             while True:
@@ -94,3 +275,113 @@ class AsyncDBClient:
                 if not len(batch):
                     return
                 yield batch
+
+    @classmethod
+    async def stream_cursor(
+        cls,
+        query: str | Executable,
+        params: t.Optional[t.Mapping[str, t.Any]] = None,
+        batch_size: int = 1_000,
+        read_ahead: int = 2,
+        columnar: bool = False,
+        read_only: bool = False,
+    ) -> t.AsyncIterator[t.Sequence[t.Sequence[t.Any]]]:
+        """Stream query results through a native asyncpg server side cursor.
+
+        The next batches are fetched in the background while the caller
+        processes the current one, at most ``read_ahead`` batches are fetched
+        ahead of it. Rows are yielded as the asyncpg ``Record`` objects the
+        driver decoded, tuple-like and comparable to tuples, without
+        building a ``Row`` or a copy per row. With ``columnar`` a batch is one
+        tuple of values per column.
+
+        SQLAlchemy compiles the statement and processes its parameters, so
+        expanding ``IN`` parameters and type bind processors apply as with
+        ``execute``. Result processors do not, values are as asyncpg decodes
+        them.
+
+        The cursor and its transaction are closed when the consumer stops
+        early; use ``contextlib.aclosing`` to have it happen right at the
+        ``break`` instead of at garbage collection.
+
+        :param query: SQL text with ``:name`` binds or SQLAlchemy statement
+        :type query: str | Executable
+        :param params: bind parameter values
+        :type params: t.Optional[t.Mapping[str, t.Any]]
+        :param batch_size: rows per fetch
+        :type batch_size: int
+        :param read_ahead: number of batches fetched ahead of the consumer
+        :type read_ahead: int
+        :param columnar: yield column-oriented batches
+        :type columnar: bool
+        :param read_only: open the cursor on a replica when one is healthy
+        :type read_only: bool
+        :return: batches of rows
+        :rtype: t.AsyncIterator[t.Sequence[t.Sequence[t.Any]]]
+        """
+        stmt = text(query) if isinstance(query, str) else query
+        engine = cls.get_read_engine() if read_only else cls.async_engine
+        queue: asyncio.Queue[t.Sequence[t.Sequence[t.Any]] | BaseException | None] = asyncio.Queue()
+        # A slot per batch fetched and not yet taken by the consumer.
+        slots = asyncio.Semaphore(max(read_ahead, 1))
+
+        async with engine.connect() as conn:
+            statement = cls._driver_statement(stmt, params, conn.dialect)
+            raw_connection = await conn.get_raw_connection()
+            producer = asyncio.create_task(
+                cls._read_ahead(raw_connection.driver_connection, statement, batch_size, columnar, queue, slots),
+            )
+            try:
+                while (item := await queue.get()) is not None:
+                    if isinstance(item, BaseException):
+                        raise item
+                    slots.release()
+                    yield item
+            finally:
+                producer.cancel()
+                with suppress(asyncio.CancelledError):
+                    await producer
+
+    @staticmethod
+    def _driver_statement(
+        stmt: Executable,
+        params: t.Optional[t.Mapping[str, t.Any]],
+        dialect: Dialect,
+    ) -> tuple[str, list[t.Any]]:
+        """Get SQL and positional arguments of ``stmt`` for the driver, as SQLAlchemy would execute it."""
+        compiled = stmt.compile(dialect=dialect)  # type: ignore[attr-defined]
+        expanded = compiled.construct_expanded_state(params, escape_names=False)
+        processors = {
+            name: dialect.type_descriptor(bind.type).bind_processor(dialect) for name, bind in compiled.binds.items()
+        }
+        # Expanded IN parameters get the processor of their element type.
+        processors.update(expanded.processors)
+        args = []
+        for name, value in zip(expanded.positiontup or (), expanded.positional_parameters):
+            processor = processors.get(name)
+            args.append(processor(value) if processor is not None else value)
+        return expanded.statement, args
+
+    @staticmethod
+    async def _read_ahead(
+        driver_connection: t.Any,
+        statement: tuple[str, list[t.Any]],
+        batch_size: int,
+        columnar: bool,
+        queue: asyncio.Queue[t.Sequence[t.Sequence[t.Any]] | BaseException | None],
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """Fetch batches of ``statement`` into ``queue`` while ``slots`` are free, then None or the error."""
+        sql, args = statement
+        try:
+            async with driver_connection.transaction():
+                cursor = await driver_connection.cursor(sql, *args)
+                while True:
+                    await slots.acquire()
+                    batch = await cursor.fetch(batch_size)
+                    if not batch:
+                        break
+                    queue.put_nowait(tuple(zip(*batch)) if columnar else batch)
+            queue.put_nowait(None)
+        except Exception as exc:
+            queue.put_nowait(exc)
@@ -0,0 +1,106 @@
+import typing as t
+
+import time
+
+from sqlalchemy import Connection, Engine, event, exc
+from sqlalchemy.engine.interfaces import CacheStats, DBAPICursor, ExecutionContext
+from sqlalchemy.pool import (
+    AsyncAdaptedQueuePool,
+    ConnectionPoolEntry,
+    PoolProxiedConnection,
+)
+
+from src.app.metrics import metrics
+from src.config import settings
+
+_COMPILED_CACHE_RESULTS = {
+    CacheStats.CACHE_HIT: "hit",
+    CacheStats.CACHE_MISS: "miss",
+    CacheStats.CACHING_DISABLED: "uncached",
+    CacheStats.NO_CACHE_KEY: "uncached",
+}
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool exporting its state to prometheus.
+
+    Attributes:
+        label (str): Value of the ``pool`` label of the pool metrics.
+
+    """
+
+    label: str = "primary"
+
+    def connect(self) -> PoolProxiedConnection:
+        """Checkout connection, observe wait time and connection age."""
+        ts_start = time.monotonic()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            metrics.db_pool_timeouts.labels(self.label).inc()
+            raise
+        finally:
+            metrics.db_pool_checkout_timings.labels(self.label).observe(time.monotonic() - ts_start)
+
+        # Record info is cleared when a connection is invalidated, so a
+        # reconnected entry starts counting its age again.
+        connected_at = connection.info.setdefault("connected_at", ts_start)
+        metrics.db_pool_connection_age.labels(self.label).observe(time.monotonic() - connected_at)
+        self._observe_state()
+        return connection
+
+    def _do_return_conn(self, record: ConnectionPoolEntry) -> None:
+        super()._do_return_conn(record)
+        self._observe_state()
+
+    def _observe_state(self) -> None:
+        metrics.db_pool_checked_out.labels(self.label).set(self.checkedout())
+        metrics.db_pool_overflow.labels(self.label).set(max(self.overflow(), 0))
+
+    def recreate(self) -> "InstrumentedAsyncAdaptedQueuePool":
+        """Recreate pool keeping its metrics label."""
+        pool = t.cast(InstrumentedAsyncAdaptedQueuePool, super().recreate())
+        pool.label = self.label
+        return pool
+
+
+def get_pool_options() -> dict[str, t.Any]:
+    """Get engine pool and statement cache options sized for a single gunicorn worker.
+
+    ``DB_MAX_CONNECTIONS`` is the connection budget of the whole pod; it is
+    split between ``WORKERS`` processes unless ``DB_POOL_SIZE`` is set.
+    """
+    pool_size = settings.DB_POOL_SIZE
+    if pool_size is None:
+        pool_size = max(settings.DB_MAX_CONNECTIONS // settings.WORKERS - settings.DB_MAX_OVERFLOW, 1)
+
+    return {
+        "poolclass": InstrumentedAsyncAdaptedQueuePool,
+        "pool_pre_ping": True,
+        "pool_size": pool_size,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "query_cache_size": settings.DB_QUERY_CACHE_SIZE,
+        "connect_args": {"prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE},
+    }
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _observe_statement_caches(
+    conn: Connection,
+    cursor: DBAPICursor,
+    statement: str,
+    parameters: t.Any,
+    context: t.Optional[ExecutionContext],
+    executemany: bool,
+) -> None:
+    label = getattr(conn.engine.pool, "label", InstrumentedAsyncAdaptedQueuePool.label)
+    result = _COMPILED_CACHE_RESULTS.get(getattr(context, "cache_hit", None))  # type: ignore[arg-type]
+    if result is not None:
+        metrics.db_compiled_cache.labels(label, result).inc()
+
+    # Prepared statements of the SQLAlchemy asyncpg adapter, executemany does not prepare.
+    cache = getattr(getattr(cursor, "_adapt_connection", None), "_prepared_statement_cache", None)
+    if cache is not None and not executemany:
+        metrics.db_prepared_statement_cache.labels(label, "hit" if statement in cache else "miss").inc()
@@ -0,0 +1,425 @@
+import typing as t
+
+import asyncio
+import bisect
+import collections
+import heapq
+import itertools
+import logging
+import math
+import operator
+import time
+from array import array
+from datetime import datetime, timedelta
+from uuid import UUID
+
+import sqlalchemy as sa
+
+from src.app.entity import ProviderEnity
+from src.app.modules.db_client import AsyncDBClient
+from src.app.modules.thread_client import ThreadClient
+from src.config import settings
+
+# Same radius as earthdistance's earth(), so distances match the db queries.
+EARTH_RADIUS = 6_378_168.0
+
+_changed_at = ProviderEnity.changed_at()
+
+Point = tuple[UUID, float, float]
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Great circle distance in meters between two points given in degrees."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi, dlmb = phi2 - phi1, math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS * math.asin(min(math.sqrt(a), 1.0))
+
+
+class _PackedIds:
+    """Sequence view of a blob of packed 16 byte ids, for ``bisect``."""
+
+    __slots__ = ("_blob",)
+
+    def __init__(self, blob: bytes) -> None:
+        """Initialize _PackedIds class object instance."""
+        self._blob = blob
+
+    def __len__(self) -> int:
+        """Get number of ids."""
+        return len(self._blob) // 16
+
+    def __getitem__(self, i: int) -> bytes:
+        """Get packed id at ``i``."""
+        return self._blob[i * 16 : i * 16 + 16]
+
+
+def _shifted(offsets: array, shift: int) -> t.Iterable[int]:  # type: ignore[type-arg]
+    return offsets if not shift else map(operator.add, offsets, itertools.repeat(shift))
+
+
+class GeoGrid:
+    """Immutable grid index of points on a sphere.
+
+    Points are bucketed into ``cell_size`` degree cells numbered row by row
+    and stored sorted by cell in flat ``float32`` arrays (~1 m precision)
+    next to a blob of packed 16 byte ids. A run of cells in a row is a
+    contiguous slice of the points, found by bisecting the cell numbers. For
+    updates to find the points they change, the ids are also kept sorted
+    with the ``int32`` cell of each, bisected too. About 44 bytes per point
+    plus 16 bytes per non-empty cell, 54 MB for the 1M providers of
+    ``tests/benchmarks/geo_index.py``.
+
+    Attributes:
+        cell_size (float): Cell edge in degrees.
+
+    """
+
+    __slots__ = ("cell_size", "_ids", "_lats", "_lons", "_cells", "_offsets", "_n_cols", "_sorted_ids", "_id_cells")
+
+    def __init__(
+        self,
+        ids: t.Sequence[UUID],
+        lats: t.Sequence[float],
+        lons: t.Sequence[float],
+        cell_size: float,
+    ) -> None:
+        """Initialize GeoGrid class object instance."""
+        self.cell_size = cell_size
+        self._n_cols = math.ceil(360 / cell_size)
+        keys = [self._cell(lat, lon) for lat, lon in zip(lats, lons)]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        packed = [object_id.bytes for object_id in ids]
+        self._ids = b"".join(packed[i] for i in order)
+        self._lats = array("f", (lats[i] for i in order))
+        self._lons = array("f", (lons[i] for i in order))
+        # Non-empty cells and the offset of their first point, plus the end offset.
+        self._cells = array("q")
+        self._offsets = array("q")
+        for pos, i in enumerate(order):
+            if not self._cells or self._cells[-1] != keys[i]:
+                self._cells.append(keys[i])
+                self._offsets.append(pos)
+        self._offsets.append(len(order))
+        by_id = sorted(range(len(keys)), key=packed.__getitem__)
+        self._sorted_ids = b"".join(packed[i] for i in by_id)
+        self._id_cells = array(self._cell_typecode(), (keys[i] for i in by_id))
+
+    def __len__(self) -> int:
+        """Get number of points."""
+        return len(self._lats)
+
+    def _cell(self, lat: float, lon: float) -> int:
+        row = math.floor((lat + 90) / self.cell_size)
+        col = math.floor((lon + 180) / self.cell_size) % self._n_cols
+        return row * self._n_cols + col
+
+    def _cell_typecode(self) -> str:
+        """Get typecode of the cell numbers of ids, ``int32`` unless the cells do not fit."""
+        return "i" if (math.floor(180 / self.cell_size) + 1) * self._n_cols <= 2**31 else "q"
+
+    def _id_index(self, object_id: UUID) -> int:
+        """Get index of ``object_id`` in the sorted ids, or where it would be inserted."""
+        return bisect.bisect_left(_PackedIds(self._sorted_ids), object_id.bytes)
+
+    def _position(self, object_id: UUID) -> t.Optional[tuple[int, int]]:
+        """Get position of the point of ``object_id`` and its cell."""
+        index = self._id_index(object_id)
+        needle = object_id.bytes
+        if self._sorted_ids[index * 16 : index * 16 + 16] != needle:
+            return None
+        cell = self._id_cells[index]
+        i = bisect.bisect_left(self._cells, cell)
+        end = self._offsets[i + 1] * 16
+        pos = self._ids.find(needle, self._offsets[i] * 16, end)
+        while pos != -1 and pos % 16:
+            pos = self._ids.find(needle, pos + 1, end)
+        return None if pos == -1 else (pos // 16, cell)
+
+    def update(self, removed: t.Iterable[UUID], added: t.Iterable[Point]) -> "GeoGrid":
+        """Get new grid without ``removed`` ids and with ``added`` points, ``self`` when nothing changes.
+
+        An added id already in the grid is moved. Only the cells of the
+        changes are searched and the points are copied in slices, not sorted
+        again.
+        """
+        changes: dict[UUID, t.Optional[tuple[float, float]]] = dict.fromkeys(removed)
+        # Rounded as stored, an unchanged point compares equal.
+        changes.update((object_id, tuple(array("f", (lat, lon)))) for object_id, lat, lon in added)  # type: ignore
+        drops, inserts = self._edits(changes)
+        if not drops and not inserts:
+            return self
+        return self._edited(drops, inserts)
+
+    def _edits(
+        self,
+        changes: dict[UUID, t.Optional[tuple[float, float]]],
+    ) -> tuple[list[tuple[int, int, UUID]], list[tuple[int, UUID, float, float]]]:
+        """Get positions and cells of the points to drop and cells of the points to insert."""
+        drops, inserts = [], []
+        for object_id, point in changes.items():
+            found = self._position(object_id)
+            if found is not None and point == (self._lats[found[0]], self._lons[found[0]]):
+                continue
+            if found is not None:
+                drops.append((*found, object_id))
+            if point is not None:
+                inserts.append((self._cell(*point), object_id, *point))
+        return drops, inserts
+
+    def _edited(self, drops: list[tuple[int, int, UUID]], inserts: list[tuple[int, UUID, float, float]]) -> "GeoGrid":
+        # Points go after the last point of their cell, before the next cell.
+        edits = sorted(
+            [(pos, True, None) for pos, *_ in drops]
+            + [(self._offsets[bisect.bisect_right(self._cells, insert[0])], False, insert) for insert in inserts],
+        )
+        ids, lats, lons = bytearray(), array("f"), array("f")
+        start = 0
+        for pos, drop, insert in edits:
+            ids += self._ids[start * 16 : pos * 16]
+            lats.extend(self._lats[start:pos])
+            lons.extend(self._lons[start:pos])
+            start = pos + 1 if drop else pos
+            if insert is not None:
+                ids += insert[1].bytes
+                lats.append(insert[2])
+                lons.append(insert[3])
+        ids += self._ids[start * 16 :]
+        lats.extend(self._lats[start:])
+        lons.extend(self._lons[start:])
+
+        grid = GeoGrid.__new__(GeoGrid)
+        grid.cell_size, grid._n_cols = self.cell_size, self._n_cols
+        grid._ids, grid._lats, grid._lons = bytes(ids), lats, lons
+        grid._sorted_ids, grid._id_cells = self._reindexed(
+            [object_id for *_, object_id in drops],
+            [(object_id, cell) for cell, object_id, *_ in inserts],
+        )
+        delta = collections.Counter(cell for cell, *_ in inserts)
+        delta.subtract(cell for _, cell, _ in drops)
+        grid._cells, grid._offsets = self._runs(delta)
+        return grid
+
+    def _reindexed(
+        self,
+        removed: list[UUID],
+        added: list[tuple[UUID, int]],
+    ) -> tuple[bytes, array]:  # type: ignore[type-arg]
+        """Get sorted ids and their cells without ``removed`` and with ``added`` ids, copied in slices."""
+        # An id both removed and added is inserted before its old entry is skipped.
+        edits = sorted(
+            [(self._id_index(object_id), True, b"", 0) for object_id in removed]
+            + [(self._id_index(object_id), False, object_id.bytes, cell) for object_id, cell in added],
+        )
+        ids, cells = bytearray(), array(self._id_cells.typecode)
+        start = 0
+        for index, drop, needle, cell in edits:
+            ids += self._sorted_ids[start * 16 : index * 16]
+            cells.extend(self._id_cells[start:index])
+            start = index + 1 if drop else index
+            if not drop:
+                ids += needle
+                cells.append(cell)
+        ids += self._sorted_ids[start * 16 :]
+        cells.extend(self._id_cells[start:])
+        return bytes(ids), cells
+
+    def _runs(self, delta: collections.Counter[int]) -> tuple[array, array]:  # type: ignore[type-arg]
+        """Get non-empty cells and their offsets after the point counts of cells change by ``delta``."""
+        cells, offsets = array("q"), array("q")
+        i = shift = 0
+        for cell in sorted(delta):
+            # Cells between the changed ones are copied, offsets shifted by the changes before them.
+            j = bisect.bisect_left(self._cells, cell, i)
+            cells.extend(self._cells[i:j])
+            offsets.extend(_shifted(self._offsets[i:j], shift))
+            i = j + 1 if j < len(self._cells) and self._cells[j] == cell else j
+            count = self._offsets[i] - self._offsets[j] + delta[cell]
+            if count:
+                cells.append(cell)
+                offsets.append(self._offsets[j] + shift)
+            shift += delta[cell]
+        cells.extend(self._cells[i:])
+        offsets.extend(_shifted(self._offsets[i:], shift))
+        return cells, offsets
+
+    def _span(self, first: int, last: int) -> tuple[int, int]:
+        """Get offset range of the points in cells ``first`` to ``last``."""
+        return (
+            self._offsets[bisect.bisect_left(self._cells, first)],
+            self._offsets[bisect.bisect_right(self._cells, last)],
+        )
+
+    def _spans(self, lat: float, lon: float, radius: float) -> t.Iterator[tuple[int, int]]:
+        """Yield offset ranges of the cells overlapping the bounding box of the circle."""
+        dlat = math.degrees(radius / EARTH_RADIUS)
+        lat_min, lat_max = max(lat - dlat, -90.0), min(lat + dlat, 90.0)
+        cos_lat = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+        dlon = 180.0 if cos_lat <= 1e-9 else min(dlat / cos_lat, 180.0)
+
+        row_min = math.floor((lat_min + 90) / self.cell_size)
+        row_max = math.floor((lat_max + 90) / self.cell_size)
+        n_cols = self._n_cols
+        if dlon >= 180.0:
+            yield self._span(row_min * n_cols, row_max * n_cols + n_cols - 1)
+            return
+
+        col_min = math.floor((lon - dlon + 180) / self.cell_size) % n_cols
+        col_max = math.floor((lon + dlon + 180) / self.cell_size) % n_cols
+        for row in range(row_min, row_max + 1):
+            if col_min <= col_max:
+                yield self._span(row * n_cols + col_min, row * n_cols + col_max)
+            else:
+                # Box crosses the antimeridian.
+                yield self._span(row * n_cols + col_min, row * n_cols + n_cols - 1)
+                yield self._span(row * n_cols, row * n_cols + col_max)
+
+    def within(self, lat: float, lon: float, radius: float, limit: t.Optional[int] = None) -> list[tuple[UUID, float]]:
+        """Find points within ``radius`` meters, nearest first, with their distance."""
+        lats, lons = self._lats, self._lons
+        # Cheap latitude band check before the exact distance.
+        dlat = math.degrees(radius / EARTH_RADIUS)
+        lat_min, lat_max = lat - dlat, lat + dlat
+        found = []
+        for start, end in self._spans(lat, lon, radius):
+            for i in range(start, end):
+                if lat_min <= lats[i] <= lat_max:
+                    distance = haversine(lat, lon, lats[i], lons[i])
+                    if distance <= radius:
+                        found.append((distance, i))
+
+        found = heapq.nsmallest(limit, found) if limit is not None else sorted(found)
+        return [(UUID(bytes=self._ids[i * 16 : i * 16 + 16]), distance) for distance, i in found]
+
+    def nearest(self, lat: float, lon: float, k: int) -> list[tuple[UUID, float]]:
+        """Find ``k`` nearest points with their distance in meters.
+
+        Searches circles of doubling radius starting from one cell, all points
+        closer than the radius are seen, so ``k`` hits are the true nearest.
+        """
+        radius = self.cell_size * math.pi / 180 * EARTH_RADIUS
+        while True:
+            found = self.within(lat, lon, radius, limit=k)
+            if len(found) >= min(k, len(self)) or radius >= math.pi * EARTH_RADIUS:
+                return found
+            radius *= 2
+
+
+class ProviderGeoIndex:
+    """In-process grid index of live provider positions.
+
+    Opt-in with ``GEO_INDEX_ENABLED``. Every worker loads the positions at
+    startup, afterwards only providers changed since the last refresh are
+    read and applied to a copy of the grid off the loop. A full reload every
+    ``GEO_INDEX_FULL_REFRESH_INTERVAL`` seconds catches hard deletes. Lookups
+    return provider ids; ``ProviderEnity.find_within`` and
+    ``ProviderEnity.find_nearest`` are the db-backed equivalents and should be
+    used while ``grid`` is not loaded.
+
+    Example:
+        if ProviderGeoIndex.grid is not None:
+            hits = ProviderGeoIndex.grid.nearest(lat, lon, k=10)
+    """
+
+    grid: t.Optional[GeoGrid] = None
+    _last_change: t.Optional[datetime] = None
+    _full_refresh_at: float = 0.0
+    _refresh_task: t.Optional[asyncio.Task[None]] = None
+    log: logging.Logger = logging.getLogger(__name__)
+
+    @classmethod
+    async def refresh(cls, full: bool = False) -> t.Optional[GeoGrid]:
+        """Apply providers changed since the last refresh, or reload all of them with ``full``.
+
+        Rows changed up to ``GEO_INDEX_REFRESH_LAG`` seconds before the last
+        change seen are read again, see ``CategoryTree.refresh``.
+        """
+        grid, last_change = cls.grid, cls._last_change
+        if full or grid is None or last_change is None or time.monotonic() >= cls._full_refresh_at:
+            return await cls._load()
+
+        stmt = sa.select(
+            ProviderEnity.id,
+            sa.cast(ProviderEnity.lat, sa.Double),
+            sa.cast(ProviderEnity.lon, sa.Double),
+            ProviderEnity.deleted_at,
+            _changed_at,
+        ).where(_changed_at >= last_change - timedelta(seconds=settings.GEO_INDEX_REFRESH_LAG))
+        async with AsyncDBClient.read_session() as session:
+            rows = (await session.execute(stmt)).all()
+        if len(rows) > settings.GEO_INDEX_MAX_INCREMENTAL_ROWS:
+            return await cls._load()
+
+        removed = [row[0] for row in rows]
+        added = [(row[0], row[1], row[2]) for row in rows if row[3] is None and None not in (row[1], row[2])]
+        updated = cls.grid = await ThreadClient.execute(grid.update, removed, added)
+        cls._last_change = max((row[4] for row in rows), default=last_change)
+        if updated is not grid:
+            cls.log.debug("Provider geo index updated, %d rows read, %d providers.", len(rows), len(updated))
+        return updated
+
+    @classmethod
+    async def _load(cls) -> GeoGrid:
+        # Taken first, changes made while streaming are read by the next refresh.
+        async with AsyncDBClient.read_session() as session:
+            last_change = await session.scalar(sa.select(sa.func.max(_changed_at)))
+
+        stmt = sa.select(
+            ProviderEnity.id,
+            sa.cast(ProviderEnity.lat, sa.Double),
+            sa.cast(ProviderEnity.lon, sa.Double),
+        ).where(
+            ProviderEnity.deleted_at.is_(None),
+            ProviderEnity.lat.is_not(None),
+            ProviderEnity.lon.is_not(None),
+        )
+        ids: list[UUID] = []
+        lats: list[float] = []
+        lons: list[float] = []
+        async for batch_ids, batch_lats, batch_lons in AsyncDBClient.stream_cursor(
+            stmt,
+            batch_size=10_000,
+            columnar=True,
+            read_only=True,
+        ):
+            ids.extend(batch_ids)
+            lats.extend(batch_lats)
+            lons.extend(batch_lons)
+
+        grid = cls.grid = await ThreadClient.execute(GeoGrid, ids, lats, lons, settings.GEO_INDEX_CELL_SIZE)
+        cls._last_change = last_change
+        cls._full_refresh_at = time.monotonic() + settings.GEO_INDEX_FULL_REFRESH_INTERVAL
+        cls.log.debug("Provider geo index rebuilt, %d providers.", len(ids))
+        return grid
+
+    @classmethod
+    async def _refresh_periodically(cls) -> None:
+        while True:
+            await asyncio.sleep(settings.GEO_INDEX_REFRESH_INTERVAL)
+            try:
+                await cls.refresh()
+            except Exception:
+                cls.log.warning("Provider geo index refresh failed.", exc_info=True)
+
+    @classmethod
+    async def start(cls) -> None:
+        """Load the index and keep it refreshed in the running loop, if enabled."""
+        if settings.GEO_INDEX_ENABLED and cls._refresh_task is None:
+            try:
+                await cls.refresh()
+            except Exception:
+                cls.log.warning("Provider geo index initial load failed.", exc_info=True)
+            cls._refresh_task = asyncio.create_task(cls._refresh_periodically())
+
+    @classmethod
+    async def stop(cls) -> None:
+        """Stop refreshing the index."""
+        if cls._refresh_task is not None:
+            cls._refresh_task.cancel()
+            try:
+                await cls._refresh_task
+            except asyncio.CancelledError:
+                pass
+            cls._refresh_task = None
+        cls._full_refresh_at = 0.0
@@ -0,0 +1,162 @@
+import typing as t
+
+import enum
+import math
+import time
+
+from src.app.metrics import metrics
+from src.config import settings
+
+
+class BreakerState(enum.IntEnum):
+    """Circuit breaker state, the value is exported as the state metric."""
+
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class CircuitOpenError(Exception):
+    """Call failed fast, the circuit breaker of the host is open.
+
+    Not an ``aiohttp.ClientError``: nothing was sent, retrying it right away
+    fails again.
+
+    Attributes:
+        host (str): Host and port of the open circuit.
+        retry_after (float): Seconds until probe calls are let through.
+
+    """
+
+    def __init__(self, host: str, retry_after: float) -> None:
+        """Initialize CircuitOpenError class object instance."""
+        super().__init__(f"Circuit breaker of {host} is open, retry in {retry_after:.1f}s")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """Circuit breaker of the calls to one host.
+
+    Closed, calls outcomes are counted in a rolling window of one second
+    buckets. Once the window holds ``min_calls`` calls with an error rate of
+    ``error_rate`` or more the breaker opens and calls fail fast with
+    ``CircuitOpenError`` for ``open_duration`` seconds. Then it is half-open:
+    up to ``probes`` calls at a time go through, ``probes`` successes close
+    the breaker and a failure opens it again.
+
+    Attributes:
+        host (str): Host and port the breaker guards, the metrics label.
+        state (BreakerState): Current state, open turns half-open lazily.
+
+    """
+
+    def __init__(
+        self,
+        host: str,
+        window: t.Optional[float] = None,
+        min_calls: t.Optional[int] = None,
+        error_rate: t.Optional[float] = None,
+        open_duration: t.Optional[float] = None,
+        probes: t.Optional[int] = None,
+    ) -> None:
+        """Initialize CircuitBreaker class object instance, defaults from settings."""
+        self.host = host
+        self.min_calls = min_calls if min_calls is not None else settings.HTTP_BREAKER_MIN_CALLS
+        self.error_rate = error_rate if error_rate is not None else settings.HTTP_BREAKER_ERROR_RATE
+        self.open_duration = open_duration if open_duration is not None else settings.HTTP_BREAKER_OPEN_DURATION
+        self.probes = probes if probes is not None else settings.HTTP_BREAKER_PROBES
+        n_buckets = math.ceil(window if window is not None else settings.HTTP_BREAKER_WINDOW)
+        # Calls and failures per second, indexed by the second modulo the window.
+        self._calls = [0] * n_buckets
+        self._failures = [0] * n_buckets
+        self._seconds = [0] * n_buckets
+        self.state = BreakerState.CLOSED
+        self._opened_at = 0.0
+        # Count of half-open periods, probes of an earlier one are ignored.
+        self._half_opened = 0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        metrics.http_breaker_state.labels(host).set(self.state)
+
+    def before_call(self) -> t.Optional[int]:
+        """Let a call through or fail it fast.
+
+        :return: half-open period of a probe call, None for other calls, pass
+            it to ``after_call``
+        :rtype: t.Optional[int]
+        :raises CircuitOpenError: when open, or half-open with every probe
+            slot taken
+        """
+        if self.state is BreakerState.OPEN:
+            retry_after = self._opened_at + self.open_duration - time.monotonic()
+            if retry_after > 0:
+                metrics.http_breaker_rejected.labels(self.host).inc()
+                raise CircuitOpenError(self.host, retry_after)
+            self._transition(BreakerState.HALF_OPEN)
+
+        if self.state is BreakerState.HALF_OPEN:
+            if self._probes_in_flight >= self.probes - self._probe_successes:
+                metrics.http_breaker_rejected.labels(self.host).inc()
+                raise CircuitOpenError(self.host, 0.0)
+            self._probes_in_flight += 1
+            return self._half_opened
+        return None
+
+    def after_call(self, probe: t.Optional[int], failed: t.Optional[bool]) -> None:
+        """Record the outcome of a call let through, None when it has none, e.g. cancelled."""
+        if probe is not None:
+            self._after_probe(probe, failed)
+        elif failed is not None and self.state is BreakerState.CLOSED:
+            # Calls let through before the breaker opened tell nothing new.
+            self._after_closed_call(failed)
+
+    def _after_probe(self, half_opened: int, failed: t.Optional[bool]) -> None:
+        if self.state is not BreakerState.HALF_OPEN or half_opened != self._half_opened:
+            # Another probe already decided, this period or an earlier one.
+            return
+        self._probes_in_flight -= 1
+        if failed:
+            self._open()
+        elif failed is not None:
+            self._probe_successes += 1
+            if self._probe_successes >= self.probes:
+                self._transition(BreakerState.CLOSED)
+
+    def _after_closed_call(self, failed: bool) -> None:
+        calls, failures = self._count(failed)
+        if calls >= self.min_calls and failures >= calls * self.error_rate:
+            self._open()
+
+    def _count(self, failed: bool) -> tuple[int, int]:
+        """Add a call to the window, get calls and failures in the window."""
+        second = int(time.monotonic())
+        bucket = second % len(self._calls)
+        if self._seconds[bucket] != second:
+            self._seconds[bucket] = second
+            self._calls[bucket] = self._failures[bucket] = 0
+        self._calls[bucket] += 1
+        self._failures[bucket] += failed
+
+        oldest = second - len(self._calls)
+        calls = failures = 0
+        for i, bucket_second in enumerate(self._seconds):
+            if bucket_second > oldest:
+                calls += self._calls[i]
+                failures += self._failures[i]
+        return calls, failures
+
+    def _open(self) -> None:
+        self._opened_at = time.monotonic()
+        self._transition(BreakerState.OPEN)
+
+    def _transition(self, state: BreakerState) -> None:
+        self.state = state
+        self._probes_in_flight = self._probe_successes = 0
+        if state is BreakerState.HALF_OPEN:
+            self._half_opened += 1
+        elif state is BreakerState.CLOSED:
+            self._calls = [0] * len(self._calls)
+            self._failures = [0] * len(self._failures)
+        metrics.http_breaker_state.labels(self.host).set(state)
+        metrics.http_breaker_transitions.labels(self.host, state.name.lower()).inc()
@@ -0,0 +1,197 @@
+import typing as t
+
+import collections
+import dataclasses
+import email.utils
+import time
+from http import HTTPStatus
+
+from aiohttp import hdrs
+from multidict import CIMultiDict, CIMultiDictProxy
+
+from src.app.metrics import metrics
+from src.app.modules.http_coalesce import SharedResponse
+from src.config import settings
+
+# Headers of a 304 response that update the stored response, RFC 9111 section 4.3.4.
+REVALIDATED_HEADERS = (hdrs.CACHE_CONTROL, hdrs.EXPIRES, hdrs.DATE, hdrs.AGE, hdrs.ETAG, hdrs.LAST_MODIFIED)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class CacheEntry:
+    """Stored response and its freshness, monotonic clock.
+
+    Attributes:
+        host (str): Host and port of the response, the metrics label.
+        response (SharedResponse): Response served from the cache.
+        expires_at (float): Fresh until then.
+        stale_until (float): Served while revalidated in the background until
+            then, ``expires_at`` when stale-while-revalidate is not allowed.
+        size (int): Approximate bytes held, body and headers.
+
+    """
+
+    host: str
+    response: SharedResponse
+    expires_at: float
+    stale_until: float
+    size: int
+
+    def validators(self) -> dict[str, str]:
+        """Get conditional request headers revalidating the response."""
+        headers: dict[str, str] = {}
+        if (etag := self.response.headers.get(hdrs.ETAG)) is not None:
+            headers[hdrs.IF_NONE_MATCH] = etag
+        if (last_modified := self.response.headers.get(hdrs.LAST_MODIFIED)) is not None:
+            headers[hdrs.IF_MODIFIED_SINCE] = last_modified
+        return headers
+
+
+class ResponseCache(t.Protocol):
+    """Storage of the ``AiohttpClient`` response cache, keyed by request."""
+
+    def get(self, key: t.Hashable) -> t.Optional[CacheEntry]:
+        """Get entry of ``key``, fresh or not."""
+
+    def set(self, key: t.Hashable, entry: CacheEntry) -> None:
+        """Store entry of ``key``, replacing the previous one."""
+
+    def clear(self) -> None:
+        """Drop all entries."""
+
+
+class LRUResponseCache:
+    """In-memory response cache bounded by entry count and total bytes.
+
+    The least recently used entries are evicted first, an entry larger than
+    ``max_bytes`` is not stored.
+    """
+
+    def __init__(self, max_entries: t.Optional[int] = None, max_bytes: t.Optional[int] = None) -> None:
+        """Initialize LRUResponseCache class object instance, defaults from settings."""
+        self.max_entries = max_entries if max_entries is not None else settings.HTTP_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes if max_bytes is not None else settings.HTTP_CACHE_MAX_BYTES
+        self.size = 0
+        self._entries: collections.OrderedDict[t.Hashable, CacheEntry] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        """Get number of entries."""
+        return len(self._entries)
+
+    def get(self, key: t.Hashable) -> t.Optional[CacheEntry]:
+        """Get entry of ``key``, fresh or not."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: t.Hashable, entry: CacheEntry) -> None:
+        """Store entry of ``key``, replacing the previous one."""
+        self._discard(key)
+        if entry.size > self.max_bytes:
+            return
+        self._entries[key] = entry
+        self.size += entry.size
+        while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= evicted.size
+            metrics.http_cache_evictions.labels(evicted.host).inc()
+        metrics.http_cache_bytes.set(self.size)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self.size = 0
+        metrics.http_cache_bytes.set(self.size)
+
+    def _discard(self, key: t.Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry.size
+
+
+def cache_entry(host: str, response: SharedResponse, now: float) -> t.Optional[CacheEntry]:
+    """Get entry storing ``response``, None when it is not cacheable.
+
+    Freshness comes from ``Cache-Control: max-age`` less ``Age``, then from
+    ``Expires``, then from ``settings.HTTP_CACHE_HOST_TTL`` of the host.
+    Without any of them, or with ``no-cache``, the response is stored only
+    when it has validators and is revalidated on every use. ``no-store``
+    responses and statuses other than 200 are not stored.
+    """
+    if response.status != HTTPStatus.OK:
+        return None
+    directives = _cache_control(response.headers)
+    if "no-store" in directives:
+        return None
+
+    ttl, stale = _lifetimes(host, response.headers, directives)
+    has_validators = hdrs.ETAG in response.headers or hdrs.LAST_MODIFIED in response.headers
+    if ttl <= 0 and not has_validators:
+        return None
+    size = len(response.body) + len(response.url) + sum(len(k) + len(v) for k, v in response.headers.items())
+    return CacheEntry(host, response, now + ttl, now + ttl + stale, size)
+
+
+def revalidated_entry(entry: CacheEntry, not_modified: CIMultiDictProxy[str], now: float) -> t.Optional[CacheEntry]:
+    """Get entry refreshed by a 304 response to its conditional request."""
+    headers = CIMultiDict(entry.response.headers)
+    for name in REVALIDATED_HEADERS:
+        if name in not_modified:
+            headers.popall(name, None)
+            headers.extend((name, value) for value in not_modified.getall(name))
+    response = dataclasses.replace(entry.response, headers=CIMultiDictProxy(headers))
+    return cache_entry(entry.host, response, now)
+
+
+def _cache_control(headers: CIMultiDictProxy[str]) -> dict[str, t.Optional[str]]:
+    directives: dict[str, t.Optional[str]] = {}
+    for header in headers.getall(hdrs.CACHE_CONTROL, ()):
+        for directive in header.split(","):
+            name, _, value = directive.strip().partition("=")
+            if name:
+                directives[name.lower()] = value.strip('"') if value else None
+    return directives
+
+
+def _lifetimes(
+    host: str,
+    headers: CIMultiDictProxy[str],
+    directives: dict[str, t.Optional[str]],
+) -> tuple[float, float]:
+    """Get seconds a response is fresh for, and served stale for after that."""
+    ttl = _ttl(headers, directives)
+    if ttl is None:
+        ttl = settings.HTTP_CACHE_HOST_TTL.get(host, 0.0)
+    if "no-cache" in directives:
+        ttl = 0.0
+    stale = _seconds(directives.get("stale-while-revalidate"))
+    if stale is None:
+        stale = settings.HTTP_CACHE_STALE_WHILE_REVALIDATE
+    return ttl, stale
+
+
+def _ttl(headers: CIMultiDictProxy[str], directives: dict[str, t.Optional[str]]) -> t.Optional[float]:
+    max_age = _seconds(directives.get("max-age"))
+    if max_age is not None:
+        return max_age - (_seconds(headers.get(hdrs.AGE)) or 0.0)
+    expires = _http_date(headers.get(hdrs.EXPIRES))
+    if expires is None:
+        # Invalid Expires, e.g. "0", means already expired.
+        return 0.0 if hdrs.EXPIRES in headers else None
+    return expires - (_http_date(headers.get(hdrs.DATE)) or time.time())
+
+
+def _seconds(value: t.Optional[str]) -> t.Optional[float]:
+    if value is None or not value.strip().isdigit():
+        return None
+    return float(value)
+
+
+def _http_date(value: t.Optional[str]) -> t.Optional[float]:
+    if not value:
+        return None
+    try:
+        return email.utils.parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
@@ -1,15 +1,40 @@
 import typing as t
 
 import asyncio
+import functools
 import logging
+import time
+from http import HTTPStatus
 from socket import AF_INET
+from urllib.parse import urlparse
 
 import aiohttp
-import backoff
+from aiohttp import hdrs
 from aiohttp.helpers import BasicAuth
 from aiohttp.typedefs import LooseHeaders, StrOrURL
+from multidict import CIMultiDict
+from yarl import URL
 
 from src.app.metrics import metrics
+from src.app.modules.http_breaker import CircuitBreaker
+from src.app.modules.http_cache import (
+    CacheEntry,
+    LRUResponseCache,
+    ResponseCache,
+    cache_entry,
+    revalidated_entry,
+)
+from src.app.modules.http_coalesce import SharedResponse, SingleFlight
+from src.app.modules.http_limiter import AdaptiveLimiter
+from src.app.modules.http_retry import (
+    NOT_PROCESSED_STATUSES,
+    RETRY_STATUSES,
+    RetryBudget,
+    backoff_delay,
+    is_idempotent,
+    parse_retry_after,
+    skip_reason,
+)
 from src.config import settings
 
 SIZE_POOL_AIOHTTP = 100
@@ -22,10 +47,23 @@ class AiohttpClient:
     scope.
     Used aiohttp instead httpx module based on benchmark:
     https://gist.github.com/imbolc/15cab07811c32e7d50cc12f380f7f62f
+
+    Concurrent calls are limited per host by an ``AdaptiveLimiter``, so a
+    slow upstream does not hold back calls to the others, and fail fast with
+    ``CircuitOpenError`` while the ``CircuitBreaker`` of a failing host is
+    open. Retries are capped per host by a ``RetryBudget``. ``get_shared``
+    coalesces identical concurrent GETs into one upstream request and serves
+    them from ``response_cache``, any ``ResponseCache`` implementation, an
+    ``LRUResponseCache`` by default.
     """
 
     _client_flg: bool = False
-    sem: asyncio.Semaphore = asyncio.Semaphore(10)
+    limiters: dict[str, AdaptiveLimiter] = {}
+    breakers: dict[str, CircuitBreaker] = {}
+    retry_budgets: dict[str, RetryBudget] = {}
+    flights: SingleFlight[SharedResponse] = SingleFlight()
+    response_cache: t.Optional[ResponseCache] = None
+    refreshes: set["asyncio.Future[SharedResponse]"] = set()
     aiohttp_client: aiohttp.ClientSession
     log: logging.Logger = logging.getLogger(__name__)
 
@@ -48,6 +86,8 @@ class AiohttpClient:
                 timeout=timeout,
                 connector=connector,
             )
+            if cls.response_cache is None and settings.HTTP_CACHE_MAX_ENTRIES > 0:
+                cls.response_cache = LRUResponseCache()
             cls._client_flg = True
 
         return cls.aiohttp_client
@@ -58,15 +98,42 @@ class AiohttpClient:
         if cls._client_flg:
             cls.log.debug("Close AiohttpClient session.")
             await cls.aiohttp_client.close()
+            cls.limiters = {}
+            cls.breakers = {}
+            cls.retry_budgets = {}
+            cls.flights = SingleFlight()
+            for task in cls.refreshes:
+                task.cancel()
+            cls.refreshes = set()
+            if cls.response_cache is not None:
+                cls.response_cache.clear()
             cls._client_flg = False
 
     @classmethod
-    @backoff.on_exception(
-        backoff.expo,
-        aiohttp.ClientError,
-        max_tries=settings.MAX_TRIES,
-    )
-    @metrics.observe_request
+    def get_limiter(cls, host: str) -> AdaptiveLimiter:
+        """Get concurrency limiter of ``host``, created on its first call."""
+        limiter = cls.limiters.get(host)
+        if limiter is None:
+            limiter = cls.limiters[host] = AdaptiveLimiter(host)
+        return limiter
+
+    @classmethod
+    def get_breaker(cls, host: str) -> CircuitBreaker:
+        """Get circuit breaker of ``host``, created on its first call."""
+        breaker = cls.breakers.get(host)
+        if breaker is None:
+            breaker = cls.breakers[host] = CircuitBreaker(host)
+        return breaker
+
+    @classmethod
+    def get_retry_budget(cls, host: str) -> RetryBudget:
+        """Get retry budget of ``host``, created on its first call."""
+        budget = cls.retry_budgets.get(host)
+        if budget is None:
+            budget = cls.retry_budgets[host] = RetryBudget(host)
+        return budget
+
+    @classmethod
     async def _request(
         cls,
         method: str,
@@ -76,8 +143,16 @@ class AiohttpClient:
         data: t.Any = None,
         json: t.Any = None,
         auth: t.Optional[BasicAuth] = None,
+        timeout: t.Optional[float] = None,
     ) -> aiohttp.ClientResponse:
-        """Support func for making request.
+        """Support func for making request, retried up to ``MAX_TRIES`` times.
+
+        Connection errors, timeouts, 429, 500, 502, 503 and 504 responses are
+        retried after a full jitter backoff, or the ``Retry-After`` of the
+        response, when the method is idempotent, the host budget has a token
+        and the retry can start before ``timeout``. Requests that may have
+        been processed are not retried unless idempotent, see
+        ``is_idempotent``. ``CircuitOpenError`` is never retried.
 
         :param method: _description_
         :type method: str
@@ -93,11 +168,116 @@ class AiohttpClient:
         :type json: t.Any, optional
         :param auth: _description_, defaults to None
         :type auth: t.Optional[BasicAuth], optional
+        :param timeout: seconds for the call retries included, defaults to
+            settings.HTTP_TIMEOUT
+        :type timeout: t.Optional[float], optional
         :return: _description_
         :rtype: aiohttp.ClientResponse
+        :raises aiohttp.ClientResponseError: on a 5xx response not retried,
+            e.g. 501, or of the last try
+        """
+        host = urlparse(str(url)).netloc
+        budget = cls.get_retry_budget(host)
+        idempotent = is_idempotent(method, headers)
+        deadline = time.monotonic() + (timeout if timeout is not None else settings.HTTP_TIMEOUT)
+
+        attempt = 1
+        while True:
+            try:
+                resp = await cls._send(method, url, deadline, params, headers, data, json, auth)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+                # A connection never established did not send the request.
+                retryable = idempotent or isinstance(exc, aiohttp.ClientConnectorError)
+                delay = backoff_delay(attempt)
+                if not cls._retrying(host, "error", skip_reason(budget, attempt, retryable, delay, deadline)):
+                    raise
+            else:
+                response_delay = cls._response_delay(resp, budget, attempt, idempotent, deadline)
+                if response_delay is None:
+                    return resp
+                delay = response_delay
+                resp.release()
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    @classmethod
+    def _response_delay(
+        cls,
+        resp: aiohttp.ClientResponse,
+        budget: RetryBudget,
+        attempt: int,
+        idempotent: bool,
+        deadline: float,
+    ) -> t.Optional[float]:
+        """Get delay before retrying the response of try ``attempt``, None to return it.
+
+        Raises ``aiohttp.ClientResponseError`` on a 5xx response not retried.
+        Responses of a status never retried earn ``budget`` a token, 5xx ones
+        excepted.
         """
-        async with cls.sem:
-            resp = await cls.get_aiohttp_client().request(
+        if resp.status not in RETRY_STATUSES:
+            cls._raise_for_server_error(resp)
+            budget.deposit()
+            return None
+        retryable = idempotent or resp.status in NOT_PROCESSED_STATUSES
+        retry_after = parse_retry_after(resp.headers.get(hdrs.RETRY_AFTER))
+        delay = retry_after if retry_after is not None else backoff_delay(attempt)
+        if not cls._retrying(budget.host, str(resp.status), skip_reason(budget, attempt, retryable, delay, deadline)):
+            cls._raise_for_server_error(resp)
+            return None
+        return delay
+
+    @staticmethod
+    def _retrying(host: str, reason: str, skipped: t.Optional[str]) -> bool:
+        """Count a retry for ``reason``, or a retry skipped when ``skipped`` tells why."""
+        if skipped is not None:
+            metrics.http_retries_skipped.labels(host, skipped).inc()
+            return False
+        metrics.http_retries.labels(host, reason).inc()
+        return True
+
+    @staticmethod
+    def _raise_for_server_error(resp: aiohttp.ClientResponse) -> None:
+        """Raise ``aiohttp.ClientResponseError`` on a 5xx response, the caller handles the others."""
+        if resp.status >= HTTPStatus.INTERNAL_SERVER_ERROR:
+            resp.raise_for_status()
+
+    @classmethod
+    @metrics.observe_request
+    async def _send(
+        cls,
+        method: str,
+        url: StrOrURL,
+        deadline: float,
+        params: t.Optional[t.Mapping[str, str]],
+        headers: t.Optional[LooseHeaders],
+        data: t.Any,
+        json: t.Any,
+        auth: t.Optional[BasicAuth],
+    ) -> aiohttp.ClientResponse:
+        """Make one try of a request through the breaker and limiter of the host, by ``deadline``.
+
+        The limiter slot is released once the response headers are in, the
+        caller reads the body after that: the limit bounds the requests the
+        host is working on, and the latency adjusting it is the time to the
+        headers, not including the body transfer.
+        """
+        host = urlparse(str(url)).netloc
+        breaker = cls.get_breaker(host)
+        limiter = cls.get_limiter(host)
+        # Raises CircuitOpenError, which is not retried.
+        probe = breaker.before_call()
+        try:
+            await asyncio.wait_for(limiter.acquire(), deadline - time.monotonic())
+        except BaseException:
+            breaker.after_call(probe, failed=None)
+            raise
+
+        client = cls.get_aiohttp_client()
+        ts_start = time.monotonic()
+        try:
+            resp = await client.request(
                 method=method,
                 url=url,
                 params=params,
@@ -105,10 +285,30 @@ class AiohttpClient:
                 json=json,
                 headers=headers,
                 auth=auth,
+                timeout=cls._try_timeout(client, deadline - ts_start),
             )
-            if resp.status >= 500:
-                resp.raise_for_status()
-            return resp
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            limiter.release(time.monotonic() - ts_start, overloaded=True)
+            breaker.after_call(probe, failed=True)
+            raise
+        except BaseException:
+            limiter.release()
+            breaker.after_call(probe, failed=None)
+            raise
+
+        overloaded = resp.status >= 500 or resp.status == HTTPStatus.TOO_MANY_REQUESTS
+        limiter.release(time.monotonic() - ts_start, overloaded=overloaded)
+        breaker.after_call(probe, failed=resp.status >= 500)
+        return resp
+
+    @staticmethod
+    def _try_timeout(client: aiohttp.ClientSession, remaining: float) -> aiohttp.ClientTimeout:
+        """Get timeout of one try: the session timeout, cut to the ``remaining`` seconds of the call."""
+        # Zero would disable it.
+        total = max(remaining, 0.001)
+        if client.timeout.total:
+            total = min(total, client.timeout.total)
+        return aiohttp.ClientTimeout(total=total)
 
     @classmethod
     async def get(
@@ -117,6 +317,7 @@ class AiohttpClient:
         params: t.Optional[t.Mapping[str, str]] = None,
         headers: t.Optional[LooseHeaders] = None,
         auth: t.Optional[BasicAuth] = None,
+        timeout: t.Optional[float] = None,
     ) -> aiohttp.ClientResponse:
         """Execute HTTP GET request.
 
@@ -128,6 +329,9 @@ class AiohttpClient:
         :type headers: t.Optional[LooseHeaders], optional
         :param auth: _description_, defaults to None
         :type auth: t.Optional[BasicAuth], optional
+        :param timeout: seconds for the call retries included, defaults to
+            settings.HTTP_TIMEOUT
+        :type timeout: t.Optional[float], optional
         :return: _description_
         :rtype: aiohttp.ClientResponse
         """
@@ -137,8 +341,132 @@ class AiohttpClient:
             params=params,
             headers=headers,
             auth=auth,
+            timeout=timeout,
         )
 
+    @classmethod
+    async def get_shared(
+        cls,
+        url: StrOrURL,
+        params: t.Optional[t.Mapping[str, str]] = None,
+        headers: t.Optional[LooseHeaders] = None,
+        auth: t.Optional[BasicAuth] = None,
+        timeout: t.Optional[float] = None,
+    ) -> SharedResponse:
+        """Execute HTTP GET request, shared with identical GETs in flight.
+
+        Concurrent calls with the same URL, params, headers and auth make one
+        upstream request, its body is read once and every caller gets the
+        same ``SharedResponse``. The request runs with the ``timeout`` of the
+        call that started it and is cancelled when all its callers are.
+
+        Responses are cached when ``response_cache`` is set, see
+        ``cache_entry``. Stale responses are revalidated with
+        ``If-None-Match`` and ``If-Modified-Since``, in the background while
+        within their stale-while-revalidate time.
+
+        :param url: _description_
+        :type url: StrOrURL
+        :param params: _description_, defaults to None
+        :type params: t.Optional[t.Mapping[str, str]], optional
+        :param headers: _description_, defaults to None
+        :type headers: t.Optional[LooseHeaders], optional
+        :param auth: _description_, defaults to None
+        :type auth: t.Optional[BasicAuth], optional
+        :param timeout: seconds for the call retries included, defaults to
+            settings.HTTP_TIMEOUT
+        :type timeout: t.Optional[float], optional
+        :return: _description_
+        :rtype: SharedResponse
+        """
+        request_url = URL(str(url)).update_query(params) if params else URL(str(url))
+        request_headers = tuple(sorted((name.lower(), value) for name, value in CIMultiDict(headers or {}).items()))
+        key = (str(request_url), request_headers, auth)
+        host = urlparse(str(request_url)).netloc
+        fetch = functools.partial(cls._fetch, key, host, request_url, headers, auth, timeout)
+
+        cache = cls.response_cache
+        if cache is not None:
+            entry = cache.get(key)
+            now = time.monotonic()
+            if entry is not None and now < entry.expires_at:
+                metrics.http_cache.labels(host, "hit").inc()
+                return entry.response
+            if entry is not None and now < entry.stale_until:
+                metrics.http_cache.labels(host, "stale").inc()
+                cls._refresh(key, fetch)
+                return entry.response
+            metrics.http_cache.labels(host, "miss").inc()
+
+        result = "shared" if key in cls.flights else "leader"
+        metrics.http_coalesced.labels(host, result).inc()
+        return await cls.flights.do(key, fetch)
+
+    @classmethod
+    async def _fetch(
+        cls,
+        key: t.Hashable,
+        host: str,
+        url: URL,
+        headers: t.Optional[LooseHeaders],
+        auth: t.Optional[BasicAuth],
+        timeout: t.Optional[float],
+    ) -> SharedResponse:
+        """GET and read a response, conditional when the cache holds one, storing it."""
+        cache = cls.response_cache
+        entry = cache.get(key) if cache is not None else None
+        if entry is not None:
+            headers = CIMultiDict(headers or {})
+            headers.update(entry.validators())
+
+        resp = await cls._request(method="GET", url=url, headers=headers, auth=auth, timeout=timeout)
+        try:
+            body = await resp.read()
+        finally:
+            resp.release()
+        response = SharedResponse(url=str(resp.url), status=resp.status, headers=resp.headers, body=body)
+        if cache is None:
+            return response
+        return cls._store(cache, key, host, entry, response)
+
+    @staticmethod
+    def _store(
+        cache: ResponseCache,
+        key: t.Hashable,
+        host: str,
+        entry: t.Optional[CacheEntry],
+        response: SharedResponse,
+    ) -> SharedResponse:
+        """Store a response, a 304 one refreshing ``entry`` it revalidated, get the response to serve."""
+        now = time.monotonic()
+        if entry is not None:
+            if response.status == HTTPStatus.NOT_MODIFIED:
+                metrics.http_cache_revalidations.labels(host, "not_modified").inc()
+                entry = revalidated_entry(entry, response.headers, now) or entry
+                cache.set(key, entry)
+                return entry.response
+            metrics.http_cache_revalidations.labels(host, "modified").inc()
+
+        new_entry = cache_entry(host, response, now)
+        if new_entry is not None:
+            cache.set(key, new_entry)
+        return response
+
+    @classmethod
+    def _refresh(cls, key: t.Hashable, fetch: t.Callable[[], t.Awaitable[SharedResponse]]) -> None:
+        """Revalidate a stale response in the background, once at a time."""
+        if key in cls.flights:
+            return
+        task = asyncio.ensure_future(cls.flights.do(key, fetch))
+        cls.refreshes.add(task)
+        task.add_done_callback(cls._refreshed)
+
+    @classmethod
+    def _refreshed(cls, task: "asyncio.Future[SharedResponse]") -> None:
+        cls.refreshes.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            cls.log.warning("Background revalidation failed: %r", task.exception())
+
     @classmethod
     async def post(
         cls,
@@ -148,6 +476,7 @@ class AiohttpClient:
         data: t.Any = None,
         json: t.Any = None,
         auth: t.Optional[BasicAuth] = None,
+        timeout: t.Optional[float] = None,
     ) -> aiohttp.ClientResponse:
         """Execute HTTP POST request.
 
@@ -163,6 +492,9 @@ class AiohttpClient:
         :type json: t.Any, optional
         :param auth: _description_, defaults to None
         :type auth: t.Optional[BasicAuth], optional
+        :param timeout: seconds for the call retries included, defaults to
+            settings.HTTP_TIMEOUT
+        :type timeout: t.Optional[float], optional
         :return: _description_
         :rtype: aiohttp.ClientResponse
         """
@@ -174,4 +506,5 @@ class AiohttpClient:
             params=params,
             headers=headers,
             auth=auth,
+            timeout=timeout,
         )
@@ -0,0 +1,83 @@
+import typing as t
+
+import asyncio
+import dataclasses
+import functools
+import json
+
+from multidict import CIMultiDictProxy
+
+T = t.TypeVar("T")
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SharedResponse:
+    """Response read to the end, safe to hand to any number of callers.
+
+    Attributes:
+        url (str): Final URL of the response.
+        status (int): HTTP status code.
+        headers (CIMultiDictProxy[str]): Read only response headers.
+        body (bytes): Response body.
+
+    """
+
+    url: str
+    status: int
+    headers: CIMultiDictProxy[str]
+    body: bytes
+
+    def text(self, encoding: str = "utf-8") -> str:
+        """Decode the body."""
+        return self.body.decode(encoding)
+
+    def json(self) -> t.Any:
+        """Decode the body as JSON."""
+        return json.loads(self.body)
+
+
+class _Call(t.Generic[T]):
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task[T]) -> None:
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight(t.Generic[T]):
+    """Run one call at a time per key, concurrent callers of a key share its result.
+
+    The call runs in its own task: a caller cancelled while others still wait
+    leaves it running for them, the last one cancelled cancels it. Errors are
+    raised to every caller. Keys are forgotten once the call is done, results
+    are not cached.
+    """
+
+    def __init__(self) -> None:
+        """Initialize SingleFlight class object instance."""
+        self._calls: dict[t.Hashable, _Call[T]] = {}
+
+    def __contains__(self, key: t.Hashable) -> bool:
+        """Whether a call of ``key`` is in flight."""
+        return key in self._calls
+
+    async def do(self, key: t.Hashable, func: t.Callable[[], t.Awaitable[T]]) -> T:
+        """Get result of ``func``, called unless a call of ``key`` is in flight."""
+        call = self._calls.get(key)
+        if call is None:
+            call = self._calls[key] = _Call(asyncio.ensure_future(func()))
+            call.task.add_done_callback(functools.partial(self._forget, key, call))
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                # Everyone left, callers coming next start over.
+                self._forget(key, call)
+                call.task.cancel()
+
+    def _forget(self, key: t.Hashable, call: _Call[T], task: t.Optional[asyncio.Future[T]] = None) -> None:
+        if self._calls.get(key) is call:
+            del self._calls[key]
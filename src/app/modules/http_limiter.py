@@ -0,0 +1,137 @@
+import typing as t
+
+import asyncio
+import collections
+import contextlib
+import time
+
+from src.app.metrics import metrics
+from src.config import settings
+
+
+class AdaptiveLimiter:
+    """Concurrency limit of the calls to one host, adjusted from their outcome.
+
+    Additive increase, multiplicative decrease: while the limit is in use,
+    every successful call raises it by ``1 / limit``, about one per round
+    trip of calls. Errors, 429 and 5xx responses, and calls slower than
+    ``latency_tolerance`` times the baseline latency cut it by ``backoff``,
+    at most once per baseline latency so a burst of failures of the same
+    round trip counts once. The baseline is the lowest latency of the current
+    or the previous ``BASELINE_WINDOW``, so it follows the host without
+    creeping up with the queueing it has to detect.
+
+    Waiters are served first come first served. No asyncio primitive is
+    created before the first call has to wait, so limiters can be created
+    outside of the running loop.
+
+    Attributes:
+        host (str): Host and port the limiter guards, the metrics label.
+        limit (float): Current limit, its integer part is enforced.
+        in_flight (int): Calls holding a slot.
+
+    """
+
+    # Seconds the lowest latency is kept as the baseline for.
+    BASELINE_WINDOW = 30.0
+
+    def __init__(
+        self,
+        host: str,
+        initial: t.Optional[int] = None,
+        minimum: t.Optional[int] = None,
+        maximum: t.Optional[int] = None,
+        backoff: t.Optional[float] = None,
+        latency_tolerance: t.Optional[float] = None,
+    ) -> None:
+        """Initialize AdaptiveLimiter class object instance, defaults from settings."""
+        self.host = host
+        self.minimum = minimum if minimum is not None else settings.HTTP_LIMIT_MIN
+        self.maximum = maximum if maximum is not None else settings.HTTP_LIMIT_MAX
+        self.backoff = backoff if backoff is not None else settings.HTTP_LIMIT_BACKOFF
+        self.latency_tolerance = (
+            latency_tolerance if latency_tolerance is not None else settings.HTTP_LIMIT_LATENCY_TOLERANCE
+        )
+        initial = initial if initial is not None else settings.HTTP_LIMIT_INITIAL
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.in_flight = 0
+        self._window_min: t.Optional[float] = None
+        self._previous_window_min: t.Optional[float] = None
+        self._window_ends = 0.0
+        self._decreased_at = 0.0
+        self._waiters: collections.deque[asyncio.Future[None]] = collections.deque()
+        metrics.http_limit.labels(host).set(self.limit)
+
+    async def acquire(self) -> None:
+        """Wait for a slot."""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self._take()
+            return
+
+        ts_start = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # Woken up and cancelled at once, hand the slot over.
+                self.release()
+            else:
+                with contextlib.suppress(ValueError):
+                    self._waiters.remove(waiter)
+            raise
+        finally:
+            metrics.http_limit_queue_wait.labels(self.host).observe(time.monotonic() - ts_start)
+
+    def release(self, latency: t.Optional[float] = None, overloaded: bool = False) -> None:
+        """Give the slot back, adjusting the limit from the latency and outcome of the call.
+
+        Pass no latency for calls that tell nothing about the host, e.g.
+        cancelled ones.
+        """
+        if latency is not None:
+            self._observe(latency, overloaded)
+        self.in_flight -= 1
+        metrics.http_limit_in_flight.labels(self.host).set(self.in_flight)
+        self._wake()
+
+    @property
+    def baseline(self) -> t.Optional[float]:
+        """Lowest latency of the current and the previous window."""
+        if self._previous_window_min is None or self._window_min is None:
+            return self._window_min if self._window_min is not None else self._previous_window_min
+        return min(self._window_min, self._previous_window_min)
+
+    def _observe(self, latency: float, overloaded: bool) -> None:
+        now = time.monotonic()
+        if now >= self._window_ends:
+            self._previous_window_min, self._window_min = self._window_min, None
+            self._window_ends = now + self.BASELINE_WINDOW
+        if self._window_min is None or latency < self._window_min:
+            self._window_min = latency
+        baseline = t.cast(float, self.baseline)
+
+        if overloaded or latency > baseline * self.latency_tolerance:
+            if now - self._decreased_at >= baseline:
+                self._decreased_at = now
+                self._set_limit(self.limit * self.backoff)
+        elif self.in_flight >= int(self.limit):
+            # Only a limit in use is evidence the host takes more.
+            self._set_limit(self.limit + 1 / self.limit)
+
+    def _take(self) -> None:
+        self.in_flight += 1
+        metrics.http_limit_in_flight.labels(self.host).set(self.in_flight)
+
+    def _wake(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self._take()
+                waiter.set_result(None)
+
+    def _set_limit(self, limit: float) -> None:
+        self.limit = min(max(limit, float(self.minimum)), float(self.maximum))
+        metrics.http_limit.labels(self.host).set(self.limit)
+        self._wake()
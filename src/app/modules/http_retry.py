@@ -0,0 +1,127 @@
+import typing as t
+
+import email.utils
+import random
+import time
+from http import HTTPStatus
+
+from multidict import CIMultiDict
+
+from src.config import settings
+
+# Safe to send twice, RFC 9110 section 9.2.2.
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "TRACE", "PUT", "DELETE"})
+# Responses worth another try, the request may succeed on a retry.
+RETRY_STATUSES = frozenset(
+    {
+        HTTPStatus.TOO_MANY_REQUESTS,
+        HTTPStatus.INTERNAL_SERVER_ERROR,
+        HTTPStatus.BAD_GATEWAY,
+        HTTPStatus.SERVICE_UNAVAILABLE,
+        HTTPStatus.GATEWAY_TIMEOUT,
+    },
+)
+# Responses telling the request was not processed, safe to retry whatever the method.
+NOT_PROCESSED_STATUSES = frozenset({HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE})
+
+
+class RetryBudget:
+    """Token bucket capping the retries to one host.
+
+    Every successful call deposits ``ratio`` tokens and every retry takes
+    one, so retries stay within ``ratio`` of the successful traffic however
+    many tries a call has. ``min_per_second`` tokens are added every second
+    so a host with little traffic can still be retried, and the bucket holds
+    at most ``burst`` tokens. A failing host earns no tokens: once the bucket
+    is empty its calls fail after the first try instead of multiplying its
+    load.
+
+    Attributes:
+        host (str): Host and port the budget is for, the metrics label.
+        tokens (float): Retries available right now.
+
+    """
+
+    def __init__(
+        self,
+        host: str,
+        ratio: t.Optional[float] = None,
+        min_per_second: t.Optional[float] = None,
+        burst: t.Optional[int] = None,
+    ) -> None:
+        """Initialize RetryBudget class object instance, defaults from settings."""
+        self.host = host
+        self.ratio = ratio if ratio is not None else settings.HTTP_RETRY_BUDGET_RATIO
+        self.min_per_second = (
+            min_per_second if min_per_second is not None else settings.HTTP_RETRY_BUDGET_MIN_PER_SECOND
+        )
+        self.burst = float(burst if burst is not None else settings.HTTP_RETRY_BUDGET_BURST)
+        self.tokens = self.burst
+        self._refilled_at = time.monotonic()
+
+    def deposit(self) -> None:
+        """Earn retries from a successful call."""
+        self.tokens = min(self.tokens + self.ratio, self.burst)
+
+    def withdraw(self) -> bool:
+        """Take a token for a retry, False when the budget is spent."""
+        now = time.monotonic()
+        self.tokens = min(self.tokens + (now - self._refilled_at) * self.min_per_second, self.burst)
+        self._refilled_at = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+def is_idempotent(method: str, headers: t.Optional[t.Any] = None) -> bool:
+    """Whether a request can be sent again after it may have reached the host.
+
+    Requests with an ``Idempotency-Key`` header are, the host deduplicates them.
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    return headers is not None and "Idempotency-Key" in CIMultiDict(headers)
+
+
+def backoff_delay(attempt: int, base: t.Optional[float] = None, cap: t.Optional[float] = None) -> float:
+    """Get full jitter delay before retry ``attempt``, counted from 1.
+
+    Uniform between zero and the exponential backoff, so the retries of calls
+    failed together do not come back together.
+    """
+    base = base if base is not None else settings.HTTP_RETRY_BACKOFF_BASE
+    cap = cap if cap is not None else settings.HTTP_RETRY_BACKOFF_CAP
+    return random.uniform(0, min(cap, base * 2 ** (attempt - 1)))  # noqa: S311
+
+
+def skip_reason(budget: RetryBudget, attempt: int, retryable: bool, delay: float, deadline: float) -> t.Optional[str]:
+    """Get why a failed try ``attempt`` is not retried after ``delay``, None when it is.
+
+    Reasons are ``method``, the request may have been processed and is not
+    idempotent, ``tries``, ``deadline`` and ``budget``. The budget is checked
+    last, a retry skipped for another reason takes no token.
+    """
+    if not retryable:
+        return "method"
+    if attempt >= settings.MAX_TRIES:
+        return "tries"
+    if time.monotonic() + delay >= deadline:
+        return "deadline"
+    if not budget.withdraw():
+        return "budget"
+    return None
+
+
+def parse_retry_after(value: t.Optional[str]) -> t.Optional[float]:
+    """Get seconds to wait from a ``Retry-After`` header, in seconds or an HTTP date."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(retry_at.timestamp() - time.time(), 0.0)
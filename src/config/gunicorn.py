@@ -4,8 +4,14 @@ Resources:
     1. https://docs.gunicorn.org/en/20.1.0/settings.html
 
 """
+import typing as t
+
 import os
 
+if t.TYPE_CHECKING:
+    from gunicorn.arbiter import Arbiter
+    from gunicorn.workers.base import Worker
+
 # Server socket
 #
 #   bind - The socket to bind.
@@ -194,6 +200,40 @@ proc_name = None
 #
 #       A callable that takes a server instance as the sole argument.
 #
+#   on_starting - Called just before the master process is initialized.
+#
+#       A callable that takes a server instance as the sole argument.
+#
+#   child_exit - Called just after a worker has been exited, in the
+#       master process.
+#
+#       A callable that takes a server and worker instance
+#       as arguments.
+#
+#   With PROMETHEUS_MULTIPROC_DIR set, workers share metrics through
+#   mmap'd files in that directory. It has to be set in the environment
+#   before the process starts, since prometheus_client reads it on import.
+#
+
+
+def on_starting(server: "Arbiter") -> None:
+    """Execute just before the master process is initialized."""
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        # Files left by a previous run would be aggregated as live workers.
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for name in os.listdir(multiproc_dir):
+            if name.endswith(".db"):
+                os.remove(os.path.join(multiproc_dir, name))
+        server.log.info("Prometheus multiprocess mode (dir: %s)", multiproc_dir)
+
+
+def child_exit(server: "Arbiter", worker: "Worker") -> None:
+    """Execute just after a worker has been exited, in the master process."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)  # type: ignore[no-untyped-call]
 
 
 def post_fork(server, worker):
@@ -0,0 +1,69 @@
+"""Benchmark ``IDMixin.bulk_save`` against ``save`` of a sequence.
+
+Writes ``ROWS`` new ``Service`` rows to the database of ``DB_URI`` per run
+and deletes them afterwards.
+
+Run: ``python -m tests.benchmarks.bulk_save``
+"""
+import typing as t
+
+import asyncio
+import time
+from uuid import uuid4
+
+import sqlalchemy as sa
+
+from src.app.entity import Service
+from src.app.modules import AsyncDBClient
+
+ROWS = 10_000
+RUNS = 3
+
+
+async def run(name: str, write: t.Callable[[t.Any, str], t.Awaitable[None]]) -> None:
+    """Time ``write`` over fresh rows, best of ``RUNS``."""
+    best = float("inf")
+    for _ in range(RUNS):
+        prefix = f"bench-{uuid4().hex[:8]}"
+        async with AsyncDBClient.AsyncSessionLocal() as session:
+            ts_start = time.perf_counter()
+            await write(session, prefix)
+            best = min(best, time.perf_counter() - ts_start)
+            await session.execute(sa.delete(Service).where(Service.name.startswith(prefix)))
+            await session.commit()
+    print(f"{name:<20} {best * 1e3:9.1f} ms {ROWS / best:10.0f} rows/s")  # noqa: T201
+
+
+async def save(session: t.Any, prefix: str) -> None:
+    """Write rows through the unit of work."""
+    # The body of the sequence overload of save: unit of work add_all, flush and commit.
+    instances = [Service(name=f"{prefix}-{i}", url="https://example.com") for i in range(ROWS)]
+    session.add_all(instances)
+    await session.flush(instances)
+    await session.commit()
+
+
+async def upsert(session: t.Any, prefix: str) -> None:
+    """Write rows with bulk_save upsert."""
+    rows = [{"id": uuid4(), "name": f"{prefix}-{i}", "url": "https://example.com"} for i in range(ROWS)]
+    await Service.bulk_save(session, rows)
+
+
+async def copy(session: t.Any, prefix: str) -> None:
+    """Write rows with bulk_save copy."""
+    rows = [{"id": uuid4(), "name": f"{prefix}-{i}", "url": "https://example.com"} for i in range(ROWS)]
+    await Service.bulk_save(session, rows, mode="copy")
+
+
+async def main() -> None:
+    """Run every write path."""
+    AsyncDBClient.get_async_db_engine()
+    try:
+        for name, write in (("save", save), ("bulk_save upsert", upsert), ("bulk_save copy", copy)):
+            await run(name, write)
+    finally:
+        await AsyncDBClient.close_db_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""Benchmark the in-memory ``GeoGrid`` of provider positions at 1M providers.
+
+Builds a grid of ``PROVIDERS`` points, nine in ten clustered around
+``CITIES`` random centers and the rest spread uniformly, and reports the
+build time, the memory the grid retains, the latency of ``within`` and
+``nearest`` around the cities and the time of an incremental ``update``.
+
+Run: ``python -m tests.benchmarks.geo_index``
+"""
+import typing as t
+
+import random
+import statistics
+import time
+import tracemalloc
+from uuid import UUID
+
+from src.app.modules.geo_index import GeoGrid
+from src.config import settings
+
+PROVIDERS = 1_000_000
+CITIES = 200
+QUERIES = 1_000
+CHANGES = 1_000
+
+
+def make_points(rng: random.Random, count: int) -> tuple[list[UUID], list[float], list[float]]:
+    """Get ids and positions of ``count`` providers."""
+    cities = [(rng.uniform(-60.0, 70.0), rng.uniform(-180.0, 180.0)) for _ in range(CITIES)]
+    ids = [UUID(int=rng.getrandbits(128), version=4) for _ in range(count)]
+    lats, lons = [], []
+    for i in range(count):
+        if i % 10 == 0:
+            lats.append(rng.uniform(-80.0, 80.0))
+            lons.append(rng.uniform(-180.0, 180.0))
+        else:
+            lat, lon = cities[i % CITIES]
+            lats.append(lat + rng.gauss(0.0, 0.3))
+            lons.append((lon + rng.gauss(0.0, 0.3) + 180.0) % 360.0 - 180.0)
+    return ids, lats, lons
+
+
+def report(name: str, timings: list[float]) -> None:
+    """Print p50 and p99 of ``timings``."""
+    timings.sort()
+    print(  # noqa: T201
+        f"{name:<22} p50 {statistics.median(timings) * 1e3:7.3f} ms"
+        f" p99 {timings[int(len(timings) * 0.99)] * 1e3:7.3f} ms",
+    )
+
+
+def timed(call: t.Callable[[float, float], t.Any], queries: list[tuple[float, float]]) -> list[float]:
+    """Get the duration of ``call`` for each query point."""
+    timings = []
+    for lat, lon in queries:
+        ts_start = time.perf_counter()
+        call(lat, lon)
+        timings.append(time.perf_counter() - ts_start)
+    return timings
+
+
+def main() -> None:
+    """Build the grid, measure memory, lookups and an update."""
+    rng = random.Random(1)
+    ids, lats, lons = make_points(rng, PROVIDERS)
+
+    ts_start = time.perf_counter()
+    grid = GeoGrid(ids, lats, lons, settings.GEO_INDEX_CELL_SIZE)
+    build = time.perf_counter() - ts_start
+    # Built again for the memory, tracing slows the build down.
+    tracemalloc.start()
+    traced = GeoGrid(ids, lats, lons, settings.GEO_INDEX_CELL_SIZE)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del traced
+    print(  # noqa: T201
+        f"build {build:.2f} s, retained {retained / 1e6:.1f} MB ({retained / PROVIDERS:.1f} B/provider),"
+        f" peak {peak / 1e6:.1f} MB",
+    )
+
+    queries = [(lat + rng.gauss(0.0, 0.2), lon + rng.gauss(0.0, 0.2)) for lat, lon in zip(lats, lons)][:QUERIES]
+    report("within 2 km", timed(lambda lat, lon: grid.within(lat, lon, 2_000), queries))
+    report("within 10 km, limit 20", timed(lambda lat, lon: grid.within(lat, lon, 10_000, limit=20), queries))
+    report("nearest 10", timed(lambda lat, lon: grid.nearest(lat, lon, 10), queries))
+
+    moved = [(ids[i], lats[i] + 0.01, lons[i]) for i in rng.sample(range(PROVIDERS), CHANGES)]
+    removed = [ids[i] for i in rng.sample(range(PROVIDERS), CHANGES)]
+    ts_start = time.perf_counter()
+    grid.update(removed, moved)
+    print(f"update of {CHANGES} moved and {CHANGES} removed {time.perf_counter() - ts_start:.3f} s")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Benchmark keyset ``TimestampMixin.paginate`` against ``OFFSET`` pages.
+
+Pages through the live services of the database of ``DB_URI`` ordered by
+``(created_at, id)``, use one holding many of them such as the one seeded
+by ``tests.benchmarks.search``. Deep pages are reached through the key of
+the row before them, as a client following next cursors would.
+
+Run: ``python -m tests.benchmarks.pagination``
+"""
+import typing as t
+
+import asyncio
+import statistics
+import time
+
+import sqlalchemy as sa
+
+from src.app.entity import Service
+from src.app.modules import AsyncDBClient
+
+LIMIT = 20
+RUNS = 20
+PAGES = (0, 100, 1_000, 10_000, 40_000)
+
+
+async def timed(session: t.Any, page: t.Callable[[], t.Awaitable[t.Any]]) -> float:
+    """Get the median duration of ``page`` over ``RUNS`` calls."""
+    timings = []
+    for _ in range(RUNS):
+        ts_start = time.perf_counter()
+        await page()
+        timings.append(time.perf_counter() - ts_start)
+        session.expunge_all()
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    """Time keyset and offset pages at growing depths."""
+    AsyncDBClient.get_async_db_engine()
+    try:
+        async with AsyncDBClient.AsyncSessionLocal() as session:
+            live = await session.scalar(sa.select(sa.func.count()).where(Service.deleted_at.is_(None)))
+            order = (Service.created_at, Service.id)
+            for page_no in (page_no for page_no in PAGES if page_no * LIMIT < live):
+                offset = page_no * LIMIT
+                key = None
+                if offset:
+                    stmt = sa.select(*order).where(Service.deleted_at.is_(None)).order_by(*order).offset(offset - 1)
+                    key = tuple((await session.execute(stmt.limit(1))).one())
+                keyset = await timed(session, lambda: Service.paginate(session, limit=LIMIT, after=key))
+                stmt = sa.select(Service).where(Service.deleted_at.is_(None)).order_by(*order)
+                offset_page = await timed(session, lambda: session.scalars(stmt.offset(offset).limit(LIMIT)))
+                print(  # noqa: T201
+                    f"page {page_no:>6}: keyset p50 {keyset * 1e3:7.2f} ms, offset p50 {offset_page * 1e3:8.2f} ms",
+                )
+    finally:
+        await AsyncDBClient.close_db_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
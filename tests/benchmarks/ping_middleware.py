@@ -0,0 +1,86 @@
+"""Benchmark request throughput of ``/api/ping`` through the metrics middleware.
+
+Compares no middleware, the ``BaseHTTPMiddleware`` the metrics middleware used
+to be, and the pure ASGI ``MetricsMiddleware``. Requests are sequential over
+the in-process ASGI transport of httpx, the ping route answers without the
+database so the middleware is what is measured.
+
+Run: ``python -m tests.benchmarks.ping_middleware``
+"""
+import typing as t
+
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+from starlette.responses import Response
+
+from src.app.dto import ReadyResponse
+from src.app.metrics import metrics
+from src.app.middleware.metrics import MetricsMiddleware
+
+REQUESTS = 5_000
+WARMUP = 200
+RUNS = 3
+
+
+class BaseMetricsMiddleware(BaseHTTPMiddleware):
+    """Metrics middleware before it was made pure ASGI."""
+
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        """Count prometheus metrics, turn unexpected errors into a 500."""
+        ts_start = time.monotonic()
+        method = request.scope["method"]
+        path = request.url.path
+        metrics.requests.labels(path, method).inc()
+        try:
+            response = await call_next(request)
+        except Exception as exc:
+            response = JSONResponse({"success": False, "errors": [{"message": str(exc)}]}, status_code=500)
+        metrics.timings.labels(path, method).observe(time.monotonic() - ts_start)
+        metrics.responses.labels(path, method, response.status_code).inc()
+        return response
+
+
+def make_app(middleware: t.Optional[type[t.Any]]) -> FastAPI:
+    """Get app serving a ping without the database, behind ``middleware``."""
+    app = FastAPI()
+
+    @app.get("/api/ping", response_model=ReadyResponse)
+    async def ping() -> ReadyResponse:
+        return ReadyResponse(status="ok: true; db: True")
+
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+async def run(name: str, middleware: t.Optional[type[t.Any]]) -> None:
+    """Time ``REQUESTS`` sequential pings, best of ``RUNS``."""
+    best = float("inf")
+    async with httpx.AsyncClient(app=make_app(middleware), base_url="http://benchmark") as client:
+        for _ in range(WARMUP):
+            await client.get("/api/ping")
+        for _ in range(RUNS):
+            ts_start = time.perf_counter()
+            for _ in range(REQUESTS):
+                await client.get("/api/ping")
+            best = min(best, time.perf_counter() - ts_start)
+    print(f"{name:<20} {REQUESTS / best:8.0f} req/s {best / REQUESTS * 1e6:8.1f} us/req")  # noqa: T201
+
+
+async def main() -> None:
+    """Run every middleware."""
+    for name, middleware in (
+        ("no middleware", None),
+        ("BaseHTTPMiddleware", BaseMetricsMiddleware),
+        ("MetricsMiddleware", MetricsMiddleware),
+    ):
+        await run(name, middleware)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,117 @@
+"""Benchmark ``Projection`` against ORM loading of service cards to JSON.
+
+Reads ``ROWS`` live services of the database of ``DB_URI``, use one whose
+services have categories, and serializes them with their categories: once
+through ORM instances validated from attributes and once through a
+projection aggregating the categories in SQL. A ``__slots__`` projection
+of the service columns alone is timed too. Reports rows per second, best
+of ``RUNS``, and the peak of memory allocated by a separately traced run,
+tracing slows the runs down.
+
+Run: ``python -m tests.benchmarks.projection``
+"""
+import typing as t
+
+import asyncio
+import gc
+import time
+import tracemalloc
+from uuid import UUID
+
+import sqlalchemy as sa
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from sqlalchemy.orm import selectinload
+
+from src.app.entity import Service
+from src.app.modules import AsyncDBClient
+
+ROWS = 50_000
+RUNS = 3
+
+
+class CategorySummary(BaseModel):
+    """Category of a service card."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    category_title: t.Optional[str]
+
+
+class ServiceCard(BaseModel):
+    """Service with its categories."""
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    name: str
+    url: t.Optional[str]
+    category: list[CategorySummary]
+
+
+class ServiceRow:
+    """Service columns, built positionally."""
+
+    __slots__ = ("id", "name", "url")
+
+    def __init__(self, id: UUID, name: str, url: t.Optional[str]) -> None:  # noqa: A002
+        """Initialize ServiceRow class object instance."""
+        self.id = id
+        self.name = name
+        self.url = url
+
+
+CARDS = TypeAdapter(list[ServiceCard])
+order = (Service.created_at, Service.id)
+
+
+async def orm(session: t.Any) -> bytes:
+    """Load instances with their categories and validate them from attributes."""
+    stmt = sa.select(Service).where(Service.deleted_at.is_(None)).options(selectinload(Service.category))
+    services = (await session.scalars(stmt.order_by(*order).limit(ROWS))).all()
+    return CARDS.dump_json(CARDS.validate_python(services, from_attributes=True))
+
+
+async def projection(session: t.Any) -> bytes:
+    """Select the card columns and the categories aggregated to JSON."""
+    cards = Service.projection(ServiceCard, category=Service.category_summaries())
+    return await cards.fetch_json(session, order_by=order, limit=ROWS)
+
+
+async def slots(session: t.Any) -> bytes:
+    """Select the service columns into a ``__slots__`` class."""
+    return await Service.projection(ServiceRow).fetch_json(session, order_by=order, limit=ROWS)
+
+
+async def run(name: str, read: t.Callable[[t.Any], t.Awaitable[bytes]]) -> None:
+    """Time ``read`` in a new session, best of ``RUNS``, and trace its memory once more."""
+    best = float("inf")
+    for _ in range(RUNS):
+        gc.collect()
+        async with AsyncDBClient.AsyncSessionLocal() as session:
+            ts_start = time.perf_counter()
+            body = await read(session)
+            best = min(best, time.perf_counter() - ts_start)
+    gc.collect()
+    tracemalloc.start()
+    async with AsyncDBClient.AsyncSessionLocal() as session:
+        await read(session)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(  # noqa: T201
+        f"{name:<18} {ROWS / best:9.0f} rows/s, peak {peak / 1e6:6.1f} MB, {len(body) / 1e6:5.1f} MB of JSON",
+    )
+
+
+async def main() -> None:
+    """Run every read path."""
+    AsyncDBClient.get_async_db_engine()
+    try:
+        for name, read in (("orm", orm), ("projection", projection), ("slots projection", slots)):
+            await run(name, read)
+    finally:
+        await AsyncDBClient.close_db_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
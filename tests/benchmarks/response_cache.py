@@ -0,0 +1,87 @@
+"""Benchmark ``AiohttpClient.get_shared`` with and without the response cache.
+
+Serves a reference list from a local upstream answering in ``UPSTREAM_DELAY``
+seconds, with an ``ETag`` and the ``Cache-Control`` of the scenario, and
+calls it from ``WORKERS`` concurrent loops for ``DURATION`` seconds.
+
+Run: ``python -m tests.benchmarks.response_cache``
+"""
+import asyncio
+import hashlib
+import statistics
+import time
+
+from aiohttp import hdrs, web
+
+from src.app.modules import AiohttpClient
+from src.app.modules.http_cache import LRUResponseCache
+
+PORT = 18087
+URL = f"http://127.0.0.1:{PORT}/reference"
+UPSTREAM_DELAY = 0.05
+WORKERS = 10
+DURATION = 3.0
+BODY = b'{"items": [' + b",".join(b'{"id": %d, "name": "category %d"}' % (i, i) for i in range(2_000)) + b"]}"
+ETAG = f'"{hashlib.sha256(BODY).hexdigest()}"'
+SCENARIOS: tuple[tuple[str, bool, str], ...] = (
+    ("no cache", False, ""),
+    ("max-age=1", True, "max-age=1"),
+    ("max-age=1, swr=5", True, "max-age=1, stale-while-revalidate=5"),
+    ("no-cache, etag", True, "no-cache"),
+)
+
+upstream_responses: dict[int, int] = {}
+
+
+async def reference(request: web.Request) -> web.Response:
+    """Answer the reference list, 304 to a matching ``If-None-Match``."""
+    await asyncio.sleep(UPSTREAM_DELAY)
+    headers = {hdrs.ETAG: ETAG, hdrs.CACHE_CONTROL: request.query.get("cache_control", "")}
+    status = 304 if request.headers.get(hdrs.IF_NONE_MATCH) == ETAG else 200
+    upstream_responses[status] = upstream_responses.get(status, 0) + 1
+    if status == 304:
+        return web.Response(status=status, headers=headers)
+    return web.Response(body=BODY, content_type="application/json", headers=headers)
+
+
+async def run(name: str, cached: bool, cache_control: str) -> None:
+    """Call the upstream from every worker, print latencies and upstream responses."""
+    AiohttpClient.response_cache = LRUResponseCache() if cached else None
+    upstream_responses.clear()
+    latencies: list[float] = []
+    ts_end = time.monotonic() + DURATION
+
+    async def worker() -> None:
+        while time.monotonic() < ts_end:
+            ts_start = time.perf_counter()
+            await AiohttpClient.get_shared(URL, params={"cache_control": cache_control})
+            latencies.append(time.perf_counter() - ts_start)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(worker() for _ in range(WORKERS)))
+    latencies.sort()
+    print(  # noqa: T201
+        f"{name:<18} {len(latencies):8d} calls"
+        f" upstream 200 {upstream_responses.get(200, 0):4d} 304 {upstream_responses.get(304, 0):4d}"
+        f" p50 {statistics.median(latencies) * 1e3:7.3f} ms p99 {latencies[int(len(latencies) * 0.99)] * 1e3:7.3f} ms",
+    )
+
+
+async def main() -> None:
+    """Run every scenario against a local upstream."""
+    app = web.Application()
+    app.router.add_get("/reference", reference)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+    AiohttpClient.get_aiohttp_client()
+    try:
+        for scenario in SCENARIOS:
+            await run(*scenario)
+    finally:
+        await AiohttpClient.close_aiohttp_client()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
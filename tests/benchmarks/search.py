@@ -0,0 +1,112 @@
+"""Benchmark ``SearchMixin.search`` of services at 1M rows.
+
+Tops the service table of the database of ``DB_URI`` up to ``SERVICES``
+rows named with two to four words of a Zipf distributed vocabulary, real
+service words most frequent, and commits them; use a scratch database.
+Then times first pages and a next page of frequent, rare, multi-word and
+misspelled queries.
+
+Run: ``python -m tests.benchmarks.search``
+"""
+import typing as t
+
+import asyncio
+import bisect
+import itertools
+import random
+import statistics
+import time
+from uuid import uuid4
+
+import sqlalchemy as sa
+
+from src.app.entity import Service
+from src.app.modules import AsyncDBClient
+
+SERVICES = 1_000_000
+BATCH = 100_000
+RUNS = 20
+SYLLABLES = "ka lo mi ne ta ri so vu de pa li mo ra te ni za bo ke lu si fa go ha ju".split()
+WORDS = (
+    "yoga massage dentist plumber repair school fitness beauty salon clinic auto service cleaning english lessons"
+    " pilates dance studio barber nails tutor piano guitar photo taxi delivery pet grooming vet lawyer notary"
+    " accountant translation printing tailor laundry bakery cafe"
+).split()
+QUERIES = (
+    "yoga",
+    "massage",
+    "repair",
+    "lessons",
+    "yoga massage",
+    "auto repair",
+    "english lessons",
+    "piano tutor",
+    "notary",
+    "laundry",
+    "yoag",
+    "masage",
+    "dentst",
+    "plumbr repair",
+    "kalomi",
+    "zatebo",
+)
+
+
+def make_names(rng: random.Random, count: int) -> list[str]:
+    """Get ``count`` service names."""
+    vocabulary = WORDS + sorted({"".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))) for _ in range(8_000)})
+    weights = list(itertools.accumulate(1 / (rank + 1) ** 1.05 for rank in range(len(vocabulary))))
+
+    def word() -> str:
+        return vocabulary[bisect.bisect(weights, rng.random() * weights[-1])]
+
+    return [" ".join(word() for _ in range(rng.randint(2, 4))).capitalize() for _ in range(count)]
+
+
+async def seed() -> None:
+    """Insert services up to ``SERVICES`` rows."""
+    rng = random.Random(7)
+    async with AsyncDBClient.AsyncSessionLocal() as session:
+        missing = SERVICES - await session.scalar(sa.select(sa.func.count()).select_from(Service))
+        for start in range(0, max(missing, 0), BATCH):
+            names = make_names(rng, min(BATCH, missing - start))
+            await Service.bulk_save(session, [{"id": uuid4(), "name": name} for name in names], mode="copy")
+        if missing > 0:
+            await session.execute(sa.text("ANALYZE service"))
+        await session.commit()
+
+
+async def timed(query: str, after: t.Optional[tuple[float, t.Any]] = None) -> tuple[list[float], t.Any]:
+    """Get durations of ``RUNS`` searches and the last rows found."""
+    timings, rows = [], None
+    async with AsyncDBClient.AsyncSessionLocal() as session:
+        for _ in range(RUNS):
+            ts_start = time.perf_counter()
+            rows = await Service.search(session, query, limit=21, after=after)
+            timings.append(time.perf_counter() - ts_start)
+    return timings, rows
+
+
+async def main() -> None:
+    """Seed the services and time every query."""
+    AsyncDBClient.get_async_db_engine()
+    try:
+        await seed()
+        every: list[float] = []
+        for query in QUERIES:
+            timings, rows = await timed(query)
+            if len(rows) > 20:
+                timings += (await timed(query, after=(rows[19][2], rows[19][0])))[0]
+            every += timings
+            print(  # noqa: T201
+                f"{query!r:<18} {len(rows):3d} hits p50 {statistics.median(timings) * 1e3:7.2f} ms"
+                f" max {max(timings) * 1e3:7.2f} ms",
+            )
+        every.sort()
+        print(f"all queries p99 {every[int(len(every) * 0.99)] * 1e3:.2f} ms")  # noqa: T201
+    finally:
+        await AsyncDBClient.close_db_engine()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,23 @@
+import typing as t
+
+import os
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.modules import AsyncDBClient
+
+
+@pytest_asyncio.fixture
+async def async_session() -> t.AsyncIterator[AsyncSession]:
+    """Session of the ``FASTAPI_DB_URI`` database, rolled back afterwards."""
+    if not os.environ.get("FASTAPI_DB_URI"):
+        pytest.skip("FASTAPI_DB_URI is not set")
+    AsyncDBClient.get_async_db_engine()
+    try:
+        async with AsyncDBClient.AsyncSessionLocal() as session:
+            yield session
+            await session.rollback()
+    finally:
+        await AsyncDBClient.close_db_engine()
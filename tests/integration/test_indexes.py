@@ -0,0 +1,139 @@
+import typing as t
+
+import json
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import REGCLASS
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.entity import Category, ProviderEnity, SearchWord, Service
+
+SERVICES = 2000
+
+
+@pytest_asyncio.fixture
+async def seeded_session(async_session: AsyncSession) -> AsyncSession:
+    """Session with services of distinct names, for the planner to pick the GIN indexes over a scan of all rows."""
+    await async_session.execute(
+        sa.text(
+            "INSERT INTO service (id, name, created_at, updated_at) "
+            "SELECT gen_random_uuid(), md5(i::text), now(), now() FROM generate_series(1, :count) AS i",
+        ),
+        {"count": SERVICES},
+    )
+    # Rows rolled back by earlier runs stay in the GIN pending lists and inflate their cost.
+    for index in ("ix_service_search_vector_live", "ix_search_word_word_trgm"):
+        await async_session.execute(sa.select(sa.func.gin_clean_pending_list(sa.cast(index, REGCLASS))))
+    await async_session.execute(sa.text("ANALYZE service"))
+    return async_session
+
+
+def _index_names(plan: dict[str, t.Any]) -> set[str]:
+    names = {plan["Index Name"]} if "Index Name" in plan else set()
+    for child in plan.get("Plans", ()):
+        names |= _index_names(child)
+    return names
+
+
+async def plan_indexes(async_session: AsyncSession, stmt: sa.Executable) -> set[str]:
+    """Get indexes in the plan of ``stmt``.
+
+    Sequential scans are disabled as test tables are too small for the
+    planner to prefer an index, the plan shows whether one can serve the query.
+    """
+    await async_session.execute(sa.text("SET LOCAL enable_seqscan = off"))
+    sql = stmt.compile(dialect=async_session.get_bind().dialect, compile_kwargs={"literal_binds": True})
+    plan = (await async_session.execute(sa.text(f"EXPLAIN (FORMAT JSON) {sql}"))).scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return _index_names(plan[0]["Plan"])
+
+
+def _nearest() -> sa.Select[t.Any]:
+    point = sa.func.ll_to_earth(55.75, 37.62)
+    position = ProviderEnity._earth_position()
+    return (
+        sa.select(ProviderEnity.id)
+        .where(ProviderEnity.deleted_at.is_(None))
+        .order_by(position.op("<->")(point))
+        .limit(10)
+    )
+
+
+def _within() -> sa.Select[t.Any]:
+    point = sa.func.ll_to_earth(55.75, 37.62)
+    position = ProviderEnity._earth_position()
+    return sa.select(ProviderEnity.id).where(
+        sa.func.earth_box(point, 1000.0).op("@>")(position),
+        ProviderEnity.deleted_at.is_(None),
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("index", "stmt"),
+    [
+        (
+            "service_pkey",
+            sa.select(Service.id).where(Service.id == uuid4(), Service.deleted_at.is_(None)),
+        ),
+        (
+            "ix_service_created_at_id_live",
+            sa.select(Service.id)
+            .where(Service.deleted_at.is_(None))
+            .order_by(Service.created_at, Service.id)
+            .limit(20),
+        ),
+        (
+            "ix_service_provider_entity_id",
+            sa.select(Service.id).where(Service.provider_entity_id == uuid4()),
+        ),
+        (
+            "ix_service_search_vector_live",
+            sa.select(Service.id).where(
+                Service.search_vector.op("@@")(sa.func.websearch_to_tsquery(sa.literal_column("'simple'"), "yoga")),
+                Service.deleted_at.is_(None),
+            ),
+        ),
+        (
+            "ix_service_name_length_live",
+            Service._search_statement(
+                sa.func.websearch_to_tsquery(sa.literal_column("'simple'"), "yoga"),
+                "yoga",
+                20,
+                None,
+            ),
+        ),
+        ("ix_search_word_word_trgm", sa.select(SearchWord.word).where(SearchWord.word.op("%")("yoga"))),
+        (
+            "ix_service_changed_at",
+            sa.select(Service.id).where(
+                Service.changed_at() >= sa.func.now(),
+            ),
+        ),
+        (
+            "ix_category_parent_category_id",
+            sa.select(Category.id).where(Category.parent_category_id == uuid4()),
+        ),
+        (
+            "ix_category_changed_at",
+            sa.select(Category.id).where(
+                Category.changed_at() >= sa.func.now(),
+            ),
+        ),
+        (
+            "ix_providerenity_changed_at",
+            sa.select(ProviderEnity.id).where(
+                ProviderEnity.changed_at() >= sa.func.now(),
+            ),
+        ),
+        ("ix_providerenity_earth_live", _within()),
+        ("ix_providerenity_earth_live", _nearest()),
+    ],
+)
+async def test_query_uses_index(seeded_session: AsyncSession, index: str, stmt: sa.Executable) -> None:
+    """The query can be served by the index."""
+    assert index in await plan_indexes(seeded_session, stmt)
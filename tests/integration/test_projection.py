@@ -0,0 +1,74 @@
+import typing as t
+
+import json
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+import pytest_asyncio
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.entity import Category, CategoryXService, Service
+
+
+class ServiceRow:
+    """Service columns in a ``__slots__`` class."""
+
+    __slots__ = ("id", "name", "url")
+
+    def __init__(self, id: UUID, name: str, url: t.Optional[str]) -> None:  # noqa: A002
+        """Initialize ServiceRow class object instance."""
+        self.id = id
+        self.name = name
+        self.url = url
+
+
+class CategorySummary(BaseModel):
+    """Category of a service card."""
+
+    id: UUID
+    category_title: t.Optional[str]
+
+
+class ServiceCard(BaseModel):
+    """Service with its categories."""
+
+    id: UUID
+    name: str
+    category: list[CategorySummary]
+
+
+@pytest_asyncio.fixture
+async def service(async_session: AsyncSession) -> Service:
+    """Service with a live and a soft deleted category."""
+    service = Service(name="Projected yoga", url="https://example.com")
+    category = Category(category_title="Sport")
+    deleted = Category(category_title="Gone", deleted_at=datetime.now())
+    async_session.add_all([service, category, deleted])
+    await async_session.flush()
+    async_session.add_all([CategoryXService(service_id=service.id, category_id=c.id) for c in (category, deleted)])
+    await async_session.flush()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_fetch_maps_rows_into_slots_objects(async_session: AsyncSession, service: Service) -> None:
+    """Selected columns are built into the ``__slots__`` class."""
+    (row,) = await Service.projection(ServiceRow).fetch(async_session, Service.id == service.id)
+
+    assert (row.id, row.name, row.url) == (service.id, "Projected yoga", "https://example.com")
+
+
+@pytest.mark.asyncio
+async def test_fetch_json_of_pydantic_models_round_trips(async_session: AsyncSession, service: Service) -> None:
+    """Cards with their live categories serialize to JSON reading back as the same models."""
+    projection = Service.projection(ServiceCard, category=Service.category_summaries())
+
+    cards = await projection.fetch(async_session, Service.id == service.id)
+    body = await projection.fetch_json(async_session, Service.id == service.id)
+
+    assert [(card.name, [c.category_title for c in card.category]) for card in cards] == [("Projected yoga", ["Sport"])]
+    assert projection.adapter is not None
+    assert projection.adapter.validate_json(body) == cards
+    assert json.loads(body)[0]["id"] == str(service.id)
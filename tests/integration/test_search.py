@@ -0,0 +1,70 @@
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.app.entity import Service
+
+TITLES = ("{word}", "{word} studio", "Kids {word} studio downtown")
+
+
+@pytest_asyncio.fixture
+async def word(async_session: AsyncSession) -> str:
+    """Word found only in the titles of new services."""
+    word = f"zq{uuid4().hex[:6]}"
+    async_session.add_all([Service(name=title.format(word=word)) for title in TITLES])
+    await async_session.flush()
+    return word
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_closest_titles_first(async_session: AsyncSession, word: str) -> None:
+    """Titles matching the query are ranked by their similarity to it."""
+    rows = await Service.search(async_session, word)
+
+    assert [row[1] for row in rows] == [title.format(word=word) for title in TITLES]
+    assert rows[0][2] > rows[1][2] > rows[2][2]
+
+
+@pytest.mark.asyncio
+async def test_search_pages_after_key(async_session: AsyncSession, word: str) -> None:
+    """A page after the key of the previous one continues the ranking."""
+    first = await Service.search(async_session, word, limit=2)
+    rest = await Service.search(async_session, word, limit=2, after=(first[-1][2], first[-1][0]))
+
+    assert [row[0] for row in first + rest] == [row[0] for row in await Service.search(async_session, word)]
+
+
+@pytest.mark.asyncio
+async def test_search_finds_titles_as_short_as_the_query(async_session: AsyncSession, word: str) -> None:
+    """A title spelling the query words with separators of its own still matches."""
+    async_session.add(Service(name=f"{word}-studio"))
+    await async_session.flush()
+
+    rows = await Service.search(async_session, f"{word}-studio")
+
+    assert [row[1] for row in rows] == [f"{word}-studio"]
+
+
+@pytest.mark.asyncio
+async def test_search_suggests_words_for_typos(async_session: AsyncSession, word: str) -> None:
+    """A misspelled query finds the titles of the most similar word."""
+    rows = await Service.search(async_session, f"{word}x studio")
+
+    assert [row[1] for row in rows] == [title.format(word=word) for title in TITLES[1:]]
+
+
+@pytest.mark.asyncio
+async def test_search_without_similar_words(async_session: AsyncSession) -> None:
+    """A query matching nothing and without similar words finds nothing."""
+    assert await Service.search(async_session, "qjxkzvw") == []
+
+
+@pytest.mark.asyncio
+async def test_search_pages_suggested_titles(async_session: AsyncSession, word: str) -> None:
+    """Pages of a misspelled query continue the titles of the suggested words."""
+    first = await Service.search(async_session, f"{word}x", limit=2)
+    rest = await Service.search(async_session, f"{word}x", limit=2, after=(first[-1][2], first[-1][0]))
+
+    assert [row[1] for row in first + rest] == [title.format(word=word) for title in TITLES]
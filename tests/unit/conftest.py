@@ -0,0 +1,16 @@
+import typing as t
+
+import pytest_asyncio
+from aioresponses import aioresponses
+
+from src.app.modules.http_client import AiohttpClient
+
+
+@pytest_asyncio.fixture
+async def mock_http() -> t.AsyncIterator[aioresponses]:
+    """Mocked upstream of ``AiohttpClient``, whose session and per-host state are reset afterwards."""
+    with aioresponses() as mocked:
+        try:
+            yield mocked
+        finally:
+            await AiohttpClient.close_aiohttp_client()
@@ -0,0 +1,88 @@
+from uuid import uuid4
+
+import pytest
+
+from src.app.modules import autocomplete
+from src.app.modules.autocomplete import PrefixIndex
+
+
+@pytest.fixture
+def entries():
+    """Titles sharing prefixes, with distinct popularity."""
+    titles = ["Yoga", "yoga studio", "Yogurt bar", "Boxing", "box art", "Ballet", "yoga"]
+    return [(uuid4(), title, float(i)) for i, title in enumerate(titles)]
+
+
+def test_complete_is_case_insensitive_most_popular_first(entries):
+    """Complete returns the most popular titles starting with the prefix."""
+    index = PrefixIndex.build(entries)
+
+    assert [title for _, title, _ in index.complete("YOG", 3)] == ["yoga", "Yogurt bar", "yoga studio"]
+    assert [title for _, title, _ in index.complete("bo", 10)] == ["box art", "Boxing"]
+    assert index.complete("z", 10) == []
+
+
+def test_complete_memo_serves_smaller_k_and_is_bounded(entries, monkeypatch):
+    """Short prefixes are memoized once for every k, the least recently used are dropped."""
+    monkeypatch.setattr(autocomplete, "MEMO_SIZE", 2)
+    index = PrefixIndex.build(entries)
+
+    assert index.complete("y", 1) == index.complete("y", 10)[:1]
+    index.complete("b", 1)
+    index.complete("y", 1)
+    index.complete("ba", 1)
+
+    assert list(index._memo) == ["y", "ba"]
+
+
+def test_update_removes_moves_and_adds_entries(entries):
+    """Update applies changes to a copy and leaves the index intact."""
+    index = PrefixIndex.build(entries)
+    yoga_id, _, _ = entries[0]
+    boxing_id, _, _ = entries[3]
+    new_id = uuid4()
+
+    updated = index.update(
+        [(yoga_id, "Yoga"), (boxing_id, "Boxing")],
+        [(boxing_id, "Yoga boxing", 9.0), (new_id, "Bachata", 1.0)],
+    )
+
+    assert len(updated) == len(entries)
+    assert [title for _, title, _ in updated.complete("yoga", 10)] == ["Yoga boxing", "yoga", "yoga studio"]
+    assert [object_id for object_id, _, _ in updated.complete("ba", 10)] == [entries[5][0], new_id]
+    assert [title for _, title, _ in index.complete("yoga", 10)] == ["yoga", "yoga studio", "Yoga"]
+
+
+def test_update_of_duplicate_titles_removes_the_right_entry(entries):
+    """Entries of equal titles are told apart by id."""
+    index = PrefixIndex.build(entries)
+
+    updated = index.update([(entries[6][0], "yoga"), (uuid4(), "yoga")], [])
+
+    assert [object_id for object_id, _, _ in updated.complete("yoga", 10)] == [entries[1][0], entries[0][0]]
+
+
+def test_update_finds_retitled_entries_under_earlier_titles(entries):
+    """A retitled id not filed under its current title is searched among all entries."""
+    index = PrefixIndex.build(entries)
+    boxing_id, _, _ = entries[3]
+
+    updated = index.update([(boxing_id, "Yoga boxing")], [(boxing_id, "Yoga boxing", 3.0)], {boxing_id})
+
+    assert len(updated) == len(entries)
+    assert [object_id for object_id, _, _ in updated.complete("yoga b", 10)] == [boxing_id]
+    assert [title for _, title, _ in updated.complete("bo", 10)] == ["box art"]
+
+
+def test_update_applied_again_changes_nothing(entries):
+    """Rows read again by a later refresh leave the index as it is."""
+    index = PrefixIndex.build(entries)
+    yoga_id, _, _ = entries[0]
+    new_id = uuid4()
+    removed = [(yoga_id, "Yoga"), (new_id, "Bachata")]
+    added = [(yoga_id, "Yoga", 0.0), (new_id, "Bachata", 1.1)]
+
+    updated = index.update(removed, added)
+
+    assert len(updated) == len(entries) + 1
+    assert updated.update(removed, added) is updated
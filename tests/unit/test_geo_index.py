@@ -0,0 +1,138 @@
+import random
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.app.modules.geo_index import GeoGrid, haversine
+
+CELL_SIZE = 0.5
+
+
+def _points(rng: random.Random, count: int) -> list[tuple[UUID, float, float]]:
+    # Clustered like real providers, some around the antimeridian.
+    centers = [(55.75, 37.62), (40.71, -74.0), (-33.87, 151.2), (64.73, 177.5), (64.73, -179.8)]
+    points = []
+    for _ in range(count):
+        lat, lon = rng.choice(centers)
+        points.append((uuid4(), lat + rng.uniform(-2, 2), (lon + rng.uniform(-2, 2) + 180) % 360 - 180))
+    return points
+
+
+def _grid(points: list[tuple[UUID, float, float]]) -> GeoGrid:
+    return GeoGrid([p[0] for p in points], [p[1] for p in points], [p[2] for p in points], CELL_SIZE)
+
+
+def _stored(grid: GeoGrid, lat: float, lon: float) -> set[tuple[UUID, float]]:
+    return {(object_id, round(distance)) for object_id, distance in grid.within(lat, lon, 1e9)}
+
+
+def _brute_within(points, lat, lon, radius):
+    return sorted(
+        (haversine(lat, lon, p_lat, p_lon), object_id)
+        for object_id, p_lat, p_lon in points
+        if haversine(lat, lon, p_lat, p_lon) <= radius
+    )
+
+
+@pytest.fixture
+def rng() -> random.Random:
+    """Seeded random, tests are reproducible."""
+    return random.Random(42)
+
+
+@pytest.mark.parametrize(("lat", "lon", "radius"), [(55.75, 37.62, 50_000), (64.73, 179.9, 80_000), (0.0, 0.0, 1e3)])
+def test_within_finds_points_in_radius_nearest_first(rng, lat, lon, radius):
+    """Within returns the points a brute force search finds, nearest first."""
+    points = _points(rng, 2_000)
+    found = _grid(points).within(lat, lon, radius)
+
+    expected = _brute_within(points, lat, lon, radius)
+    assert [object_id for object_id, _ in found] == [object_id for _, object_id in expected]
+    assert [distance for _, distance in found] == pytest.approx([distance for distance, _ in expected], abs=5)
+
+
+def test_within_limit(rng):
+    """Within with a limit returns the nearest points only."""
+    points = _points(rng, 2_000)
+    found = _grid(points).within(55.75, 37.62, 100_000, limit=5)
+
+    assert [object_id for object_id, _ in found] == [
+        object_id for _, object_id in _brute_within(points, 55.75, 37.62, 100_000)[:5]
+    ]
+
+
+@pytest.mark.parametrize("k", [1, 10, 5_000])
+def test_nearest(rng, k):
+    """Nearest returns the k nearest points, also across the antimeridian."""
+    points = _points(rng, 2_000)
+    found = _grid(points).nearest(64.73, -179.95, k)
+
+    expected = _brute_within(points, 64.73, -179.95, float("inf"))[:k]
+    assert [object_id for object_id, _ in found] == [object_id for _, object_id in expected]
+
+
+def test_empty_grid():
+    """Lookups on an empty grid find nothing."""
+    grid = _grid([])
+
+    assert len(grid) == 0
+    assert grid.within(0.0, 0.0, 1e6) == []
+    assert grid.nearest(0.0, 0.0, 3) == []
+
+
+def test_update_matches_rebuilt_grid(rng):
+    """Update gives the same grid as a rebuild from the final points."""
+    points = _points(rng, 2_000)
+    grid = _grid(points)
+    removed = [p[0] for p in points[:100]]
+    moved = [(object_id, lat + 1.0, lon) for object_id, lat, lon in points[100:200]]
+    added = _points(rng, 100)
+
+    updated = grid.update(removed, moved + added)
+
+    final = points[200:] + moved + added
+    assert len(updated) == len(final)
+    rebuilt = _grid(final)
+    for lat, lon in [(55.75, 37.62), (40.71, -74.0), (64.73, 179.9), (-33.87, 151.2)]:
+        assert _stored(updated, lat, lon) == _stored(rebuilt, lat, lon)
+        assert updated.within(lat, lon, 150_000) == rebuilt.within(lat, lon, 150_000)
+    # The original grid is left intact for its readers.
+    assert _stored(grid, 0.0, 0.0) == _stored(_grid(points), 0.0, 0.0)
+
+
+def test_update_finds_points_of_earlier_updates(rng):
+    """Update of an updated grid finds the points moved and added before."""
+    points = _points(rng, 1_000)
+    moved = [(object_id, lat - 2.0, lon) for object_id, lat, lon in points[:100]]
+    added = _points(rng, 100)
+    updated = _grid(points).update([], moved + added)
+
+    again = updated.update([p[0] for p in moved + added], [])
+
+    assert len(again) == len(points) - 100
+    rebuilt = _grid(points[100:])
+    for lat, lon in [(55.75, 37.62), (40.71, -74.0), (-33.87, 151.2)]:
+        assert _stored(again, lat, lon) == _stored(rebuilt, lat, lon)
+
+
+def test_update_empties_and_creates_cells(rng):
+    """Update drops emptied cells and adds new ones."""
+    points = _points(rng, 50)
+    grid = _grid(points)
+    far = (uuid4(), -80.0, -100.0)
+
+    updated = grid.update([p[0] for p in points], [far])
+
+    assert len(updated) == 1
+    assert updated.nearest(0.0, 0.0, 5) == [(far[0], pytest.approx(haversine(0.0, 0.0, -80.0, -100.0), abs=5))]
+    assert _grid([]).update([], [far]).within(-80.0, -100.0, 10) == [(far[0], pytest.approx(0, abs=5))]
+
+
+def test_update_without_changes_returns_same_grid(rng):
+    """Update returns the grid itself when no point changes."""
+    points = _points(rng, 100)
+    grid = _grid(points)
+
+    assert grid.update([uuid4()], points[:10]) is grid
+    assert grid.update([points[0][0]], [points[0]]) is grid
+    assert grid.update([], [(points[0][0], points[0][1] + 0.01, points[0][2])]) is not grid
@@ -0,0 +1,152 @@
+import pytest
+
+from src.app.modules import http_breaker
+from src.app.modules.http_breaker import BreakerState, CircuitBreaker, CircuitOpenError
+
+
+class Clock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1_000.0
+
+    def monotonic(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the clock of the breaker module."""
+    clock = Clock()
+    monkeypatch.setattr(http_breaker, "time", clock)
+    return clock
+
+
+@pytest.fixture
+def breaker(clock):
+    """Breaker opening at half of 4 calls in 10 seconds, for 5 seconds, closed by 2 probes."""
+    return CircuitBreaker("example.com:443", window=10, min_calls=4, error_rate=0.5, open_duration=5, probes=2)
+
+
+def call(breaker, failed):
+    """Let a call through and record its outcome."""
+    breaker.after_call(breaker.before_call(), failed)
+
+
+def open_breaker(breaker):
+    """Fail enough calls to open the breaker."""
+    for _ in range(4):
+        call(breaker, failed=True)
+    assert breaker.state is BreakerState.OPEN
+
+
+def test_opens_at_error_rate_once_enough_calls(breaker):
+    """Failures open the breaker only once the window holds min_calls calls."""
+    call(breaker, failed=True)
+    call(breaker, failed=True)
+    call(breaker, failed=False)
+    assert breaker.state is BreakerState.CLOSED
+
+    call(breaker, failed=False)
+    assert breaker.state is BreakerState.OPEN
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert exc_info.value.retry_after == 5
+
+
+def test_failures_leave_the_window(breaker, clock):
+    """Outcomes older than the window no longer count."""
+    call(breaker, failed=True)
+    call(breaker, failed=True)
+    call(breaker, failed=True)
+    clock.now += 11
+
+    call(breaker, failed=True)
+    call(breaker, failed=False)
+    call(breaker, failed=False)
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_cancelled_calls_are_not_counted(breaker):
+    """Calls without an outcome neither fail nor succeed."""
+    for _ in range(4):
+        call(breaker, failed=None)
+    call(breaker, failed=True)
+    assert breaker.state is BreakerState.CLOSED
+
+
+def test_half_open_probes_close_the_breaker(breaker, clock):
+    """After open_duration only probes go through, all of them succeeding closes the breaker."""
+    open_breaker(breaker)
+    clock.now += 5
+
+    first, second = breaker.before_call(), breaker.before_call()
+    assert breaker.state is BreakerState.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.after_call(first, failed=False)
+    assert breaker.state is BreakerState.HALF_OPEN
+    breaker.after_call(second, failed=False)
+    assert breaker.state is BreakerState.CLOSED
+    assert breaker.before_call() is None
+
+
+def test_failed_probe_opens_the_breaker_again(breaker, clock):
+    """One failed probe opens the breaker for another open_duration."""
+    open_breaker(breaker)
+    clock.now += 5
+    probe = breaker.before_call()
+
+    breaker.after_call(probe, failed=True)
+
+    assert breaker.state is BreakerState.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_cancelled_probe_frees_its_slot(breaker, clock):
+    """A probe without an outcome lets another probe through and decides nothing."""
+    open_breaker(breaker)
+    clock.now += 5
+    first, second = breaker.before_call(), breaker.before_call()
+
+    breaker.after_call(first, failed=None)
+
+    assert breaker.state is BreakerState.HALF_OPEN
+    assert breaker.before_call() == second
+
+
+def test_probes_of_an_earlier_half_open_period_are_ignored(breaker, clock):
+    """A probe outliving its half-open period neither counts nor frees a slot of the next one."""
+    open_breaker(breaker)
+    clock.now += 5
+    failed, stale = breaker.before_call(), breaker.before_call()
+    breaker.after_call(failed, failed=True)
+    clock.now += 5
+    probe = breaker.before_call()
+
+    breaker.after_call(stale, failed=False)
+    breaker.after_call(probe, failed=False)
+
+    assert breaker.state is BreakerState.HALF_OPEN
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_calls_let_through_before_opening_are_ignored(breaker, clock):
+    """Closed state calls finishing once the breaker opened do not count in the next closed period."""
+    started = [breaker.before_call() for _ in range(3)]
+    open_breaker(breaker)
+    for probe in started:
+        breaker.after_call(probe, failed=True)
+    clock.now += 5
+    for _ in range(2):
+        call(breaker, failed=False)
+    assert breaker.state is BreakerState.CLOSED
+
+    call(breaker, failed=True)
+    assert breaker.state is BreakerState.CLOSED
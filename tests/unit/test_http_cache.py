@@ -0,0 +1,156 @@
+import dataclasses
+import email.utils
+import time
+
+import pytest
+from multidict import CIMultiDict, CIMultiDictProxy
+from yarl import URL
+
+from src.app.modules.http_cache import (
+    CacheEntry,
+    LRUResponseCache,
+    _cache_control,
+    _ttl,
+    cache_entry,
+    revalidated_entry,
+)
+from src.app.modules.http_client import AiohttpClient
+from src.app.modules.http_coalesce import SharedResponse
+
+CATEGORIES_URL = "http://example.com/categories"
+
+
+def response(body=b"{}", status=200, **headers):
+    """Response with headers given as keywords, underscores for dashes."""
+    proxy = CIMultiDictProxy(CIMultiDict((name.replace("_", "-"), value) for name, value in headers.items()))
+    return SharedResponse(url=CATEGORIES_URL, status=status, headers=proxy, body=body)
+
+
+def entry(size):
+    """Entry of ``size`` bytes, fresh for a minute."""
+    return CacheEntry("example.com", response(), time.monotonic() + 60, time.monotonic() + 60, size)
+
+
+def ttl(**headers):
+    """Freshness of a response with ``headers``."""
+    resp = response(**headers)
+    return _ttl(resp.headers, _cache_control(resp.headers))
+
+
+def test_lru_evicts_least_recently_used_entries():
+    """Over max_entries the entry used least recently goes first."""
+    cache = LRUResponseCache(max_entries=2, max_bytes=1_000)
+    cache.set("a", entry(10))
+    cache.set("b", entry(10))
+    cache.get("a")
+
+    cache.set("c", entry(10))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+    assert cache.size == 20
+
+
+def test_lru_evicts_by_bytes():
+    """Over max_bytes entries are evicted until the rest fits, entries larger than that are not stored."""
+    cache = LRUResponseCache(max_entries=10, max_bytes=100)
+    cache.set("a", entry(40))
+    cache.set("b", entry(40))
+
+    cache.set("c", entry(40))
+    assert cache.get("a") is None
+    assert cache.size == 80
+
+    cache.set("b", entry(10))
+    assert cache.size == 50
+    cache.set("d", entry(101))
+    assert cache.get("d") is None
+    assert cache.size == 50
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.size == 0
+
+
+def test_ttl_from_max_age_less_age():
+    """max-age counts from the response generation, Age has already passed."""
+    assert ttl(cache_control="public, max-age=300") == 300
+    assert ttl(cache_control="max-age=300", age="100") == 200
+    assert ttl(cache_control="max-age=300", expires="Thu, 01 Jan 1970 00:00:00 GMT") == 300
+
+
+def test_ttl_from_expires_against_date():
+    """Expires counts from Date of the response, an invalid one means already expired."""
+    date = time.time()
+    assert (
+        ttl(expires=email.utils.formatdate(date + 60, usegmt=True), date=email.utils.formatdate(date, usegmt=True))
+        == 60
+    )
+    assert ttl(expires="0") == 0
+    assert ttl() is None
+
+
+def test_cache_entry_rules():
+    """Only 200 responses are stored, those without freshness only when they have validators."""
+    now = time.monotonic()
+    assert cache_entry("example.com", response(status=404, cache_control="max-age=60"), now) is None
+    assert cache_entry("example.com", response(cache_control="no-store, max-age=60"), now) is None
+    assert cache_entry("example.com", response(), now) is None
+
+    stored = cache_entry("example.com", response(cache_control="no-cache", etag='"v1"'), now)
+    assert stored.expires_at == now
+    stored = cache_entry("example.com", response(cache_control="max-age=60, stale-while-revalidate=30"), now)
+    assert (stored.expires_at, stored.stale_until) == (now + 60, now + 90)
+
+
+def test_revalidated_entry_takes_headers_of_the_304():
+    """A 304 refreshes freshness and validators, the body stays."""
+    now = time.monotonic()
+    stale = cache_entry("example.com", response(b"[1]", cache_control="max-age=0", etag='"v1"', x_id="1"), now)
+    not_modified = response(b"", status=304, cache_control="max-age=60", etag='"v2"').headers
+
+    refreshed = revalidated_entry(stale, not_modified, now)
+
+    assert refreshed.expires_at == now + 60
+    assert refreshed.response.body == b"[1]"
+    assert refreshed.response.headers.getall("ETag") == ['"v2"']
+    assert refreshed.response.headers["X-Id"] == "1"
+    assert refreshed.validators() == {"If-None-Match": '"v2"'}
+
+
+@pytest.mark.asyncio
+async def test_get_shared_serves_fresh_entries_from_the_cache(mock_http, monkeypatch):
+    """A fresh entry is served without a request."""
+    monkeypatch.setattr(AiohttpClient, "response_cache", LRUResponseCache())
+    mock_http.get(CATEGORIES_URL, body="[1]", headers={"Cache-Control": "max-age=60"})
+
+    first = await AiohttpClient.get_shared(CATEGORIES_URL)
+    second = await AiohttpClient.get_shared(CATEGORIES_URL)
+
+    assert second is first
+    assert len(mock_http.requests[("GET", URL(CATEGORIES_URL))]) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_shared_serves_stale_entry_while_revalidating(mock_http, monkeypatch):
+    """Within stale-while-revalidate the stale response is served and revalidated in the background."""
+    cache = LRUResponseCache()
+    monkeypatch.setattr(AiohttpClient, "response_cache", cache)
+    mock_http.get(
+        CATEGORIES_URL, body="[1]", headers={"Cache-Control": "max-age=60, stale-while-revalidate=60", "ETag": '"v1"'}
+    )
+    first = await AiohttpClient.get_shared(CATEGORIES_URL)
+    (key,) = cache._entries
+    cache.set(key, dataclasses.replace(cache.get(key), expires_at=time.monotonic() - 1))
+    mock_http.get(CATEGORIES_URL, status=304, headers={"Cache-Control": "max-age=120", "ETag": '"v1"'})
+
+    stale = await AiohttpClient.get_shared(CATEGORIES_URL)
+    assert stale is first
+    (refresh,) = AiohttpClient.refreshes
+    refreshed = await refresh
+
+    assert refreshed.body == b"[1]"
+    assert cache.get(key).expires_at > time.monotonic() + 60
+    revalidation = mock_http.requests[("GET", URL(CATEGORIES_URL))][1]
+    assert revalidation.kwargs["headers"]["If-None-Match"] == '"v1"'
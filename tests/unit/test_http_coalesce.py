@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from src.app.modules.http_coalesce import SingleFlight
+
+
+class Upstream:
+    """Call counting its starts, blocked until released."""
+
+    def __init__(self) -> None:
+        """Create the call, not started."""
+        self.calls = 0
+        self.cancelled = 0
+        self.release = asyncio.Event()
+
+    async def __call__(self) -> int:
+        """Wait for release, get the number of calls made."""
+        self.calls += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_call():
+    """Callers of a key in flight get the result of the first call, the key is forgotten once done."""
+    flights: SingleFlight[int] = SingleFlight()
+    upstream = Upstream()
+
+    tasks = [asyncio.create_task(flights.do("key", upstream)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert "key" in flights
+    upstream.release.set()
+
+    assert await asyncio.gather(*tasks) == [1, 1, 1]
+    assert "key" not in flights
+    assert await flights.do("key", upstream) == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_raised_to_every_caller():
+    """A failed call fails all its callers."""
+    flights: SingleFlight[int] = SingleFlight()
+
+    async def fail() -> int:
+        await asyncio.sleep(0)
+        raise ValueError("upstream")
+
+    results = await asyncio.gather(*(flights.do("key", fail) for _ in range(2)), return_exceptions=True)
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+    assert "key" not in flights
+
+
+@pytest.mark.asyncio
+async def test_cancelled_leader_leaves_call_running_for_waiters():
+    """Cancelling the caller that started the call does not cancel it for the others."""
+    flights: SingleFlight[int] = SingleFlight()
+    upstream = Upstream()
+    leader = asyncio.create_task(flights.do("key", upstream))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(flights.do("key", upstream))
+    await asyncio.sleep(0)
+
+    leader.cancel()
+    await asyncio.sleep(0)
+    upstream.release.set()
+
+    assert await waiter == 1
+    assert leader.cancelled()
+    assert upstream.calls == 1
+    assert not upstream.cancelled
+
+
+@pytest.mark.asyncio
+async def test_call_is_cancelled_with_its_last_caller():
+    """Once the leader and every waiter are cancelled the call is, and the next caller starts over."""
+    flights: SingleFlight[int] = SingleFlight()
+    upstream = Upstream()
+    callers = [asyncio.create_task(flights.do("key", upstream)) for _ in range(3)]
+    await asyncio.sleep(0)
+
+    for caller in callers[:-1]:
+        caller.cancel()
+        await asyncio.sleep(0)
+    assert not upstream.cancelled
+    assert "key" in flights
+    callers[-1].cancel()
+    await asyncio.gather(*callers, return_exceptions=True)
+    await asyncio.sleep(0)
+
+    assert all(caller.cancelled() for caller in callers)
+    assert upstream.cancelled == 1
+    assert "key" not in flights
+    upstream.release.set()
+    assert await flights.do("key", upstream) == 2
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+
+from src.app.modules import http_limiter
+from src.app.modules.http_limiter import AdaptiveLimiter
+
+
+class Clock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1_000.0
+
+    def monotonic(self) -> float:
+        """Get the current time."""
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the clock of the limiter module only, the event loop keeps its own."""
+    clock = Clock()
+    monkeypatch.setattr(http_limiter, "time", clock)
+    return clock
+
+
+def make_limiter(initial=2, minimum=1, maximum=10):
+    """Limiter halving on overload, tolerating twice the baseline latency."""
+    return AdaptiveLimiter(
+        "example.com:443",
+        initial=initial,
+        minimum=minimum,
+        maximum=maximum,
+        backoff=0.5,
+        latency_tolerance=2.0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_success_raises_limit_only_while_in_use(clock):
+    """Each success at full use adds 1 / limit, successes below the limit add nothing."""
+    limiter = make_limiter()
+    await limiter.acquire()
+    await limiter.acquire()
+
+    limiter.release(0.1)
+    assert limiter.limit == 2.5
+    limiter.release(0.1)
+    assert limiter.limit == 2.5
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_overload_cuts_limit_once_per_baseline_latency(clock):
+    """A burst of failures of the same round trip cuts the limit once."""
+    limiter = make_limiter(initial=8)
+    for _ in range(4):
+        await limiter.acquire()
+
+    limiter.release(0.1, overloaded=True)
+    limiter.release(0.1, overloaded=True)
+    assert limiter.limit == 4.0
+    clock.now += 0.1
+    limiter.release(0.1, overloaded=True)
+    assert limiter.limit == 2.0
+    clock.now += 0.1
+    # Slower than twice the baseline counts as overload.
+    limiter.release(0.25)
+    assert limiter.limit == 1.0
+
+
+@pytest.mark.asyncio
+async def test_limit_stays_within_bounds(clock):
+    """The limit never leaves minimum and maximum."""
+    limiter = make_limiter(initial=2, minimum=1, maximum=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    limiter.release(0.1)
+    assert limiter.limit == 2.0
+
+    clock.now += 1
+    limiter.release(0.1, overloaded=True)
+    clock.now += 1
+    await limiter.acquire()
+    limiter.release(0.1, overloaded=True)
+    assert limiter.limit == 1.0
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_served_in_order():
+    """Released slots go to the waiters first come first served."""
+    limiter = make_limiter(initial=1)
+    await limiter.acquire()
+    served = []
+
+    async def call(name):
+        await limiter.acquire()
+        served.append(name)
+
+    tasks = [asyncio.create_task(call(name)) for name in "abc"]
+    await asyncio.sleep(0)
+    assert limiter.in_flight == 1
+    for _ in tasks:
+        limiter.release()
+        await asyncio.sleep(0)
+
+    assert served == ["a", "b", "c"]
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_while_waiting_leaves_the_queue():
+    """A cancelled waiter takes no slot and does not block the next one."""
+    limiter = make_limiter(initial=1)
+    await limiter.acquire()
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    first.cancel()
+    await asyncio.sleep(0)
+    limiter.release()
+    await second
+
+    assert first.cancelled()
+    assert limiter.in_flight == 1
+    assert not limiter._waiters
+
+
+@pytest.mark.asyncio
+async def test_waiter_cancelled_after_wake_hands_its_slot_over():
+    """A waiter woken and cancelled before it runs passes the slot to the next waiter."""
+    limiter = make_limiter(initial=1)
+    await limiter.acquire()
+    first = asyncio.create_task(limiter.acquire())
+    second = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.release()
+    first.cancel()
+    await asyncio.wait_for(second, 1)
+
+    assert first.cancelled()
+    assert limiter.in_flight == 1
@@ -0,0 +1,176 @@
+import email.utils
+import time
+
+import aiohttp
+import pytest
+
+from src.app.modules import http_retry
+from src.app.modules.http_client import AiohttpClient
+from src.app.modules.http_retry import (
+    RetryBudget,
+    backoff_delay,
+    parse_retry_after,
+    skip_reason,
+)
+
+URL = "http://example.com/items"
+
+
+class Clock:
+    """Monotonic clock moved by hand."""
+
+    def __init__(self) -> None:
+        """Start at an arbitrary time."""
+        self.now = 1_000.0
+
+    def monotonic(self) -> float:
+        """Get the current time."""
+        return self.now
+
+    def time(self) -> float:
+        """Get the wall clock time, as real."""
+        return time.time()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Replace the clock of the retry module."""
+    clock = Clock()
+    monkeypatch.setattr(http_retry, "time", clock)
+    return clock
+
+
+def test_budget_withdraw_spends_tokens_up_to_burst(clock):
+    """A full bucket allows burst retries, then none until refilled."""
+    budget = RetryBudget("example.com", ratio=0.5, min_per_second=0.0, burst=2)
+
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+
+def test_budget_deposit_earns_ratio_per_success(clock):
+    """Successes earn ratio tokens each, never more than burst."""
+    budget = RetryBudget("example.com", ratio=0.5, min_per_second=0.0, burst=2)
+    budget.withdraw()
+    budget.withdraw()
+
+    budget.deposit()
+    assert not budget.withdraw()
+    budget.deposit()
+    assert budget.withdraw()
+    for _ in range(10):
+        budget.deposit()
+    assert budget.tokens == 2.0
+
+
+def test_budget_refills_min_per_second(clock):
+    """Idle time adds min_per_second tokens, up to burst."""
+    budget = RetryBudget("example.com", ratio=0.0, min_per_second=0.5, burst=1)
+    assert budget.withdraw()
+
+    clock.now += 1
+    assert not budget.withdraw()
+    clock.now += 1
+    assert budget.withdraw()
+    clock.now += 100
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+@pytest.mark.parametrize("attempt, ceiling", [(1, 0.1), (2, 0.2), (3, 0.4), (10, 2.0)])
+def test_backoff_delay_is_full_jitter_capped(attempt, ceiling):
+    """Delays spread between zero and the capped exponential backoff."""
+    delays = [backoff_delay(attempt, base=0.1, cap=2.0) for _ in range(1_000)]
+
+    assert all(0 <= delay <= ceiling for delay in delays)
+    assert max(delays) > ceiling * 0.9
+    assert min(delays) < ceiling * 0.1
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("120", 120.0),
+        (" 3 ", 3.0),
+        ("0", 0.0),
+        (email.utils.formatdate(time.time() - 60, usegmt=True), 0.0),
+        (None, None),
+        ("", None),
+        ("-1", None),
+        ("1.5", None),
+        ("soon", None),
+    ],
+)
+def test_parse_retry_after(value, expected):
+    """Seconds or a past date are parsed, anything else is ignored."""
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    """A future date is the seconds until then."""
+    value = email.utils.formatdate(time.time() + 30, usegmt=True)
+
+    assert 28 <= parse_retry_after(value) <= 30
+
+
+@pytest.mark.parametrize(
+    "retryable, attempt, delay, expected",
+    [
+        (False, 1, 0.1, "method"),
+        (True, 3, 0.1, "tries"),
+        (True, 1, 5.0, "deadline"),
+        (True, 1, 0.1, None),
+    ],
+)
+def test_skip_reason(clock, retryable, attempt, delay, expected):
+    """Retries are skipped for the first reason found, the budget is spent by retries only."""
+    budget = RetryBudget("example.com", ratio=0.0, min_per_second=0.0, burst=1)
+
+    assert skip_reason(budget, attempt, retryable, delay, clock.now + 5.0) == expected
+    assert budget.tokens == (0.0 if expected is None else 1.0)
+
+
+def test_skip_reason_budget(clock):
+    """Retries stop once the budget is spent."""
+    budget = RetryBudget("example.com", ratio=0.0, min_per_second=0.0, burst=1)
+
+    assert skip_reason(budget, 1, True, 0.1, clock.now + 5.0) is None
+    assert skip_reason(budget, 1, True, 0.1, clock.now + 5.0) == "budget"
+
+
+@pytest.mark.asyncio
+async def test_request_retries_server_errors(mock_http, monkeypatch):
+    """503 is retried, the successful try earns the budget a token."""
+    monkeypatch.setattr(http_retry.settings, "HTTP_RETRY_BACKOFF_BASE", 0.001)
+    mock_http.get(URL, status=503)
+    mock_http.get(URL, status=200, body="ok")
+
+    resp = await AiohttpClient.get(URL)
+
+    assert resp.status == 200
+    assert await resp.text() == "ok"
+    budget = AiohttpClient.get_retry_budget("example.com")
+    assert budget.tokens == budget.burst - 1 + budget.ratio
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [501, 505, 507, 511])
+async def test_request_raises_server_errors_not_retried(mock_http, status):
+    """5xx responses never retried raise and earn nothing."""
+    mock_http.get(URL, status=status)
+
+    with pytest.raises(aiohttp.ClientResponseError) as exc_info:
+        await AiohttpClient.get(URL)
+
+    assert exc_info.value.status == status
+    budget = AiohttpClient.get_retry_budget("example.com")
+    assert budget.tokens == budget.burst
+
+
+@pytest.mark.asyncio
+async def test_request_returns_client_errors(mock_http):
+    """4xx responses are the caller's to handle."""
+    mock_http.post(URL, status=409)
+
+    resp = await AiohttpClient.post(URL, json={})
+
+    assert resp.status == 409
@@ -0,0 +1,58 @@
+from datetime import datetime
+from uuid import UUID, uuid4
+
+import pytest
+
+from src.app.entity.mixin import _min_title_length
+from src.app.entity.service import Service
+
+
+@pytest.fixture
+def columns():
+    """Key columns of the default page order."""
+    return [Service.__table__.c.created_at, Service.__table__.c.id]
+
+
+def test_coerce_key_converts_cursor_values(columns):
+    """Strings decoded from a cursor come back as column types."""
+    object_id = uuid4()
+    created_at = datetime(2023, 5, 1, 12, 30)
+
+    key = Service._coerce_key(columns, [created_at.isoformat(), str(object_id)])
+
+    assert key == (created_at, object_id)
+    assert isinstance(key[1], UUID)
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        [1],
+        ["2023-05-01", str(uuid4()), 1],
+        ["yesterday", str(uuid4())],
+        [1, str(uuid4())],
+        ["2023-05-01", 1],
+        ["2023-05-01", ["not", "an", "id"]],
+        [{"created_at": 1}, str(uuid4())],
+    ],
+)
+def test_coerce_key_rejects_malformed_keys_with_value_error(columns, key):
+    """Keys of the wrong length or types are a ValueError, the endpoints answer 400."""
+    with pytest.raises(ValueError):
+        Service._coerce_key(columns, key)
+
+
+@pytest.mark.parametrize(
+    "query, length",
+    [
+        ("Yoga", 4),
+        ("yoga  massage yoga", 12),
+        ('"yoga studio" e-mail', 18),
+        ("yoga or massage", 0),
+        ("yoga -massage", 0),
+        (" ", 0),
+    ],
+)
+def test_min_title_length_bounds_matching_titles(query, length):
+    """Titles shorter than the distinct words of a query cannot match, alternatives and exclusions drop the bound."""
+    assert _min_title_length(query) == length
@@ -0,0 +1,100 @@
+import typing as t
+
+import dataclasses
+import json
+from uuid import UUID, uuid4
+
+import sqlalchemy as sa
+from pydantic import BaseModel
+
+from src.app.entity.service import Service
+
+
+@dataclasses.dataclass(slots=True)
+class ServiceCriteria:
+    """Projection with fields named like the Projection parameters."""
+
+    id: UUID
+    criteria: str
+    model: str
+
+
+class ServiceRow:
+    """Projection into a ``__slots__`` class."""
+
+    __slots__ = ("id", "name", "url")
+
+    def __init__(self, id: UUID, name: str, url: t.Optional[str]) -> None:  # noqa: A002
+        """Initialize ServiceRow class object instance."""
+        self.id = id
+        self.name = name
+        self.url = url
+
+
+class CategorySummary(BaseModel):
+    """Nested model of a projected JSON column."""
+
+    id: UUID
+    category_title: t.Optional[str]
+
+
+class ServiceCard(BaseModel):
+    """Projection into a pydantic model."""
+
+    id: UUID
+    name: str
+    category: list[CategorySummary]
+
+
+def test_projection_expressions_take_any_field_name():
+    """Expressions named criteria or model are projected, soft deleted rows still filtered out."""
+    projection = Service.projection(ServiceCriteria, criteria=Service.name, model=sa.literal("service"))
+
+    sql = str(projection.select().compile())
+
+    assert [column.name for column in projection.columns] == ["id", "criteria", "model"]
+    assert "service.name AS criteria" in sql
+    assert "service.deleted_at IS NULL" in sql
+
+
+def test_from_rows_builds_slots_objects_positionally():
+    """Rows map to a ``__slots__`` class in column order, values unchanged."""
+    projection = Service.projection(ServiceRow)
+    rows = [(uuid4(), "Yoga", None), (uuid4(), "Boxing", "https://example.com")]
+
+    items = projection.from_rows(rows)
+
+    assert [column.name for column in projection.columns] == ["id", "name", "url"]
+    assert [(item.id, item.name, item.url) for item in items] == rows
+    assert all(type(item) is ServiceRow for item in items)
+
+
+def test_from_rows_validates_pydantic_models():
+    """Rows map to a pydantic model validated in bulk, nested JSON included."""
+    projection = Service.projection(ServiceCard, category=sa.literal_column("'[]'"))
+    service_id, category_id = uuid4(), uuid4()
+
+    (card,) = projection.from_rows(
+        [(str(service_id), "Yoga", [{"id": str(category_id), "category_title": "Sport"}])],
+    )
+
+    assert card == ServiceCard(
+        id=service_id,
+        name="Yoga",
+        category=[CategorySummary(id=category_id, category_title="Sport")],
+    )
+
+
+def test_dump_json_round_trips():
+    """JSON of mapped rows reads back as the same values, for slots classes and pydantic models."""
+    rows = [(uuid4(), "Yoga", None), (uuid4(), "Boxing", "https://example.com")]
+    slots = Service.projection(ServiceRow)
+    cards = Service.projection(ServiceCard, category=sa.literal_column("'[]'"))
+    card_rows = [(uuid4(), "Yoga", [{"id": uuid4(), "category_title": None}])]
+
+    assert json.loads(slots.dump_json(slots.from_rows(rows))) == [
+        {"id": str(object_id), "name": name, "url": url} for object_id, name, url in rows
+    ]
+    items = cards.from_rows(card_rows)
+    assert cards.adapter is not None
+    assert cards.adapter.validate_json(cards.dump_json(items)) == items